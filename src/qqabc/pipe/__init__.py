@@ -11,16 +11,45 @@ if sys.version_info < (3, 10):
     )
     raise ImportError(msg)
 
-from qqabc.pipe.channel import AsyncBoundedQ, BoundedQ
-from qqabc.pipe.pipeline import Pipeline, pipe
-from qqabc.pipe.stage import ExecutorType, IStage, Stage
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from qqabc.pipe.channel import AsyncBoundedQ, BoundedQ
+    from qqabc.pipe.pipeline import Pipeline, StageError, pipe
+    from qqabc.pipe.stage import ExecutorType, FusedStage, IStage, Stage
 
 __all__ = [
     "AsyncBoundedQ",
     "BoundedQ",
     "ExecutorType",
+    "FusedStage",
     "IStage",
     "Pipeline",
     "Stage",
+    "StageError",
     "pipe",
 ]
+
+_LAZY = {
+    "AsyncBoundedQ": "qqabc.pipe.channel",
+    "BoundedQ": "qqabc.pipe.channel",
+    "ExecutorType": "qqabc.pipe.stage",
+    "FusedStage": "qqabc.pipe.stage",
+    "IStage": "qqabc.pipe.stage",
+    "Pipeline": "qqabc.pipe.pipeline",
+    "Stage": "qqabc.pipe.stage",
+    "StageError": "qqabc.pipe.pipeline",
+    "pipe": "qqabc.pipe.pipeline",
+}
+"""公開名稱所在的子模組, 第一次使用時才 import (``qqabc.pipe.channel`` 不需要 asyncio)。"""
+
+
+def __getattr__(name: str) -> Any:
+    """第一次存取公開名稱時才 import 其子模組。"""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module  # noqa: PLC0415
+
+    value = getattr(import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
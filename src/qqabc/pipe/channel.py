@@ -7,18 +7,18 @@
 
 from __future__ import annotations
 
-import asyncio
-from queue import Queue as ThreadSafeQueue
+from collections import deque
+from time import monotonic
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from multiprocess import Queue  # type: ignore[reportAttributeAccessIssue]
-
-from qqabc.qq import END_MSG, Msg, Q
+from qqabc.qq import END_MSG, Msg, Q, _count, _new_queue
+from qqabc.qq.stats import QStats, make_stats
 
 if TYPE_CHECKING:
+    import asyncio
     from collections.abc import AsyncIterator
 
-    from qqabc.qq import ContextName
+    from qqabc.qq import QueueKind
 
 T = TypeVar("T")
 
@@ -37,25 +37,23 @@ class BoundedQ(Q[T]):
     但底層 queue 透過 ``maxsize`` 限制容量。
 
     Args:
-        kind: 執行模式，``"thread"`` 或 ``"process"``。
+        kind: 執行模式，``"thread"``、``"process"`` 或 ``"shm"``。
         maxsize: 最大容量，0 = 無界（向後相容）。
+        stats: 是否記錄統計（見 ``QStats``），可傳入既有的 ``QStats``。
     """
 
     def __init__(
         self,
         *,
-        kind: ContextName = "thread",
+        kind: QueueKind = "thread",
         maxsize: int = 0,
+        stats: bool | QStats = False,
     ) -> None:
         # 不呼叫 super().__init__()，直接建立有 maxsize 的 queue
-        if kind == "process":
-            self._q: Any = Queue(maxsize=maxsize)
-        elif kind == "thread":
-            self._q = ThreadSafeQueue(maxsize=maxsize)
-        else:
-            msg = f"Unknown queue type: {kind}"
-            raise ValueError(msg)
+        self._q: Any = _new_queue(kind, maxsize)
         self._cache: list[Msg[T]] | None = None
+        self._buffer: deque[Msg[T]] = deque()
+        self.stats = make_stats(stats)
 
 
 class AsyncBoundedQ(Generic[T]):
@@ -66,26 +64,53 @@ class AsyncBoundedQ(Generic[T]):
 
     Args:
         maxsize: 最大容量，0 = 無界。
+        stats: 是否記錄統計（見 ``QStats``），可傳入既有的 ``QStats``。
     """
 
-    def __init__(self, *, maxsize: int = 0) -> None:
+    def __init__(self, *, maxsize: int = 0, stats: bool | QStats = False) -> None:
+        import asyncio  # noqa: PLC0415
+
         self._q: asyncio.Queue[Msg[T]] = asyncio.Queue(maxsize=maxsize)
+        self.stats = make_stats(stats)
 
     async def put(self, data: T, *, order: int = 0) -> None:
         """Put a data item wrapped in ``Msg``."""
-        await self._q.put(Msg(data=data, order=order))
+        await self.put_msg(Msg(data=data, order=order))
 
     async def put_msg(self, msg: Msg[T]) -> None:
         """Put a raw ``Msg`` directly."""
-        await self._q.put(msg)
+        stats = self.stats
+        if stats is None:
+            await self._q.put(msg)
+            return
+        start = monotonic()
+        await self._q.put(stats.stamp(msg))
+        stats.sent(_count(msg), monotonic() - start, self._q.qsize())
 
     async def get(self) -> Msg[T]:
         """Get the next ``Msg``."""
-        return await self._q.get()
+        stats = self.stats
+        if stats is None:
+            return await self._q.get()
+        start = monotonic()
+        msg = await self._q.get()
+        stats.received(msg, _count(msg), monotonic() - start)
+        return msg
+
+    def get_nowait(self) -> Msg[T]:
+        """Get the next ``Msg`` without waiting.
+
+        Raises:
+            asyncio.QueueEmpty: if no message is queued.
+        """
+        msg = self._q.get_nowait()
+        if self.stats is not None:
+            self.stats.received(msg, _count(msg), 0.0)
+        return msg
 
     async def end(self) -> None:
         """Send ``END_MSG`` sentinel."""
-        await self._q.put(END_MSG)
+        await self.put_msg(END_MSG)
 
     def qsize(self) -> int:
         """Approximate queue size."""
@@ -106,7 +131,7 @@ class AsyncBoundedQ(Generic[T]):
     async def _aiter_impl(self) -> AsyncIterator[Msg[T]]:  # type: ignore[misc]
         """內部 async iterator 實作。"""
         while True:
-            msg = await self._q.get()
+            msg = await self.get()
             if msg.kind == END_MSG.kind:
                 break
             yield msg
@@ -121,9 +146,11 @@ async def bridge_thread_to_async(
     在 event loop 中用 ``run_in_executor`` 執行阻塞的 ``get()``，
     讀到 ``END_MSG`` 時結束並送 ``END_MSG`` 到 ``async_q``。
     """
+    import asyncio  # noqa: PLC0415
+
     loop = asyncio.get_running_loop()
     while True:
-        msg: Msg[T] = await loop.run_in_executor(None, thread_q._q.get)  # noqa: SLF001
+        msg: Msg[T] = await loop.run_in_executor(None, thread_q.get)
         if msg.kind == END_MSG.kind:
             await async_q.end()
             break
@@ -139,7 +166,9 @@ async def bridge_async_to_thread(
     讀到 ``END_MSG`` 時結束並送 ``END_MSG`` 到 ``thread_q``。
     用 ``run_in_executor`` 避免阻塞 event loop。
     """
+    import asyncio  # noqa: PLC0415
+
     loop = asyncio.get_running_loop()
     async for msg in async_q:
-        await loop.run_in_executor(None, thread_q._q.put, msg)  # noqa: SLF001
-    await loop.run_in_executor(None, thread_q._q.put, END_MSG)  # noqa: SLF001
+        await loop.run_in_executor(None, thread_q.put, msg)
+    await loop.run_in_executor(None, thread_q.end)
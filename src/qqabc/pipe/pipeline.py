@@ -31,18 +31,23 @@ from __future__ import annotations
 
 import asyncio
 import threading
-from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+from contextlib import suppress
+from queue import Empty
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Generic, Tuple, TypeVar, overload
 
 from qqabc.pipe.channel import (
     AsyncBoundedQ,
     BoundedQ,
-    bridge_async_to_thread,
     bridge_thread_to_async,
 )
-from qqabc.pipe.stage import IStage
+from qqabc.pipe.stage import IStage, fuse_stages
+from qqabc.qq import END_MSG, Msg, Worker, get_context
+from qqabc.qq.shm import ShmClosedError
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import AsyncIterator, Iterable, Iterator, MutableSequence
+    from contextlib import AbstractContextManager
     from types import TracebackType
 
     from typing_extensions import Self
@@ -50,27 +55,171 @@ if TYPE_CHECKING:
 T = TypeVar("T")
 R = TypeVar("R")
 
-__all__ = ["Pipeline", "pipe"]
+_DEFAULT_REORDER_WINDOW = 1024
+
+Batching = Tuple[int, float]
+"""批次設定 (batch_size, max_batch_latency)。"""
+
+_DROPPED = "qqabc.pipe.dropped"
+"""``fn`` 拋出例外而丟棄的 item 的 ``Msg.kind``: 沒有結果, 只保留 ``order``。"""
+
+_FAILED = "qqabc.pipe.failed"
+"""結果無法送出的 item 的 ``Msg.kind``: ``data`` 為 ``StageError``。"""
+
+_PASSTHROUGH = (_DROPPED, _FAILED)
+"""下游 stage 不處理、直接轉送到出口的 ``Msg.kind``。"""
+
+__all__ = ["Pipeline", "StageError", "pipe"]
+
+
+class StageError(RuntimeError):
+    """Stage 的結果無法送往下一個 queue（例如無法 pickle）。
+
+    由 ``results()`` / ``run()`` 的迭代拋出；``__cause__`` 為送出時的例外。
+    （``fn`` 本身拋出例外的 item 則被丟棄，pipeline 繼續處理其餘 item。）
+
+    Args:
+        stage: 失敗的 stage 名稱。
+        error: 原始例外。
+    """
+
+    def __init__(self, stage: str, error: BaseException) -> None:
+        super().__init__(f"Stage {stage!r} 處理失敗: {error!r}")
+        self.stage = stage
+        self.error = error
+        self.__cause__ = error
+
+    def __reduce__(self) -> tuple[type[StageError], tuple[str, BaseException]]:
+        return StageError, (self.stage, self.error)
+
+
+def _batches(
+    in_q: BoundedQ[Any], size: int, latency: float
+) -> Iterator[list[Msg[Any]]]:
+    """收集最多 ``size`` 個訊息為一批，直到 END_MSG。
+
+    等到一批的第一個訊息後，最多再等待 ``latency`` 秒湊滿一批。
+    """
+    while True:
+        msg = in_q.get()
+        if msg.kind == END_MSG.kind:
+            return
+        batch = [msg]
+        deadline = monotonic() + latency
+        while len(batch) < size:
+            left = deadline - monotonic()
+            try:
+                msg = in_q.get(block=left > 0, timeout=left if left > 0 else None)
+            except Empty:
+                break
+            if msg.kind == END_MSG.kind:
+                yield batch
+                return
+            batch.append(msg)
+        yield batch
+
+
+def _batching(stage: IStage[Any, Any]) -> Batching | None:
+    """Stage 的批次設定；未啟用批次時為 ``None``。"""
+    if stage.batch_size is None:
+        return None
+    return stage.batch_size, stage.max_batch_latency
+
+
+def _scatter(msgs: list[Msg[Any]], results: Iterable[Any]) -> list[Msg[Any]]:
+    """將一批的結果依序配回各訊息的 ``order``。"""
+    results = list(results)
+    if len(results) != len(msgs):
+        msg = f"批次函式收到 {len(msgs)} 個 item, 卻回傳 {len(results)} 個結果"
+        raise ValueError(msg)
+    return [Msg(data=r, order=m.order) for m, r in zip(msgs, results)]
+
+
+def _dropped(order: int) -> Msg[None]:
+    """代替 ``order`` 號 item 結果的丟棄訊息（ordered 輸出才能歸還 window）。"""
+    return Msg(data=None, kind=_DROPPED, order=order)
+
+
+def _failure(stage: str, error: BaseException, order: int) -> Msg[StageError]:
+    """代替 ``order`` 號 item 結果的失敗訊息。"""
+    return Msg(data=StageError(stage, error), kind=_FAILED, order=order)
+
+
+def _split(batch: list[Msg[Any]]) -> tuple[list[Msg[Any]], list[Msg[Any]]]:
+    """將一批訊息分為 (要處理的 item, 直接轉送的訊息)。"""
+    items = [m for m in batch if m.kind not in _PASSTHROUGH]
+    return items, [m for m in batch if m.kind in _PASSTHROUGH]
+
+
+def _call(fn: Any, msg: Msg[Any]) -> Msg[Any]:
+    """以 ``fn`` 處理一個訊息；``fn`` 拋出例外時改送丟棄訊息。"""
+    if msg.kind in _PASSTHROUGH:
+        return msg
+    try:
+        return Msg(data=fn(msg.data), order=msg.order)
+    except Exception:
+        return _dropped(msg.order)
+
+
+def _call_batch(fn: Any, batch: list[Msg[Any]]) -> list[Msg[Any]]:
+    """``_call`` 的批次版本：``fn`` 拋出例外時整批 item 都被丟棄。"""
+    items, msgs = _split(batch)
+    if items:
+        try:
+            msgs += _scatter(items, fn([m.data for m in items]))
+        except Exception:
+            msgs += [_dropped(m.order) for m in items]
+    return msgs
+
+
+def _send(out_q: BoundedQ[Any], msgs: list[Msg[Any]], stage: str) -> None:
+    """送出結果；無法送出（例如無法 pickle）的結果改送失敗訊息。"""
+    try:
+        if len(msgs) == 1:
+            out_q.put(msgs[0])
+        else:
+            out_q.put_many(msgs, batch_size=len(msgs))
+    except Exception as e:
+        out_q.put_many([_failure(stage, e, m.order) for m in msgs])
 
 
 def _counted_worker(
     fn: Any,
     in_q: BoundedQ[Any],
     out_q: BoundedQ[Any],
-    remaining: list[int],
-    lock: threading.Lock,
+    remaining: MutableSequence[int],
+    lock: AbstractContextManager[Any],
+    *,
+    stage: str = "",
+    batching: Batching | None = None,
 ) -> None:
     """Worker 附帶計數：最後一個完成的 worker 發送 END_MSG。
 
+    同一 stage 的 N 個 worker 直接讀取 stage 的 in_q，上游只送一個 END_MSG：
+    讀到 END_MSG 的 worker 將它放回 in_q 讓其他 worker 也能結束，
+    最後一個結束的 worker 則改送 END_MSG 給 out_q。
     避免 dispatcher join 導致的 deadlock（worker 可能被 out_q.put 阻塞）。
+    process stage 的 ``remaining`` 是共享記憶體的 ``Array``，``lock`` 為其 lock。
+    若有 ``batching``，``fn`` 以一批 item 的 list 呼叫（見 ``_batches``）。
+    ``fn`` 拋出例外的 item 被丟棄，worker 繼續處理其餘 item（見 ``_call``）。
+    shm queue 已被釋放（未取完結果就結束直譯器）時直接結束（見 ``Pipeline.close``）。
     """
-    for msg in in_q:
-        result = fn(msg.data)
-        out_q.put(result, order=msg.order)
+    try:
+        if batching is None:
+            for msg in in_q:
+                _send(out_q, [_call(fn, msg)], stage)
+        else:
+            for batch in _batches(in_q, *batching):
+                _send(out_q, _call_batch(fn, batch), stage)
+    except ShmClosedError:
+        return
     with lock:
         remaining[0] -= 1
-        if remaining[0] == 0:
-            out_q.end()
+        last = remaining[0] == 0
+    if last:
+        out_q.end()
+    else:
+        in_q.end()
 
 
 def _async_runner(
@@ -78,12 +227,48 @@ def _async_runner(
     concurrency: int,
     in_q: BoundedQ[Any],
     out_q: BoundedQ[Any],
+    *,
+    batching: Batching | None = None,
+    stage: str = "",
 ) -> None:
     """在專屬 thread 中啟動 asyncio event loop 執行 async stage。
 
-    接收一個 END_MSG 即結束（由 feeder / 上一階段送出）。
+    接收一個 END_MSG 即結束（由入口或上一階段送出）；
+    shm queue 已被釋放時亦結束（見 ``_counted_worker``）。
+    """
+    with suppress(ShmClosedError):
+        asyncio.run(
+            _async_main(fn, concurrency, in_q, out_q, batching=batching, stage=stage)
+        )
+
+
+async def _abatches(
+    async_in: AsyncBoundedQ[Any], size: int, latency: float
+) -> AsyncIterator[list[Msg[Any]]]:
+    """``_batches`` 的 async 版本。
+
+    超過 ``latency`` 後不再等待，但仍取走已在 queue 中的訊息（``get_nowait``）。
     """
-    asyncio.run(_async_main(fn, concurrency, in_q, out_q))
+    while True:
+        msg = await async_in.get()
+        if msg.kind == END_MSG.kind:
+            return
+        batch = [msg]
+        deadline = monotonic() + latency
+        while len(batch) < size:
+            left = deadline - monotonic()
+            try:
+                if left > 0:
+                    msg = await asyncio.wait_for(async_in.get(), left)
+                else:
+                    msg = async_in.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if msg.kind == END_MSG.kind:
+                yield batch
+                return
+            batch.append(msg)
+        yield batch
 
 
 async def _async_main(
@@ -91,13 +276,18 @@ async def _async_main(
     concurrency: int,
     in_q: BoundedQ[Any],
     out_q: BoundedQ[Any],
+    *,
+    batching: Batching | None = None,
+    stage: str = "",
 ) -> None:
     """Async executor 核心邏輯。
 
     1. 透過 bridge 將 thread queue 轉為 async queue
     2. 用 ``asyncio.Semaphore`` 控制並行度
-    3. 每個 item 以 ``asyncio.create_task`` 執行 ``fn``
-    4. 結果透過 bridge 轉回 thread queue
+    3. 每個 item（或每批，見 ``_abatches``）以 ``asyncio.create_task`` 執行 ``fn``
+    4. 結果以 ``_send`` 轉回 thread queue（同 ``bridge_async_to_thread``）
+
+    ``fn`` 拋出例外的 item 與 ``_counted_worker`` 相同，被丟棄。
     """
     sem = asyncio.Semaphore(concurrency)
     pending: set[asyncio.Task[None]] = set()
@@ -109,18 +299,39 @@ async def _async_main(
     # async → thread bridge（output 方向）
     async_out: AsyncBoundedQ[Any] = AsyncBoundedQ(maxsize=0)
 
-    async def _process(data: Any, order: int) -> None:
+    async def _process(msg: Msg[Any]) -> None:
         try:
-            result = await fn(data)
-            await async_out.put(result, order=order)
+            if msg.kind not in _PASSTHROUGH:
+                try:
+                    msg = Msg(data=await fn(msg.data), order=msg.order)
+                except Exception:
+                    msg = _dropped(msg.order)
+            await async_out.put_msg(msg)
+        finally:
+            sem.release()
+
+    async def _process_batch(batch: list[Msg[Any]]) -> None:
+        try:
+            items, msgs = _split(batch)
+            if items:
+                try:
+                    msgs += _scatter(items, await fn([m.data for m in items]))
+                except Exception:
+                    msgs += [_dropped(m.order) for m in items]
+            for msg in msgs:
+                await async_out.put_msg(msg)
         finally:
             sem.release()
 
     async def _consumer() -> None:
         try:
-            async for msg in async_in:
+            if batching is None:
+                jobs = (_process(m) async for m in async_in)
+            else:
+                jobs = (_process_batch(b) async for b in _abatches(async_in, *batching))
+            async for job in jobs:
                 await sem.acquire()
-                task = asyncio.create_task(_process(msg.data, msg.order))
+                task = asyncio.create_task(job)
                 pending.add(task)
                 task.add_done_callback(pending.discard)
             # 等待尚在處理的 tasks（return_exceptions=True 防止 deadlock）
@@ -131,8 +342,11 @@ async def _async_main(
 
     consumer_task = asyncio.create_task(_consumer())
 
-    # bridge output back to thread queue
-    await bridge_async_to_thread(async_out, out_q)
+    # async → thread：與 bridge_async_to_thread 相同，但無法送出的結果改送失敗訊息
+    loop = asyncio.get_running_loop()
+    async for msg in async_out:
+        await loop.run_in_executor(None, _send, out_q, [msg], stage)
+    await loop.run_in_executor(None, out_q.end)
     await bridge_task
     await consumer_task
 
@@ -142,10 +356,35 @@ class Pipeline(Generic[T, R]):
 
     自動建立 BoundedQ 連接各 stage、啟動 worker，
     提供 ``submit`` / ``results`` 介面。
+    ``executor="process"`` 的 stage 以子行程執行（不受 GIL 限制），
+    其輸入與輸出經由共享記憶體的 BoundedQ 傳遞。
+
+    ``ordered=True`` 時，結果依 ``submit`` 的順序輸出：出口以 ``Q.sorted``
+    重排，且最多 ``reorder_window`` 個 item 同時在 pipeline 中；第 k 個 item
+    要等第 k - ``reorder_window`` 個結果被取走後才能 submit，
+    因此重排緩衝有上限，落後的 item 會讓上游（``submit``）阻塞而非無限堆積。
+    只有 ``run()`` / ``pipe(input=...)`` 會在 submit 的同時消費結果；
+    直接呼叫 ``submit`` / ``submit_many`` 時沒有人歸還 window，
+    超過 ``reorder_window`` 個 item 會 raise ``RuntimeError`` 而非永遠阻塞。
+
+    ``fuse=True`` 時，相鄰且可合併的 stage（同為 thread 或同為 process、
+    concurrency 相同、不批次）合併成一個 ``FusedStage``，由同一個 worker 依序
+    呼叫各 ``fn``，省去中間的 queue 與 ``Msg``；見 ``stages``。
+    合併後的 worker 數為各 stage concurrency 的總和，且每個 ``fn`` 同時最多
+    ``concurrency`` 個呼叫，並行度與合併前相同。
+    合併會改變 topology：stage 名稱（例如 ``"abs+str"``，``StageError.stage``
+    亦同）與 worker 數都不同，``concurrency=1`` 的 stage 合併後也不再保證 FIFO，
+    因此預設不合併。
 
     Args:
         stages: Stage 列表，可由 ``stage_a | stage_b`` 建構。
         backpressure: stage 之間 queue 的 maxsize，0 = 無界。
+        ordered: 是否依 submit 順序輸出結果。
+        reorder_window: ``ordered=True`` 時，同時在 pipeline 中的最多 item 數。
+        fuse: 是否合併相鄰的 stage，預設 ``False``。
+
+    Raises:
+        ValueError: 沒有 Stage，或 ``reorder_window`` 小於 1。
     """
 
     def __init__(
@@ -153,25 +392,52 @@ class Pipeline(Generic[T, R]):
         stages: list[IStage[Any, Any]] | IStage[Any, Any],
         *,
         backpressure: int = 0,
+        ordered: bool = False,
+        reorder_window: int = _DEFAULT_REORDER_WINDOW,
+        fuse: bool = False,
     ) -> None:
         if isinstance(stages, IStage):
             stages = [stages]
         if not stages:
             msg = "Pipeline 至少需要一個 Stage"
             raise ValueError(msg)
+        if reorder_window < 1:
+            msg = f"reorder_window 必須 >= 1: {reorder_window}"
+            raise ValueError(msg)
+
+        if fuse:
+            stages = fuse_stages(stages)
 
         self._stages = stages
         self._backpressure = backpressure
+        # ordered：入口處的 semaphore 限制尚未按序輸出的 item 數
+        self._window = threading.Semaphore(reorder_window) if ordered else None
+        self._reorder_window = reorder_window
         self._started = False
         self._closed = False
+        self._feeding = False  # run() 的背景 thread 正在 submit，結果同時被消費
         self._order = 0
 
         # queues: len(stages) + 1 個 queue（入口 → [stage0] → [stage1] → ... → 出口）
+        # process stage 的 worker 在子行程中讀寫，其 in / out queue 必須能跨行程：
+        # 用 "shm"（put 同步寫入共享記憶體，沒有 feeder thread），
+        # 最後一個 worker 的 END_MSG 才不會超前其他 worker 尚未送出的結果
+        process = [False, *(s.executor == "process" for s in stages), False]
+        kinds = [
+            "shm" if process[i] or process[i + 1] else "thread"
+            for i in range(len(stages) + 1)
+        ]
         self._queues: list[BoundedQ[Any]] = [
-            BoundedQ(kind="thread", maxsize=backpressure)
-            for _ in range(len(stages) + 1)
+            BoundedQ(kind=kind, maxsize=backpressure)  # type: ignore[arg-type]
+            for kind in kinds
         ]
-        self._workers: list[threading.Thread] = []
+        self._workers: list[threading.Thread | Worker] = []
+        self._counters: list[Any] = []
+
+    @property
+    def stages(self) -> list[IStage[Any, Any]]:
+        """實際執行的 stages（合併後的 stage 為 ``FusedStage``）。"""
+        return list(self._stages)
 
     def _start(self) -> None:
         if self._started:
@@ -188,50 +454,80 @@ class Pipeline(Generic[T, R]):
                 t = threading.Thread(
                     target=_async_runner,
                     args=(stage.fn, stage.concurrency, in_q, out_q),
+                    kwargs={"stage": stage.name, "batching": _batching(stage)},
                     daemon=True,
                 )
-                t.start()
                 self._workers.append(t)
             else:
-                # thread / process stage：啟動 N 個 counted worker，
-                # 最後一個完成的 worker 自行發送 END_MSG 給 out_q，
-                # 不需要 dispatcher join，避免 deadlock。
-                worker_in_q = BoundedQ[Any](kind="thread", maxsize=self._backpressure)
-                remaining = [stage.concurrency]
-                lock = threading.Lock()
-
-                for _ in range(stage.concurrency):
-                    t = threading.Thread(
-                        target=_counted_worker,
-                        args=(stage.fn, worker_in_q, out_q, remaining, lock),
-                        daemon=True,
-                    )
-                    t.start()
-                    self._workers.append(t)
-
-                # feeder: 從 in_q 讀取、fan-out 到 worker_in_q，
-                # 收到 END_MSG 後送 N 個 END_MSG
-                def _feeder(
-                    _in: BoundedQ[Any],
-                    _fan: BoundedQ[Any],
-                    _n: int,
-                ) -> None:
-                    for msg in _in:
-                        _fan.put(msg)
-                    for _ in range(_n):
-                        _fan.end()
-
-                ft = threading.Thread(
-                    target=_feeder,
-                    args=(in_q, worker_in_q, stage.concurrency),
-                    daemon=True,
+                self._workers.extend(self._start_workers(stage, in_q, out_q))
+
+        # 子行程已全部啟動後才啟動 threads：fork 時若有其他 thread
+        # 正持有 queue 內部的 lock，子行程會 deadlock
+        for w in self._workers:
+            if isinstance(w, threading.Thread):
+                w.start()
+
+    def _start_workers(
+        self, stage: IStage[Any, Any], in_q: BoundedQ[Any], out_q: BoundedQ[Any]
+    ) -> list[threading.Thread | Worker]:
+        """建立 thread / process stage 的 N 個 counted worker。
+
+        worker 直接讀取 in_q（見 ``_counted_worker``），
+        最後一個完成的 worker 自行發送 END_MSG 給 out_q，
+        不需要 dispatcher join，避免 deadlock。
+        process stage 的 worker 是子行程：in_q 與 out_q 為
+        ``kind="shm"`` 的 BoundedQ（跨行程背壓），計數放在共享記憶體。
+        子行程立即啟動；回傳的 threads 尚未啟動（見 ``_start``）。
+        """
+        args = (stage.fn, in_q, out_q)
+        if stage.executor == "process":
+            remaining: Any = get_context().Array("i", [stage.concurrency])
+            # Process.start() 後不再持有 args：保留參照，避免共享記憶體被回收重用
+            self._counters.append(remaining)
+            return [
+                Worker.process(
+                    _counted_worker,
+                    *args,
+                    remaining,
+                    remaining.get_lock(),
+                    stage=stage.name,
+                    batching=_batching(stage),
                 )
-                ft.start()
-                self._workers.append(ft)
+                for _ in range(stage.concurrency)
+            ]
+
+        counter = [stage.concurrency]
+        lock = threading.Lock()
+        return [
+            threading.Thread(
+                target=_counted_worker,
+                args=(*args, counter, lock),
+                kwargs={"stage": stage.name, "batching": _batching(stage)},
+                daemon=True,
+            )
+            for _ in range(stage.concurrency)
+        ]
 
     def submit(self, item: T) -> None:
-        """提交一個 item 到 pipeline 入口。"""
+        """提交一個 item 到 pipeline 入口。
+
+        ``ordered=True`` 時，若已有 ``reorder_window`` 個 item 尚未輸出，
+        在 ``run()`` 中阻塞到結果被取走；否則沒有人會取走結果，因此 raise。
+
+        Raises:
+            RuntimeError: ``ordered=True``、不在 ``run()`` 中，且已 submit
+                ``reorder_window`` 個 item。
+        """
         self._start()
+        if self._window is not None and not self._window.acquire(
+            blocking=self._feeding
+        ):
+            msg = (
+                f"ordered=True 時最多 submit reorder_window={self._reorder_window} 個 item "
+                "後才取結果; 請改用 run() 或 pipe(input=...) 同時消費結果, "
+                "或加大 reorder_window"
+            )
+            raise RuntimeError(msg)
         self._queues[0].put(item, order=self._order)
         self._order += 1
 
@@ -241,14 +537,38 @@ class Pipeline(Generic[T, R]):
             self.submit(item)
 
     def results(self) -> Iterator[R]:
-        """迭代 pipeline 出口的結果（按完成順序）。
+        """迭代 pipeline 出口的結果（按完成順序；``ordered=True`` 時按 submit 順序）。
 
         呼叫此方法前需先呼叫 ``close()`` 或在 context manager 結束時自動 close。
         也可以先 close 再呼叫，或在 close 之前呼叫（此時會自動 close）。
+
+        Raises:
+            StageError: 迭代到某個 stage 處理失敗的 item 時。
         """
         if not self._closed:
             self.close()
-        return (msg.data for msg in self._queues[-1])
+        return self._output()
+
+    def _output(self) -> Iterator[R]:
+        """出口 queue 的結果；``ordered=True`` 時重排並歸還 window。"""
+        if self._window is None:
+            return self._unordered_output()
+        return self._ordered_output(self._window)
+
+    def _unordered_output(self) -> Iterator[R]:
+        for msg in self._queues[-1]:
+            if msg.kind == _FAILED:
+                raise msg.data
+            if msg.kind != _DROPPED:
+                yield msg.data
+
+    def _ordered_output(self, window: threading.Semaphore) -> Iterator[R]:
+        for msg in self._queues[-1].sorted():
+            window.release()
+            if msg.kind == _FAILED:
+                raise msg.data
+            if msg.kind != _DROPPED:
+                yield msg.data
 
     def run(self, items: Iterable[T]) -> Iterator[R]:
         """同時餵資料與取結果，避免背壓導致的 deadlock。
@@ -261,8 +581,12 @@ class Pipeline(Generic[T, R]):
 
         Returns:
             結果 iterator。
+
+        Raises:
+            StageError: 迭代到某個 stage 處理失敗的 item 時。
         """
         self._start()
+        self._feeding = True
 
         def _feed() -> None:
             self.submit_many(items)
@@ -270,10 +594,15 @@ class Pipeline(Generic[T, R]):
 
         feeder = threading.Thread(target=_feed, daemon=True)
         feeder.start()
-        return (msg.data for msg in self._queues[-1])
+        return self._output()
 
     def close(self) -> None:
-        """關閉 pipeline 入口，觸發 END_MSG 逐級傳播。"""
+        """關閉 pipeline 入口，觸發 END_MSG 逐級傳播。
+
+        不等待 worker 結束（結果通常在 close 之後才由 ``results()`` 取走）。
+        結果未取完就結束直譯器時，仍在執行的 worker thread 會在 shm queue
+        被釋放後安靜地結束。
+        """
         if self._closed:
             return
         self._closed = True
@@ -307,6 +636,9 @@ def pipe(
     *,
     input: Iterable[Any],
     backpressure: int = 0,
+    ordered: bool = False,
+    reorder_window: int = _DEFAULT_REORDER_WINDOW,
+    fuse: bool = False,
 ) -> Iterator[Any]: ...
 
 
@@ -316,6 +648,9 @@ def pipe(
     *,
     input: None = None,
     backpressure: int = 0,
+    ordered: bool = False,
+    reorder_window: int = _DEFAULT_REORDER_WINDOW,
+    fuse: bool = False,
 ) -> Pipeline[Any, Any]: ...
 
 
@@ -324,6 +659,9 @@ def pipe(
     *,
     input: Iterable[Any] | None = None,  # noqa: A002
     backpressure: int = 0,
+    ordered: bool = False,
+    reorder_window: int = _DEFAULT_REORDER_WINDOW,
+    fuse: bool = False,
 ) -> Iterator[Any] | Pipeline[Any, Any]:
     """一行建構並執行 pipeline。
 
@@ -334,6 +672,9 @@ def pipe(
         stages: Stage 列表或單一 Stage。
         input: 輸入資料，若提供則自動 submit。
         backpressure: stage 之間 queue 的 maxsize，0 = 無界。
+        ordered: 是否依輸入順序輸出結果（見 ``Pipeline``）。
+        reorder_window: ``ordered=True`` 時，同時在 pipeline 中的最多 item 數。
+        fuse: 是否合併相鄰的 stage（見 ``Pipeline``）。
 
     Returns:
         若有 input：結果 iterator。
@@ -344,7 +685,13 @@ def pipe(
         >>> list(pipe([Stage(fn=lambda x: x * 2)], input=[1, 2, 3]))
         [2, 4, 6]
     """
-    p = Pipeline(stages, backpressure=backpressure)
+    p = Pipeline(
+        stages,
+        backpressure=backpressure,
+        ordered=ordered,
+        reorder_window=reorder_window,
+        fuse=fuse,
+    )
     if input is not None:
         return p.run(input)
     return p
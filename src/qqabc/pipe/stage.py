@@ -1,11 +1,13 @@
 """Stage 抽象與 Executor 模型。
 
-定義 Pipeline 中處理階段的核心抽象，支援 thread、process 與 async 三種執行模式。
+定義 Pipeline 中處理階段的核心抽象，支援 thread、process 與 async 三種執行模式，
+以及將相鄰 stage 合併為單一 worker 的 ``FusedStage``。
 """
 
 from __future__ import annotations
 
 import inspect
+import threading
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
@@ -19,7 +21,7 @@ ExecutorType = Literal["thread", "process", "async"]
 
 _DEFAULT_CONCURRENCY = 4
 
-__all__ = ["ExecutorType", "IStage", "Stage"]
+__all__ = ["ExecutorType", "FusedStage", "IStage", "Stage", "can_fuse", "fuse_stages"]
 
 
 class IStage(ABC, Generic[T, R]):
@@ -49,6 +51,16 @@ class IStage(ABC, Generic[T, R]):
     def name(self) -> str:
         """此 stage 的名稱，用於監控與除錯。"""
 
+    @property
+    def batch_size(self) -> int | None:
+        """每批最多的 item 數；``None`` 表示逐一處理（``fn`` 收到單一 item）。"""
+        return None
+
+    @property
+    def max_batch_latency(self) -> float:
+        """收到一批的第一個 item 後，最多再等待幾秒湊滿一批。"""
+        return 0.0
+
     def __or__(
         self, other: IStage[Any, Any] | list[IStage[Any, Any]]
     ) -> list[IStage[Any, Any]]:
@@ -78,6 +90,13 @@ class Stage(IStage[T, R]):
             否則為 ``"thread"``。
         concurrency: 並行 worker 數量，預設為 4。
         name: 此 stage 的名稱，若未提供則使用 ``fn.__name__``。
+        batch_size: 若提供，``fn`` 改為收到最多 ``batch_size`` 個 item 的 list，
+            並回傳等長的結果 list；各結果沿用對應 item 的 ``order``。
+        max_batch_latency: 批次模式下，收到第一個 item 後最多再等待幾秒
+            湊滿一批；0 = 只取已在 queue 中的 item。
+
+    Raises:
+        ValueError: ``batch_size`` 小於 1 或 ``max_batch_latency`` 為負數。
     """
 
     def __init__(
@@ -87,7 +106,15 @@ class Stage(IStage[T, R]):
         executor: ExecutorType | None = None,
         concurrency: int = _DEFAULT_CONCURRENCY,
         name: str = "",
+        batch_size: int | None = None,
+        max_batch_latency: float = 0.0,
     ) -> None:
+        if batch_size is not None and batch_size < 1:
+            msg = f"batch_size 必須 >= 1: {batch_size}"
+            raise ValueError(msg)
+        if max_batch_latency < 0:
+            msg = f"max_batch_latency 不可為負數: {max_batch_latency}"
+            raise ValueError(msg)
         self._fn = fn
         self._executor: ExecutorType = (
             executor
@@ -96,6 +123,8 @@ class Stage(IStage[T, R]):
         )
         self._concurrency = concurrency
         self._name = name or getattr(fn, "__name__", "")
+        self._batch_size = batch_size
+        self._max_batch_latency = max_batch_latency
 
     @property
     def fn(self) -> Callable[[T], R] | Callable[[T], Awaitable[R]]:
@@ -117,8 +146,139 @@ class Stage(IStage[T, R]):
         """此 stage 的名稱。"""
         return self._name
 
+    @property
+    def batch_size(self) -> int | None:
+        """每批最多的 item 數。"""
+        return self._batch_size
+
+    @property
+    def max_batch_latency(self) -> float:
+        """湊滿一批最多等待的秒數。"""
+        return self._max_batch_latency
+
     def __repr__(self) -> str:
+        batch = "" if self._batch_size is None else f", batch_size={self._batch_size}"
         return (
             f"Stage(name={self._name!r}, executor={self._executor!r}, "
-            f"concurrency={self._concurrency})"
+            f"concurrency={self._concurrency}{batch})"
+        )
+
+
+class _Compose:
+    """依序套用多個函式（可 pickle，供 process stage 使用）。
+
+    每個函式在對應的 ``limits`` semaphore 內呼叫，限制其同時呼叫數。
+    ``can_fuse`` 雖要求各 stage concurrency 相同，但 ``FusedStage`` 的 worker 數
+    是其總和：N 個 concurrency 為 c 的 stage 合併後有 N * c 個 worker，
+    沒有 semaphore 時它們可能同時呼叫同一個 ``fn``，超過該 stage 的 c。
+    """
+
+    def __init__(
+        self, fns: tuple[Callable[[Any], Any], ...], limits: tuple[Any, ...]
+    ) -> None:
+        self.fns = fns
+        self.limits = limits
+
+    def __call__(self, data: Any) -> Any:
+        for fn, limit in zip(self.fns, self.limits):
+            with limit:
+                data = fn(data)
+        return data
+
+
+class FusedStage(IStage[Any, Any]):
+    """多個相鄰 stage 合併成的一個 stage。
+
+    由 ``Pipeline`` 的 fusion 自動建立：同一個 worker 依序呼叫各 stage 的
+    ``fn``，省去 stage 之間的 queue 傳遞與 ``Msg`` 配置。
+    ``name`` 以 ``+`` 串接原本的名稱，``stages`` 保留原本的 stage。
+
+    worker 數（``concurrency``）為各 stage concurrency 的總和，與合併前相同，
+    因此 I/O-bound 的 stage 合併後吞吐量不變；每個 ``fn`` 仍以 semaphore
+    限制為最多 ``concurrency`` 個同時呼叫（process stage 為跨行程的 semaphore）。
+
+    Args:
+        stages: 要合併的 stage，``executor`` 與 ``concurrency`` 必須相同，
+            且不可為 async 或批次 stage。
+
+    Raises:
+        ValueError: ``stages`` 無法合併。
+    """
+
+    def __init__(self, stages: list[IStage[Any, Any]]) -> None:
+        if not stages or not all(can_fuse(stages[0], s) for s in stages):
+            msg = f"無法合併的 stages: {stages!r}"
+            raise ValueError(msg)
+        self._stages = tuple(stages)
+        if stages[0].executor == "process":
+            from qqabc.qq import get_context  # noqa: PLC0415
+
+            semaphore: Any = get_context().Semaphore
+        else:
+            semaphore = threading.Semaphore
+        self._fn = _Compose(
+            tuple(s.fn for s in stages),  # type: ignore[misc]
+            tuple(semaphore(s.concurrency) for s in stages),
         )
+
+    @property
+    def stages(self) -> tuple[IStage[Any, Any], ...]:
+        """合併前的 stages。"""
+        return self._stages
+
+    @property
+    def fn(self) -> Callable[[Any], Any]:
+        """依序呼叫各 stage ``fn`` 的函式。"""
+        return self._fn
+
+    @property
+    def executor(self) -> ExecutorType:
+        """執行方式（與各 stage 相同）。"""
+        return self._stages[0].executor
+
+    @property
+    def concurrency(self) -> int:
+        """並行 worker 數量（各 stage concurrency 的總和）。"""
+        return sum(s.concurrency for s in self._stages)
+
+    @property
+    def name(self) -> str:
+        """以 ``+`` 串接的各 stage 名稱。"""
+        return "+".join(s.name for s in self._stages)
+
+    def __repr__(self) -> str:
+        return f"FusedStage({list(self._stages)!r})"
+
+
+def can_fuse(a: IStage[Any, Any], b: IStage[Any, Any]) -> bool:
+    """兩個 stage 是否能合併：同為 thread 或同為 process、concurrency 相同且不批次。
+
+    concurrency 不同通常代表某個 stage 刻意限制並行度（例如共用的連線），
+    因此不合併。
+    """
+    return (
+        a.executor == b.executor
+        and a.executor in {"thread", "process"}
+        and a.concurrency == b.concurrency
+        and a.batch_size is None
+        and b.batch_size is None
+    )
+
+
+def fuse_stages(stages: list[IStage[Any, Any]]) -> list[IStage[Any, Any]]:
+    """將可合併的相鄰 stage（見 ``can_fuse``）合併為 ``FusedStage``。
+
+    Examples:
+        >>> stages = fuse_stages(
+        ...     [Stage(fn=abs), Stage(fn=str), Stage(fn=len, concurrency=1)]
+        ... )
+        >>> [s.name for s in stages]
+        ['abs+str', 'len']
+    """
+    groups: list[list[IStage[Any, Any]]] = []
+    for stage in stages:
+        if groups and can_fuse(groups[-1][-1], stage):
+            groups[-1].append(stage)
+        else:
+            groups.append([stage])
+    return [g[0] if len(g) == 1 else FusedStage(g) for g in groups]
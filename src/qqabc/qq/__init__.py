@@ -0,0 +1,1537 @@
+"""
+Copyright 2025 Metaist LLC.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from functools import partial
+from itertools import chain, islice
+from os import cpu_count
+from queue import Empty
+from queue import Queue as ThreadSafeQueue
+from threading import Thread
+from time import monotonic, perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from qqabc.qq.codec import Codec, MarshalCodec, Serializer, get_codec
+from qqabc.qq.reorder import Reorder
+from qqabc.qq.stats import QStats, make_stats
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import AsyncIterator
+
+    from multiprocess import (
+        Process,  # type: ignore[reportAttributeAccessIssue]
+        Queue,  # type: ignore[reportAttributeAccessIssue]
+    )
+    from multiprocess.context import BaseContext
+    from typing_extensions import Self
+
+    from qqabc.qq.array import mapq_array
+    from qqabc.qq.autoscale import Autoscale, Autoscaler, Meter
+    from qqabc.qq.disk import FsyncPolicy
+    from qqabc.qq.pool import WorkerPool
+    from qqabc.qq.server import Address
+else:
+    try:
+        from typing import Self
+    except ImportError:
+        from typing_extensions import Self  # noqa: F401
+
+__all__ = (
+    "AUTO_CHUNK_SECONDS",
+    "BATCH_SIZE",
+    "END_MSG",
+    "IS_MACOS",
+    "NUM_CPUS",
+    "NUM_THREADS",
+    "Autoscale",
+    "Context",
+    "ContextName",
+    "Msg",
+    "MsgQ",
+    "Q",
+    "QStats",
+    "QueueKind",
+    "Scheduler",
+    "StartMethod",
+    "Task",
+    "Worker",
+    "WorkerPool",
+    "get_context",
+    "mapq",
+    "mapq_array",
+    "preload_forkserver",
+    "run",
+    "run_thread",
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Task = Callable[..., R]
+"""Task function signature (any `Callable`)."""
+
+if TYPE_CHECKING:
+    Context = Union[Process, Thread]
+    """Execution contexts (`Process`, `Thread`)."""
+
+ContextName = Literal["process", "thread"]
+"""Execution context names (`"process"`, `"thread"`)."""
+
+QueueKind = Literal["process", "thread", "shm", "async", "disk", "remote"]
+"""Queue backend names (`"process"`, `"thread"`, `"shm"`, `"async"`, `"disk"`,
+`"remote"`)."""
+
+_LOCAL_KINDS = ("thread", "async", "disk")
+"""Backends that live in one process and are served by thread workers."""
+
+_IPC_KINDS = ("process", "shm")
+"""Backends that `Q` serializes for (the others copy nothing or serialize
+messages themselves)."""
+
+StartMethod = Literal["fork", "forkserver", "spawn"]
+"""Process start methods (`"fork"`, `"forkserver"`, `"spawn"`)."""
+
+Scheduler = Literal["shared", "steal"]
+"""How `mapq` hands work to thread workers (`"shared"`, `"steal"`)."""
+
+
+@dataclass
+class Msg(Generic[T]):
+    """Message for a queue."""
+
+    data: T
+    """Message data to be transmitted."""
+
+    kind: str = ""
+    """Optional marker of message type."""
+
+    order: int = 0
+    """Optional ordering of messages."""
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as a compact `(data, kind, order)` tuple without field names.
+
+        The send time stamped by a queue with statistics (see `QStats`) is kept.
+        """
+        sent = self.__dict__.get("_sent")
+        if sent is None:
+            return (Msg, (self.data, self.kind, self.order))
+        return (Msg, (self.data, self.kind, self.order), {"_sent": sent})
+
+    def release(self) -> None:
+        """Release the shared memory behind `data`, if any.
+
+        Messages read from a `Q` with `oob_threshold` may hold views into a
+        shared-memory segment. Call this once those views are no longer needed;
+        it does nothing for ordinary messages.
+
+        Messages read from a `"disk"` queue stay in its log (and are replayed
+        after a restart) until this is called.
+        """
+        segment = self.__dict__.pop("_segment", None)
+        if segment is not None:
+            segment.release()
+        ack = self.__dict__.pop("_ack", None)
+        if ack is not None:
+            ack()
+
+
+# NOTE: The python `queue.Queue` is not properly a generic.
+# See: https://stackoverflow.com/a/48554601
+if TYPE_CHECKING:  # pragma: no cover
+    MsgQ = Union[Queue[Msg], ThreadSafeQueue]  # pylint: disable=unsubscriptable-object
+
+END_MSG: Msg = Msg(data=None, kind="END")
+"""Message that indicates no future messages will be sent."""
+
+_BATCH_KIND = "BATCH"
+"""Marker of an envelope message carrying a list of messages (see `Q.put_many`)."""
+
+_NOTHING: Any = object()
+"""Sentinel for an exhausted iterator."""
+
+BATCH_SIZE: int = 128
+"""Default maximum number of messages packed into one envelope by `Q.put_many`."""
+
+## Hardware-Specific Information ##
+
+NUM_CPUS: int = cpu_count() or 1
+"""Number of CPUs on this machine."""
+
+NUM_THREADS: int = min(32, NUM_CPUS + 4)
+"""Default number of threads (up to 32).
+
+See: [CPython's default for this value][1].
+
+[1]: https://github.com/python/cpython/blob/a635d6386041a2971cf1d39837188ffb8139bcc7/Lib/concurrent/futures/thread.py#L142
+"""
+
+IS_MACOS: bool = sys.platform == "darwin"
+"""`True` if we're running on MacOS.
+
+Currently, we only use this value for testing, but there are certain features that
+do not work properly on MacOS.
+
+See: [Example of MacOS-specific issues][1].
+
+[1]: https://github.com/python/cpython/blob/c5b670efd1e6dabc94b6308734d63f762480b80f/Lib/multiprocessing/queues.py#L125
+"""
+
+
+def get_context(start_method: StartMethod | None = None) -> BaseContext:
+    """Return the `multiprocess` context for a start method.
+
+    Queues and processes that talk to each other must come from the same
+    context, so pass the same `start_method` to `Q`, `run` and friends.
+
+    Args:
+        start_method (StartMethod, optional): `"fork"`, `"forkserver"` or
+            `"spawn"`. If `None`, the platform default is used.
+            Defaults to `None`.
+
+    Returns:
+        BaseContext: the context
+    """
+    from multiprocess import get_context as _get_context  # noqa: PLC0415
+
+    return _get_context(start_method)
+
+
+def preload_forkserver(modules: Iterable[str]) -> None:
+    """Start the fork server with heavy modules already imported.
+
+    Workers started with `start_method="forkserver"` are forked from this
+    server, so they start in milliseconds and inherit `modules` instead of
+    importing them again. Has no effect once the fork server is running.
+
+    Args:
+        modules (Iterable[str]): names of modules to import in the server.
+    """
+    from multiprocess import forkserver  # noqa: PLC0415
+
+    get_context("forkserver").set_forkserver_preload(list(modules))
+    forkserver.ensure_running()
+
+
+class Worker:
+    """A function running in a `Process` or `Thread`."""
+
+    _worker: Context
+    """Execution context."""
+
+    @staticmethod
+    def process(
+        task: Task,
+        *args: Any,
+        start_method: StartMethod | None = None,
+        **kwargs: Any,
+    ) -> Worker:
+        """Create a `Process`-based `Worker`.
+
+        Args:
+            task (Task): function to run
+            *args (Any): additional arguments to `task`
+            start_method (StartMethod, optional): how to start the process
+                (not passed to `task`). Defaults to `None` (platform default).
+            **kwargs (Any): additional keyword arguments to `task`
+
+        Returns:
+            Worker: wrapped worker.
+        """
+        # NOTE: On MacOS, python 3.8 switched the default method
+        # from "fork" to "spawn" because fork is considered dangerous.
+        # "forkserver" (see `preload_forkserver`) is a fast, safe alternative.
+        # See:  https://bugs.python.org/issue?@action=redirect&bpo=33725
+        ctx = get_context(start_method)
+        return Worker(ctx.Process(daemon=True, target=task, args=args, kwargs=kwargs))
+
+    @staticmethod
+    def thread(task: Task, *args: Any, **kwargs: Any) -> Worker:
+        """Create a `Thread`-based `Worker`.
+
+        Args:
+            task (Task): function to run
+            *args (Any): additional arguments to `task`
+            **kwargs (Any): additional keyword arguments to `task`
+
+        Returns:
+            Worker: wrapped worker.
+        """
+        return Worker(Thread(daemon=False, target=task, args=args, kwargs=kwargs))
+
+    def __init__(self, context: Context) -> None:
+        """Construct a worker from a context.
+
+        Args:
+            context (Context): a `Process` or a `Thread`
+        """
+        self._worker = context
+        self._worker.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until the worker terminates.
+
+        Args:
+            timeout: seconds to wait (``None`` = block forever).
+        """
+        self._worker.join(timeout)
+
+    def is_alive(self) -> bool:
+        """Return whether the worker is still running."""
+        return self._worker.is_alive()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate properties to the underlying task.
+
+        Args:
+            name (str): attribute name
+
+        Returns:
+            Any: attribute from the task
+        """
+        return getattr(self._worker, name)
+
+
+def _new_queue(
+    kind: QueueKind,
+    maxsize: int = 0,
+    *,
+    raw: bool = False,
+    start_method: StartMethod | None = None,
+    priority: bool = False,
+    path: str | os.PathLike[str] | None = None,
+    fsync: FsyncPolicy = "never",
+    serializer: Serializer | None = None,
+    address: Address | None = None,
+    name: str | None = None,
+    prefetch: int = 1,
+) -> MsgQ:
+    """Construct the underlying queue for a backend.
+
+    Args:
+        kind (QueueKind): queue backend name.
+
+        maxsize (int, optional): maximum number of items (`0` = unbounded).
+            Defaults to `0`.
+
+        raw (bool, optional): items are already serialized `bytes`; backends
+            that can skip their own pickling will do so. Defaults to `False`.
+
+        start_method (StartMethod, optional): context for process-shared
+            backends. Defaults to `None` (platform default).
+
+        priority (bool, optional): take the lowest `Msg.order` first instead
+            of the oldest message. Defaults to `False`.
+
+        path (str | PathLike, optional): directory of a `"disk"` queue.
+            Defaults to `None` (temporary directory).
+
+        fsync (FsyncPolicy, optional): when a `"disk"` queue forces writes to
+            disk. Defaults to `"never"`.
+
+        serializer (Serializer, optional): how a `"disk"` or `"remote"` queue
+            writes messages. Defaults to `None` (`"pickle"` for `"disk"`,
+            `"dill"` for `"remote"`).
+
+        address (Address, optional): queue server of a `"remote"` queue.
+            Defaults to `None`.
+
+        name (str, optional): name of a `"remote"` queue on its server.
+            Defaults to `None` (a new unique name).
+
+        prefetch (int, optional): maximum messages a `"remote"` queue reads
+            per round trip. Defaults to `1`.
+
+    Raises:
+        ValueError: if `kind` is not a known backend or does not support
+            `priority`, or a `"remote"` queue has no `address`.
+
+    Returns:
+        MsgQ: underlying queue
+    """
+    if priority:
+        return _new_priority_queue(kind, maxsize, start_method)
+    if kind == "process":
+        return get_context(start_method).Queue(maxsize=maxsize)
+    if kind == "thread":
+        return ThreadSafeQueue(maxsize=maxsize)
+    if kind == "async":
+        from qqabc.qq.aio import AsyncQueue  # noqa: PLC0415
+
+        return AsyncQueue(maxsize=maxsize)
+    if kind == "shm":
+        from qqabc.qq.shm import ShmQueue  # noqa: PLC0415
+
+        return ShmQueue(maxsize=maxsize, raw=raw, ctx=get_context(start_method))
+    if kind in {"disk", "remote"}:
+        return _new_serializing_queue(
+            kind,
+            maxsize,
+            path=path,
+            fsync=fsync,
+            serializer=serializer,
+            address=address,
+            name=name,
+            prefetch=prefetch,
+        )
+    raise ValueError(f"Unknown queue type: {kind}")
+
+
+def _new_serializing_queue(
+    kind: QueueKind,
+    maxsize: int,
+    *,
+    path: str | os.PathLike[str] | None,
+    fsync: FsyncPolicy,
+    serializer: Serializer | None,
+    address: Address | None,
+    name: str | None,
+    prefetch: int,
+) -> MsgQ:
+    """Construct a backend that serializes messages itself (see `_new_queue`)."""
+    if kind == "disk":
+        from qqabc.qq.disk import DiskQueue  # noqa: PLC0415
+
+        return DiskQueue(path, maxsize, fsync=fsync, serializer=serializer)
+    if address is None:
+        raise ValueError("A remote queue needs the address of a queue server")
+    from qqabc.qq.remote import RemoteQueue  # noqa: PLC0415
+
+    return RemoteQueue(address, name, maxsize, serializer=serializer, prefetch=prefetch)
+
+
+def _count(msg: Msg[Any]) -> int:
+    """Number of data messages in `msg` (a batch envelope holds many)."""
+    if msg.kind == _BATCH_KIND:
+        return len(msg.data)
+    return 0 if msg.kind == END_MSG.kind else 1
+
+
+def _new_priority_queue(
+    kind: QueueKind, maxsize: int, start_method: StartMethod | None
+) -> MsgQ:
+    """Construct a priority queue for a backend (see `_new_queue`)."""
+    from qqabc.qq.priority import (  # noqa: PLC0415
+        PriorityQueue,
+        ProcessPriorityQueue,
+    )
+
+    if kind == "thread":
+        return PriorityQueue(maxsize=maxsize)
+    if kind == "process":
+        return ProcessPriorityQueue(maxsize, ctx=get_context(start_method))
+    raise ValueError(f"Queue type does not support priority: {kind}")
+
+
+class Q(Generic[T]):
+    """Simple message queue."""
+
+    _q: MsgQ
+    """Wrapped queue."""
+
+    _cache: list[Msg] | None = None
+    """Cache of queue messages when calling `.items(cache=True)`."""
+
+    _buffer: deque[Msg]
+    """Messages unpacked from a batch envelope but not yet consumed."""
+
+    _oob_threshold: int | None = None
+    """Minimum buffer size sent out-of-band through shared memory (`None` = off)."""
+
+    _codec: Codec | None = None
+    """Serializer applied before messages reach the wrapped queue (`None` = off)."""
+
+    _single: bool = False
+    """`True` if every message must be queued on its own (priority, disk)."""
+
+    stats: QStats | None = None
+    """Counters and latency histograms (`None` = off)."""
+
+    def __init__(
+        self,
+        kind: QueueKind = "process",
+        *,
+        oob_threshold: int | None = None,
+        serializer: Serializer | None = None,
+        start_method: StartMethod | None = None,
+        priority: bool = False,
+        stats: bool | QStats = False,
+        path: str | os.PathLike[str] | None = None,
+        fsync: FsyncPolicy = "never",
+        address: Address | None = None,
+        name: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Construct a queue wrapper.
+
+        Args:
+            kind (QueueKind, optional): If `"thread"`, construct a lighter-weight
+                `Queue` that is thread-safe. If `"async"`, construct a
+                thread-safe queue that coroutines can also await (see `aget`).
+                If `"shm"`, construct a shared-memory ring buffer that processes
+                can share without a pipe. If `"disk"`, construct a durable
+                queue that pages messages to a log in `path` (see
+                `qqabc.qq.disk`). If `"remote"`, use the queue `name` of the
+                queue server at `address`, which processes on any host can
+                share (see `qqabc.qq.server`). Otherwise, construct a full
+                `multiprocess.Queue`. Defaults to `"process"`.
+
+            oob_threshold (int, optional): if set, buffers of at least this many
+                bytes (`bytes`, NumPy arrays, ...) are moved into shared memory
+                and only a small handle is queued. Readers get `memoryview` or
+                `ndarray` views and must call `Msg.release()` when done.
+                Only used by `"process"` and `"shm"` queues; cannot be combined
+                with `serializer="marshal"`, which has no way to write the
+                handle. Defaults to `None`.
+
+            serializer (Serializer, optional): `"pickle"`, `"marshal"`, `"dill"`
+                or a `Codec` used to turn messages into bytes before they are
+                queued. If `None`, the backend's own pickling (`dill`) is used.
+                Ignored for `"thread"` and `"async"` queues, which never copy,
+                and for priority queues, which must read `Msg.order`. `"disk"`
+                and `"remote"` queues use it to write messages (default
+                `"pickle"` and `"dill"`).
+                Defaults to `None`.
+
+            start_method (StartMethod, optional): start method of the processes
+                that will share this queue (see `get_context`).
+                Defaults to `None` (platform default).
+
+            priority (bool, optional): if `True`, `get` returns the message with
+                the lowest `Msg.order` first; equal orders keep arrival order and
+                `END_MSG` comes after everything else. Only `"thread"` and
+                `"process"` queues support this. Defaults to `False`.
+
+            stats (bool | QStats, optional): if `True` (or a `QStats` to fill),
+                count messages and time every write and read, and stamp each
+                message so its time in the queue is known. See `stats`.
+                Defaults to `False`.
+
+            path (str | PathLike, optional): directory of a `"disk"` queue; open
+                the same directory again to replay messages that were not
+                released. Defaults to `None` (temporary directory).
+
+            fsync (FsyncPolicy, optional): when a `"disk"` queue forces writes
+                to disk. Defaults to `"never"`.
+
+            address (Address, optional): `(host, port)` or Unix socket path of
+                the server of a `"remote"` queue. Defaults to `None`.
+
+            name (str, optional): name of a `"remote"` queue; clients using
+                the same name share it. Pickled copies keep the name.
+                Defaults to `None` (a new unique name).
+
+            prefetch (int, optional): maximum messages a `"remote"` queue
+                takes from its server per read; the extra messages wait in this
+                client, unseen by other readers. Defaults to `1`.
+
+        Raises:
+            ValueError: if `oob_threshold` is combined with a `MarshalCodec`.
+        """
+        if kind in _IPC_KINDS:
+            self._oob_threshold = oob_threshold
+            if serializer is not None and not priority:
+                self._codec = get_codec(serializer)
+            if oob_threshold is not None and isinstance(self._codec, MarshalCodec):
+                raise ValueError("oob_threshold needs a serializer other than marshal")
+        self._single = priority or kind == "disk"
+        self.stats = make_stats(stats)
+        self._q = _new_queue(
+            kind,
+            raw=self._codec is not None,
+            start_method=start_method,
+            priority=priority,
+            path=path,
+            fsync=fsync,
+            serializer=serializer,
+            address=address,
+            name=name,
+            prefetch=prefetch,
+        )
+        self._buffer = deque()
+
+    def qsize(self) -> int:
+        """Return the approximate number of items in the queue.
+
+        NOTE: A batch written by `put_many` counts as a single item.
+        """
+        return self._q.qsize()
+
+    def empty(self) -> bool:
+        """Return ``True`` if the queue is empty."""
+        return self._q.empty()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate properties to the underlying queue.
+
+        Args:
+            name (str): name of the attribute to access
+
+        Returns:
+            Any: attribute from the queue
+        """
+        if name == "_q":  # not set yet (e.g., while unpickling)
+            raise AttributeError(name)
+        return getattr(self._q, name)
+
+    def __iter__(self) -> Iterator[Msg[T]]:
+        """Iterate over messages in a queue until `END_MSG` is received.
+
+        Yields:
+            Iterator[Msg]: iterate over messages in the queue
+        """
+        return self.iter()
+
+    def iter(self, timeout: float | None = None) -> Iterator[Msg[T]]:
+        """Iterate over messages in a queue until `END_MSG` is received.
+
+        Yields:
+            Iterator[Msg]: iterate over messages in the queue
+        """
+        while True:
+            msg = self.get(block=True, timeout=timeout)
+            if msg.kind == END_MSG.kind:
+                # We'd really like to put the `END_MSG` back in the queue
+                # to prevent reading past the end, but in practice
+                # this often creates an uncatchable `BrokenPipeError`.
+                # q.put(END_MSG)  # noqa: ERA001
+                break
+            yield msg
+
+    def get(self, *, block: bool = True, timeout: float | None = None) -> Msg[T]:
+        """Remove and return the next message, unpacking batches as needed.
+
+        Args:
+            block (bool, optional): if `True`, wait for a message to arrive.
+                Defaults to `True`.
+
+            timeout (float, optional): seconds to wait (`None` = block forever).
+                Defaults to `None`.
+
+        Raises:
+            Empty: if no message is available in time.
+
+        Returns:
+            Msg: next message (may be `END_MSG`)
+        """
+        try:
+            msg = self._buffer.popleft()
+        except IndexError:
+            msg = self._unbatch(self._recv(block=block, timeout=timeout))
+
+        if self._oob_threshold is not None:
+            return self._unpack(msg)
+        return msg
+
+    def _unbatch(self, msg: Msg[Any]) -> Msg[T]:
+        """Buffer the rest of a batch envelope and return its first message."""
+        if msg.kind != _BATCH_KIND:
+            return msg
+        batch: list[Msg[T]] = msg.data
+        self._buffer.extend(islice(batch, 1, None))
+        return batch[0]
+
+    def _send(self, msg: Msg[Any]) -> None:
+        """Put a message (or batch envelope) on the wrapped queue."""
+        if self.stats is not None:
+            self._send_measured(msg)
+            return
+        self._q.put(msg if self._codec is None else self._encode(msg))
+
+    def _send_many(
+        self, put_many: Callable[[list[Any]], Any], msgs: list[Msg[Any]]
+    ) -> None:
+        """Put separate messages with one write of a backend that has `put_many`."""
+        stats = self.stats
+        start = monotonic()
+        if stats is not None:
+            msgs = [stats.stamp(msg) for msg in msgs]
+        put_many(msgs if self._codec is None else [self._encode(m) for m in msgs])
+        if stats is not None:
+            stats.sent(len(msgs), monotonic() - start, self._depth())
+
+    def _send_measured(self, msg: Msg[Any]) -> None:
+        """`_send`, stamping the message and recording the write."""
+        stats: QStats = self.stats  # type: ignore[assignment]
+        start = monotonic()
+        stamped = stats.stamp(msg)
+        self._q.put(stamped if self._codec is None else self._encode(stamped))
+        stats.sent(_count(msg), monotonic() - start, self._depth())
+
+    def _encode(self, msg: Msg[Any]) -> bytes:
+        """Serialize a message with the codec."""
+        data = msg.data
+        if msg.kind == _BATCH_KIND:
+            data = [(m.data, m.kind, m.order) for m in data]
+        item: tuple[Any, ...] = (data, msg.kind, msg.order)
+        sent = msg.__dict__.get("_sent")
+        if sent is not None:
+            item += (sent,)
+        return self._codec.dumps(item)  # type: ignore[union-attr]
+
+    def _recv(self, *, block: bool, timeout: float | None) -> Msg[Any]:
+        """Take a message (or batch envelope) from the wrapped queue."""
+        if self.stats is not None:
+            return self._recv_measured(block=block, timeout=timeout)
+        item = self._q.get(block=block, timeout=timeout)
+        return item if self._codec is None else self._decode(item)
+
+    def _recv_measured(self, *, block: bool, timeout: float | None) -> Msg[Any]:
+        """`_recv`, recording the read and the time the message was queued."""
+        stats: QStats = self.stats  # type: ignore[assignment]
+        start = monotonic()
+        item = self._q.get(block=block, timeout=timeout)
+        msg = item if self._codec is None else self._decode(item)
+        stats.received(msg, _count(msg), monotonic() - start)
+        return msg
+
+    def _decode(self, item: bytes) -> Msg[Any]:
+        """Deserialize a message with the codec."""
+        data, kind, order, *sent = self._codec.loads(item)  # type: ignore[union-attr]
+        if kind == _BATCH_KIND:
+            data = [Msg(*m) for m in data]
+        msg = Msg(data, kind, order)
+        if sent:
+            msg.__dict__["_sent"] = sent[0]
+        return msg
+
+    def _depth(self) -> int | None:
+        """Return the size of the wrapped queue, if the backend knows it."""
+        try:
+            return self._q.qsize()
+        except NotImplementedError:  # e.g., `multiprocess.Queue` on MacOS
+            return None
+
+    def _pack(self, msg: Msg[T]) -> Msg[Any]:
+        """Move large buffers of `msg.data` out-of-band, if enabled."""
+        if self._oob_threshold is None:
+            return msg
+
+        from qqabc.qq.oob import OutOfBand  # noqa: PLC0415
+
+        handle = OutOfBand.pack(msg.data, self._oob_threshold)
+        if handle is None:
+            return msg
+        return Msg(data=handle, kind=msg.kind, order=msg.order)
+
+    @staticmethod
+    def _unpack(msg: Msg[Any]) -> Msg[Any]:
+        """Map the shared memory behind an out-of-band message."""
+        from qqabc.qq.oob import OutOfBand  # noqa: PLC0415
+
+        if not isinstance(msg.data, OutOfBand):
+            return msg
+
+        data, segment = msg.data.load()
+        msg = Msg(data=data, kind=msg.kind, order=msg.order)
+        msg.__dict__["_segment"] = segment
+        return msg
+
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[Msg[T]]:
+        """Wait for one message, then take whatever else is ready.
+
+        If `END_MSG` is received, it is the last message of the returned list.
+
+        Args:
+            max_items (int): maximum number of messages to return.
+
+            timeout (float, optional): seconds to wait for the first message
+                (`None` = block forever). Defaults to `None`.
+
+        Raises:
+            Empty: if no message is available in time.
+
+        Returns:
+            list[Msg]: between `1` and `max_items` messages
+        """
+        msgs = [self.get(block=True, timeout=timeout)]
+        with suppress(Empty):
+            while len(msgs) < max_items and msgs[-1].kind != END_MSG.kind:
+                msgs.append(self.get(block=False))
+        return msgs
+
+    def iter_batches(
+        self, max_items: int = BATCH_SIZE, timeout: float | None = None
+    ) -> Iterator[list[Msg[T]]]:
+        """Iterate over lists of messages until `END_MSG` is received.
+
+        Args:
+            max_items (int, optional): maximum number of messages per list.
+                Defaults to `BATCH_SIZE`.
+
+            timeout (float, optional): seconds to wait for each list
+                (`None` = block forever). Defaults to `None`.
+
+        Yields:
+            Iterator[list[Msg]]: non-empty lists of messages in the queue
+        """
+        while True:
+            msgs = self.get_many(max_items, timeout)
+            if msgs[-1].kind == END_MSG.kind:
+                if len(msgs) > 1:
+                    yield msgs[:-1]
+                break
+            yield msgs
+
+    def items(self, *, cache: bool = False, sort: bool = False) -> Iterator[Msg[T]]:
+        """End a queue and read all the current messages.
+
+        Args:
+            cache (bool, optional): if `True`, cache the messages. This allows you
+                to call this method multiple times to get the same messages.
+                Defaults to `False`.
+
+            sort (bool, optional): if `True` messages are sorted by `Msg.order`.
+                Defaults to `False`.
+
+        Yields:
+            Iterator[Msg]: iterate over messages in the queue
+        """
+        if cache:
+            if self._cache is None:  # need to build a cache
+                self.end()
+                self._cache = list(self.sorted() if sort else self)
+            return iter(self._cache)
+
+        # not cached
+        self.end()
+        return self.sorted() if sort else iter(self)
+
+    def sorted(
+        self,
+        start: int = 0,
+        *,
+        window: int | None = None,
+        gap_timeout: float | None = None,
+    ) -> Iterator[Msg[T]]:
+        """Iterate over messages sorted by `Msg.order`.
+
+        NOTE: `Msg.order` must be incremented by one for each message.
+        If there are any gaps, messages after the gap won't be yielded
+        until the end, unless `window` or `gap_timeout` lets them through.
+        Messages whose order has already been passed are yielded immediately.
+
+        Args:
+            start (int, optional): initial message number. Defaults to `0`.
+
+            window (int, optional): maximum number of messages to hold back.
+                When exceeded, the missing order numbers are skipped and the
+                smallest held message is yielded. Defaults to `None` (unbounded).
+
+            gap_timeout (float, optional): seconds to wait for a missing order
+                number while messages are held back before skipping it.
+                Defaults to `None` (wait until the end).
+
+        Yields:
+            Iterator[Msg]: message yielded in the correct order
+        """
+        buf: Reorder[T] = Reorder(start, window=window, gap_timeout=gap_timeout)
+        while True:
+            try:
+                msg = self.get(block=True, timeout=buf.timeout())
+            except Empty:  # waited too long for a gap
+                yield from buf.expire()
+                continue
+            if msg.kind == END_MSG.kind:
+                break
+            yield from buf.add(msg)
+
+        # generator ended; yield any waiting items
+        yield from buf.drain()
+
+    async def aget(self, timeout: float | None = None) -> Msg[T]:
+        """Await the next message without blocking the event loop.
+
+        `"async"` queues wake the coroutine directly; other backends wait for
+        `get` in the loop's default executor.
+
+        Args:
+            timeout (float, optional): seconds to wait (`None` = forever).
+                Defaults to `None`.
+
+        Raises:
+            Empty: if no message is available in time.
+
+        Returns:
+            Msg: next message (may be `END_MSG`)
+        """
+        aget = getattr(self._q, "aget", None)
+        if aget is None:
+            import asyncio  # noqa: PLC0415
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, partial(self.get, timeout=timeout))
+        try:
+            return self._buffer.popleft()
+        except IndexError:
+            pass
+        stats = self.stats
+        if stats is None:
+            return self._unbatch(await aget(timeout))
+
+        start = monotonic()
+        msg = await aget(timeout)
+        stats.received(msg, _count(msg), monotonic() - start)
+        return self._unbatch(msg)
+
+    async def aput(self, data: T | Msg[T], *, kind: str = "", order: int = 0) -> Q:
+        """Put a message on the queue without blocking the event loop.
+
+        Args:
+            data (Any, optional): message data. Defaults to `None`.
+
+            kind (str, optional): kind of message. Defaults to `""`.
+
+            order (int, optional): message order. Defaults to `0`.
+
+        Returns:
+            Self: self for chaining
+        """
+        msg = data if isinstance(data, Msg) else Msg(data=data, kind=kind, order=order)
+        aput = getattr(self._q, "aput", None)
+        if aput is None:
+            import asyncio  # noqa: PLC0415
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.put, msg)
+            return self
+
+        stats = self.stats
+        if stats is None:
+            await aput(msg)
+            return self
+
+        start = monotonic()
+        await aput(stats.stamp(msg))
+        stats.sent(_count(msg), monotonic() - start, self._depth())
+        return self
+
+    async def aend(self) -> Q:
+        """Add the `END_MSG` without blocking the event loop.
+
+        Returns:
+            Self: self for chaining
+        """
+        return await self.aput(END_MSG)
+
+    def __aiter__(self) -> AsyncIterator[Msg[T]]:
+        """Iterate over messages asynchronously until `END_MSG` is received.
+
+        Yields:
+            AsyncIterator[Msg]: iterate over messages in the queue
+        """
+        return self.aiter()
+
+    async def aiter(self, timeout: float | None = None) -> AsyncIterator[Msg[T]]:
+        """Iterate over messages asynchronously until `END_MSG` is received.
+
+        Yields:
+            AsyncIterator[Msg]: iterate over messages in the queue
+        """
+        while True:
+            msg = await self.aget(timeout)
+            if msg.kind == END_MSG.kind:
+                break
+            yield msg
+
+    async def asorted(
+        self,
+        start: int = 0,
+        *,
+        window: int | None = None,
+        gap_timeout: float | None = None,
+    ) -> AsyncIterator[Msg[T]]:
+        """Iterate asynchronously over messages sorted by `Msg.order`.
+
+        See `sorted` for the meaning of the arguments.
+
+        Yields:
+            AsyncIterator[Msg]: message yielded in the correct order
+        """
+        buf: Reorder[T] = Reorder(start, window=window, gap_timeout=gap_timeout)
+        while True:
+            try:
+                msg = await self.aget(buf.timeout())
+            except Empty:  # waited too long for a gap
+                for ready in buf.expire():
+                    yield ready
+                continue
+            if msg.kind == END_MSG.kind:
+                break
+            for ready in buf.add(msg):
+                yield ready
+
+        # generator ended; yield any waiting items
+        for ready in buf.drain():
+            yield ready
+
+    def put(self, data: T | Msg[T], *, kind: str = "", order: int = 0) -> Q:
+        """Put a message on the queue.
+
+        Args:
+            data (Any, optional): message data. Defaults to `None`.
+
+            kind (str, optional): kind of message. Defaults to `""`.
+
+            order (int, optional): message order. Defaults to `0`.
+
+        Returns:
+            Self: self for chaining
+        """
+        msg = data if isinstance(data, Msg) else Msg(data=data, kind=kind, order=order)
+        self._send(self._pack(msg))
+        return self
+
+    def put_many(
+        self,
+        items: Iterable[T | Msg[T]],
+        *,
+        kind: str = "",
+        order: int = 0,
+        batch_size: int = BATCH_SIZE,
+    ) -> Q:
+        """Put many messages on the queue using as few writes as possible.
+
+        Messages are packed into envelopes of up to `batch_size` messages, so
+        each envelope costs one lock acquisition and (for `"process"` queues)
+        one pickle and pipe write. Readers unpack envelopes transparently.
+        Priority and `"disk"` queues send messages one at a time, so each is
+        ranked or acknowledged on its own. `"remote"` queues send each batch
+        in one request but keep the messages separate, so readers share them.
+
+        Args:
+            items (Iterable): message data or `Msg` objects. A `Msg` is sent
+                unchanged; other data is wrapped with consecutive `order` values.
+
+            kind (str, optional): kind of wrapped messages. Defaults to `""`.
+
+            order (int, optional): order of the first wrapped message.
+                Defaults to `0`.
+
+            batch_size (int, optional): maximum messages per envelope.
+                Defaults to `BATCH_SIZE`.
+
+        Returns:
+            Self: self for chaining
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive: {batch_size}")
+        if self._single:
+            batch_size = 1
+
+        msgs = (
+            self._pack(
+                item if isinstance(item, Msg) else Msg(data=item, kind=kind, order=n)
+            )
+            for n, item in enumerate(items, order)
+        )
+        many = getattr(self._q, "put_many", None)
+        while batch := list(islice(msgs, batch_size)):
+            if len(batch) == 1:
+                self._send(batch[0])
+            elif many is not None:
+                self._send_many(many, batch)
+            else:
+                self._send(Msg(data=batch, kind=_BATCH_KIND))
+        return self
+
+    def end(self) -> Q:
+        """Add the `END_MSG` to indicate the end of work.
+
+        Returns:
+            Self: self for chaining
+        """
+        self._send(END_MSG)
+        return self
+
+    def stop(self, workers: Worker | Sequence[Worker]) -> Q:
+        """Use this queue to notify workers to end and wait for them to join.
+
+        Args:
+            workers (Worker, Sequence[Worker]): workers to wait for
+
+        Returns:
+            Self: self for chaining
+        """
+        _workers = [workers] if isinstance(workers, Worker) else workers
+
+        for _ in range(len(_workers)):
+            self.end()
+
+        for task in _workers:
+            task.join()
+
+        return self
+
+
+def run(
+    task: Task, *args: Any, start_method: StartMethod | None = None, **kwargs: Any
+) -> Worker:
+    """Run a function as a subprocess.
+
+    Args:
+        task (Task): function to run in each subprocess
+
+        *args (Any): additional positional arguments to `task`.
+
+        start_method (StartMethod, optional): how to start the subprocess
+            (not passed to `task`). Defaults to `None` (platform default).
+
+        **kwargs (Any): additional keyword arguments to `task`.
+
+    Returns:
+        Worker: worker started in a subprocess
+
+    .. changed:: 2.0.4
+       This function now returns a `Worker` instead of a `Process`.
+    """
+    return Worker.process(task, *args, start_method=start_method, **kwargs)
+
+
+def run_thread(task: Task, *args: Any, **kwargs: Any) -> Worker:
+    """Run a function as a thread.
+
+    Args:
+        task (Task): function to run in each thread
+
+        *args (Any): additional positional arguments to `task`.
+
+        **kwargs (Any): additional keyword arguments to `task`.
+
+    Returns:
+        Worker: worker started in a thread
+
+    .. changed:: 2.0.4
+       This function now returns a `Worker` instead of a `Thread`.
+    """
+    return Worker.thread(task, *args, **kwargs)
+
+
+def mapq(
+    task: Callable[..., Msg[R]],
+    *args: tuple[T],
+    num: int | Autoscale | None = None,
+    kind: QueueKind = "process",
+    oob_threshold: int | None = None,
+    max_pending: int | None = None,
+    serializer: Serializer | None = None,
+    address: Address | None = None,
+    start_method: StartMethod | None = None,
+    initializer: Callable[..., Any] | None = None,
+    initargs: tuple[Any, ...] = (),
+    pass_state: bool = False,
+    teardown: Callable[[Any], Any] | None = None,
+    chunksize: int | Literal["auto"] | None = None,
+    scheduler: Scheduler = "shared",
+) -> Iterator[R]:
+    """Call a function with arguments using multiple workers.
+
+    Args:
+        func (Callable): function to call
+
+        *args (list[Any]): arguments to `func`. If multiple lists are provided,
+            they will be passed to `zip` first.
+
+        num (int | Autoscale, optional): number of workers. If `None`,
+            `NUM_CPUS` or `NUM_THREADS` will be used as appropriate. An
+            `Autoscale` adapts the number of workers while the job runs (see
+            `qqabc.qq.autoscale`) and makes the call stream (with
+            `max_pending` defaulting to twice the most workers).
+            Defaults to `None`.
+
+        kind (QueueKind, optional): queue backend to use. `"thread"` and
+            `"async"` run workers in threads; other backends run them in
+            processes.
+            Defaults to `"process"`.
+
+        oob_threshold (int, optional): send buffers of at least this many bytes
+            through shared memory (see `Q`). A result backed by shared memory is
+            only valid until the next result is requested; copy it to keep it.
+            Defaults to `None`.
+
+        max_pending (int, optional): if set, stream: read the arguments lazily
+            and keep at most this many items submitted but not yet yielded, so
+            memory stays constant and results arrive as soon as they are ready.
+            If `None`, submit every item up front. Defaults to `None`.
+
+        serializer (Serializer, optional): how messages are serialized between
+            processes (see `Q`). Defaults to `None`.
+
+        address (Address, optional): queue server that holds the queues when
+            `kind="remote"` (see `Q`). Defaults to `None`.
+
+        start_method (StartMethod, optional): how to start worker processes
+            (see `get_context`). Ignored for `"thread"` and `"async"`.
+            Defaults to `None`.
+
+        initializer (Callable, optional): called once in each worker, before
+            it runs `func`; its return value is the worker's state (e.g., a
+            database connection or a loaded model). Defaults to `None`.
+
+        initargs (tuple, optional): arguments to `initializer`. Defaults to `()`.
+
+        pass_state (bool, optional): if `True`, call `func(state, *args)` with
+            the worker's state. Defaults to `False`.
+
+        teardown (Callable, optional): called with the worker's state once the
+            worker receives `END_MSG` (or `func` raises). Defaults to `None`.
+
+        chunksize (int | "auto", optional): if set, send the arguments in lists
+            of this many items, so each message carries a chunk of work and a
+            chunk of results. `"auto"` sizes chunks from the measured time per
+            item (aiming at about `AUTO_CHUNK_SECONDS` per chunk) and streams;
+            with chunks, `max_pending` counts chunks. If `None`, send one item
+            per message. Defaults to `None`.
+
+        scheduler (Scheduler, optional): how thread workers get their work.
+            `"shared"` pulls every item from one queue. `"steal"` splits the
+            items between per-worker deques and lets idle workers steal from
+            busy ones, which avoids lock contention and finishes sooner when
+            a few items are much slower than the rest; it reads all arguments
+            up front and needs a `"thread"` or `"async"` kind, a fixed `num`,
+            no `max_pending` and no automatic `chunksize`.
+            Defaults to `"shared"`.
+
+    Raises:
+        ValueError: if `scheduler="steal"` is combined with unsupported options.
+
+    Yields:
+        Any: results from applying the function to the arguments
+    """
+    if max_pending is not None and max_pending < 1:
+        raise ValueError(f"max_pending must be positive: {max_pending}")
+    sizer = None if chunksize is None else _ChunkSize(chunksize)
+    chunked = sizer is not None
+
+    session = partial(
+        _session,
+        task,
+        initializer=initializer,
+        initargs=initargs,
+        pass_state=pass_state,
+        teardown=teardown,
+        chunked=chunked,
+    )
+
+    inputs: Iterator[Any] = zip(*args)
+    if sizer is not None:
+        inputs = _chunks(inputs, sizer)
+
+    if scheduler == "steal":
+        yield from _steal(
+            session, inputs, kind=kind, num=num, max_pending=max_pending, sizer=sizer
+        )
+        return
+    if scheduler != "shared":
+        raise ValueError(f"Unknown scheduler: {scheduler}")
+
+    opts: dict[str, Any] = {
+        "oob_threshold": oob_threshold,
+        "serializer": serializer,
+        "start_method": start_method,
+        "address": address,
+    }
+    q = Q[Iterable[T]](kind=kind, **opts)
+    out = Q[R](kind=kind, **opts)
+
+    def worker(_q: Q[Iterable[T]], _out: Q[R], meter: Meter | None = None) -> None:
+        """Internal call to `func`."""
+        with session() as call:
+            handle = call if meter is None else meter.timed(call)
+            for msg in _q:
+                _out.put(data=handle(msg.data), order=msg.order)
+                msg.release()
+
+    group = _start_group(
+        partial(worker, q, out), q, num=num, kind=kind, start_method=start_method
+    )
+    adaptive = not isinstance(group, _Group)
+    if max_pending is None and (adaptive or (sizer and sizer.fixed is None)):
+        max_pending = 2 * group.capacity
+
+    if max_pending is not None:
+        results = _stream(q, out, group, inputs, max_pending)
+    else:
+        results = _collect(q, out, group, inputs)
+
+    if sizer is None:
+        yield from results
+        return
+
+    for seconds, chunk in results:
+        sizer.observe(len(chunk), seconds)
+        yield from chunk
+
+
+@contextmanager
+def _session(
+    task: Callable[..., Any],
+    *,
+    initializer: Callable[..., Any] | None,
+    initargs: tuple[Any, ...],
+    pass_state: bool,
+    teardown: Callable[[Any], Any] | None,
+    chunked: bool,
+) -> Iterator[Callable[[Any], Any]]:
+    """Set up a `mapq` worker; provide the function that handles one message."""
+    state = None if initializer is None else initializer(*initargs)
+    call = partial(task, state) if pass_state else task
+
+    def handle(data: Any) -> Any:
+        if not chunked:
+            return call(*data)
+        start = perf_counter()  # report time spent so chunks can be sized
+        results = [call(*item) for item in data]
+        return perf_counter() - start, results
+
+    try:
+        yield handle
+    finally:
+        if teardown is not None:
+            teardown(state)
+
+
+class _Group:
+    """Fixed number of workers that read one queue (see `Autoscaler`)."""
+
+    def __init__(self, q: Q[Any], workers: list[Worker]) -> None:
+        self.workers = workers
+        self.capacity = len(workers)
+        self._q = q
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+    def __iter__(self) -> Iterator[Worker]:
+        return iter(self.workers)
+
+    def stop(self, *, wait: bool = True) -> None:
+        """Send `END_MSG` to each worker and (if `wait`) join them."""
+        if wait:
+            self._q.stop(self.workers)
+            return
+        for _ in self.workers:
+            self._q.end()
+
+
+def _start_group(
+    task: Callable[..., Any],
+    q: Q[Any],
+    *,
+    num: int | Autoscale | None,
+    kind: QueueKind,
+    start_method: StartMethod | None,
+) -> _Group | Autoscaler:
+    """Start the workers that run `task` (which reads `q`) for `mapq` and pools.
+
+    With an `Autoscale`, `task` is also passed the `Meter` to record tasks in.
+    """
+    threads = kind in _LOCAL_KINDS
+    start: Callable[..., Worker] = (
+        Worker.thread if threads else partial(Worker.process, start_method=start_method)
+    )
+    if num is None or isinstance(num, int):
+        n = num or (NUM_THREADS if threads else NUM_CPUS)
+        return _Group(q, [start(task) for _ in range(n)])
+
+    from qqabc.qq.autoscale import Autoscaler  # noqa: PLC0415
+
+    ctx = None if threads else get_context(start_method)
+    return Autoscaler(num, q, partial(start, task), threads=threads, ctx=ctx)
+
+
+def _steal(
+    session: Callable[[], Any],
+    inputs: Iterator[Any],
+    *,
+    kind: QueueKind,
+    num: int | Autoscale | None,
+    max_pending: int | None,
+    sizer: _ChunkSize | None,
+) -> Iterator[Any]:
+    """Run `mapq` with the work-stealing scheduler (see `qqabc.qq.steal`)."""
+    if kind not in _LOCAL_KINDS:
+        raise ValueError(f"Work stealing needs thread workers, not: {kind}")
+    if num is not None and not isinstance(num, int):
+        raise ValueError("Work stealing needs a fixed number of workers")
+    if max_pending is not None or (sizer is not None and sizer.fixed is None):
+        raise ValueError("Work stealing needs all items up front")
+    from qqabc.qq.steal import steal_map  # noqa: PLC0415
+
+    done = steal_map(session, list(inputs), num or NUM_THREADS)
+    if sizer is not None:
+        return chain.from_iterable(chunk for _, chunk in done)
+    return iter(done)
+
+
+AUTO_CHUNK_SECONDS: float = 0.01
+"""Target run time of one chunk when `mapq(chunksize="auto")`."""
+
+_MAX_CHUNKSIZE = 4096
+"""Largest chunk `mapq(chunksize="auto")` will send."""
+
+
+class _ChunkSize:
+    """Chunk size for `mapq`: fixed, or sized from the measured time per item."""
+
+    def __init__(self, chunksize: int | Literal["auto"]) -> None:
+        if chunksize == "auto":
+            self.fixed = None
+            self.size = 1  # until the first chunk has been timed
+        elif isinstance(chunksize, int) and chunksize >= 1:
+            self.fixed = self.size = chunksize
+        else:
+            raise ValueError(f"chunksize must be positive or 'auto': {chunksize}")
+        self._items = 0
+        self._seconds = 0.0
+
+    def observe(self, n: int, seconds: float) -> None:
+        """Account for a chunk of `n` items that ran for `seconds`."""
+        if self.fixed is not None or not n:
+            return
+        self._items += n
+        self._seconds += seconds
+        per_item = self._seconds / self._items
+        size = int(AUTO_CHUNK_SECONDS / per_item) if per_item else _MAX_CHUNKSIZE
+        self.size = max(1, min(size, _MAX_CHUNKSIZE))
+
+
+def _chunks(items: Iterator[T], sizer: _ChunkSize) -> Iterator[list[T]]:
+    """Group `items` into lists of `sizer.size` (read as each list is built)."""
+    while chunk := list(islice(items, sizer.size)):
+        yield chunk
+
+
+def _collect(
+    q: Q[Iterable[T]],
+    out: Q[R],
+    workers: _Group | Autoscaler,
+    inputs: Iterator[Iterable[T]],
+) -> Iterator[R]:
+    """Submit all `inputs` and yield results in order once `workers` finish."""
+    q.put_many(inputs)
+
+    # A worker process cannot exit until its results are flushed to `out`,
+    # so read `out` while another thread waits for the workers.
+    def stop() -> None:
+        workers.stop()
+        out.end()
+
+    stopper = Thread(target=stop, daemon=True)
+    stopper.start()
+    for msg in out.sorted():
+        yield msg.data
+        msg.release()
+    stopper.join()
+
+
+def _stream(
+    q: Q[Iterable[T]],
+    out: Q[R],
+    workers: _Group | Autoscaler,
+    inputs: Iterator[Iterable[T]],
+    max_pending: int,
+) -> Iterator[R]:
+    """Feed `inputs` lazily to `workers` and yield results in order.
+
+    An item counts as pending from the moment it is submitted until its result
+    is yielded, so the reorder buffer never holds more than `max_pending`
+    results even if one item is much slower than the rest.
+
+    Args:
+        q (Q): input queue read by the workers.
+
+        out (Q): output queue written by the workers.
+
+        workers (_Group | Autoscaler): running workers.
+
+        inputs (Iterator): argument tuples.
+
+        max_pending (int): maximum number of submitted but not yielded items.
+
+    Yields:
+        Any: results in input order
+    """
+    submitted = yielded = 0
+    waiting: dict[int, Msg[R]] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and submitted - yielded < max_pending:
+                value = next(inputs, _NOTHING)
+                if value is _NOTHING:
+                    exhausted = True
+                    break
+                q.put(value, order=submitted)
+                submitted += 1
+
+            if yielded == submitted:
+                break
+
+            msg = out.get()
+            waiting[msg.order] = msg
+            while yielded in waiting:
+                msg = waiting.pop(yielded)
+                yielded += 1
+                yield msg.data
+                msg.release()
+    finally:
+        # if the consumer stopped early, let the workers drain and exit
+        workers.stop(wait=yielded == submitted and exhausted)
+
+
+_LAZY = {
+    "Autoscale": "qqabc.qq.autoscale",
+    "WorkerPool": "qqabc.qq.pool",
+    "mapq_array": "qqabc.qq.array",
+}
+"""Public names defined in submodules, imported on first use."""
+
+
+def __getattr__(name: str) -> Any:
+    """Import heavy or rarely used names on first use, keeping `import` fast.
+
+    `multiprocess` (and `dill`) and `asyncio` are also only imported once a
+    process-backed or async feature is used.
+    """
+    if name in _LAZY:
+        from importlib import import_module  # noqa: PLC0415
+
+        value = getattr(import_module(_LAZY[name]), name)
+    elif name == "Context":
+        from multiprocess import Process  # noqa: PLC0415
+
+        value = Union[Process, Thread]
+    elif name == "MsgQ":
+        from multiprocess import Queue  # noqa: PLC0415
+
+        value = Queue
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
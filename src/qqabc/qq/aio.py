@@ -0,0 +1,180 @@
+"""Queue shared by threads and `asyncio` coroutines.
+
+`AsyncQueue` has the blocking `put`/`get` of `queue.Queue` for threads and
+awaitable `aput`/`aget` for coroutines. A waiting coroutine parks on a future
+of its own event loop; whoever makes room or adds an item resolves it, with
+`call_soon_threadsafe` only when the caller is on another thread. No executor
+thread is needed to bridge the two worlds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from queue import Empty, Full
+from threading import Condition, Lock, get_ident
+from time import monotonic
+from typing import Any, Tuple
+
+from qqabc.qq.sync import wait_until
+
+__all__ = ("AsyncQueue",)
+
+_Waiter = Tuple[asyncio.AbstractEventLoop, int, "asyncio.Future[None]"]
+"""Parked coroutine: its loop, the loop's thread id and the future to resolve."""
+
+
+def _resolve(fut: asyncio.Future[None]) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class AsyncQueue:
+    """FIFO queue with blocking and awaitable ends, safe across threads."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Construct an empty queue.
+
+        Args:
+            maxsize (int, optional): maximum number of items (`0` = unbounded).
+                Defaults to `0`.
+        """
+        self.maxsize = maxsize
+        self._items: deque[Any] = deque()
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+        self._getters: deque[_Waiter] = deque()
+        self._putters: deque[_Waiter] = deque()
+
+    def qsize(self) -> int:
+        """Return the number of items in the queue."""
+        return len(self._items)
+
+    def empty(self) -> bool:
+        """Return `True` if the queue is empty."""
+        return not self._items
+
+    def full(self) -> bool:
+        """Return `True` if the queue has `maxsize` items."""
+        return 0 < self.maxsize <= len(self._items)
+
+    # waking (caller holds the lock)
+
+    @staticmethod
+    def _wake(waiters: deque[_Waiter]) -> None:
+        """Resolve the oldest parked coroutine, if any."""
+        if not waiters:
+            return
+        loop, thread, fut = waiters.popleft()
+        if thread == get_ident():
+            _resolve(fut)
+        else:
+            loop.call_soon_threadsafe(_resolve, fut)
+
+    def _added(self) -> None:
+        self._not_empty.notify()
+        self._wake(self._getters)
+
+    def _removed(self) -> None:
+        self._not_full.notify()
+        self._wake(self._putters)
+
+    # blocking side
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: FBT001, FBT002
+        """Add an item, waiting for room if the queue is full.
+
+        Raises:
+            Full: if no room is available in time.
+        """
+        with self._not_full:
+            if not wait_until(
+                self._not_full, lambda: not self.full(), block=block, timeout=timeout
+            ):
+                raise Full
+            self._items.append(item)
+            self._added()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:  # noqa: FBT001, FBT002
+        """Remove and return the oldest item, waiting for one if needed.
+
+        Raises:
+            Empty: if no item is available in time.
+        """
+        with self._not_empty:
+            if not wait_until(
+                self._not_empty, lambda: not self.empty(), block=block, timeout=timeout
+            ):
+                raise Empty
+            item = self._items.popleft()
+            self._removed()
+            return item
+
+    def put_nowait(self, item: Any) -> None:
+        """Add an item without waiting."""
+        self.put(item, block=False)
+
+    def get_nowait(self) -> Any:
+        """Remove and return an item without waiting."""
+        return self.get(block=False)
+
+    # awaitable side
+
+    async def aput(self, item: Any) -> None:
+        """Add an item, waiting (without blocking the loop) for room."""
+        while True:
+            with self._lock:
+                if not self.full():
+                    self._items.append(item)
+                    self._added()
+                    return
+                fut = self._park(self._putters)
+            await self._until(fut, self._putters, None)
+
+    async def aget(self, timeout: float | None = None) -> Any:
+        """Remove and return the oldest item, waiting without blocking the loop.
+
+        Args:
+            timeout (float, optional): seconds to wait (`None` = forever).
+                Defaults to `None`.
+
+        Raises:
+            Empty: if no item is available in time.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._items:
+                    item = self._items.popleft()
+                    self._removed()
+                    return item
+                fut = self._park(self._getters)
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            try:
+                await self._until(fut, self._getters, remaining)
+            except asyncio.TimeoutError:
+                raise Empty from None
+
+    @staticmethod
+    def _park(waiters: deque[_Waiter]) -> asyncio.Future[None]:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[None] = loop.create_future()
+        waiters.append((loop, get_ident(), fut))
+        return fut
+
+    async def _until(
+        self, fut: asyncio.Future[None], waiters: deque[_Waiter], timeout: float | None
+    ) -> None:
+        """Await a parked future; pass on a wakeup we can no longer use."""
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            with self._lock:
+                for waiter in waiters:
+                    if waiter[2] is fut:
+                        waiters.remove(waiter)
+                        break
+                else:  # already woken: give the wakeup to the next waiter
+                    self._wake(waiters)
+            raise
@@ -0,0 +1,182 @@
+"""Block-wise `mapq` over NumPy arrays.
+
+`mapq_array` splits its input arrays into a few contiguous blocks along the
+first axis and calls a vectorized function once per block, writing each
+result into one preallocated output array. Only `(start, stop)` pairs cross
+the queue: thread workers read and write the arrays directly, and process
+workers map copies of them in shared memory, which each worker attaches once
+(see `mapq`'s `initializer`).
+
+NumPy is only imported when `mapq_array` is called.
+"""
+
+from __future__ import annotations
+
+from math import ceil
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from qqabc.qq import _LOCAL_KINDS, NUM_CPUS, NUM_THREADS, mapq
+from qqabc.qq.oob import _Segment
+
+if TYPE_CHECKING:
+    import numpy as np
+    from multiprocess.shared_memory import SharedMemory
+
+    from qqabc.qq import QueueKind, StartMethod
+
+__all__ = ("BLOCKS_PER_WORKER", "mapq_array")
+
+BLOCKS_PER_WORKER: int = 4
+"""Default number of blocks per worker (a few, so uneven blocks balance out)."""
+
+
+class _SharedArray:
+    """Picklable handle to an array copied into a shared-memory segment."""
+
+    def __init__(self, array: np.ndarray, *, copy: bool = True) -> None:
+        self.shape = array.shape
+        self.dtype = array.dtype.str
+        self.segment = _Segment(create=True, size=max(1, array.nbytes))
+        self.name = self.segment.name
+        if copy:
+            self.view()[...] = array
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.name, self.shape, self.dtype = state
+        self.segment = _Segment(name=self.name)
+
+    def view(self) -> np.ndarray:
+        """Return an array backed by the segment."""
+        import numpy as np  # noqa: PLC0415
+
+        return np.ndarray(self.shape, self.dtype, buffer=self.segment.buf)
+
+
+def _attach(
+    func: Callable[..., Any], inputs: Sequence[Any], out: Any
+) -> tuple[Callable[..., Any], list[np.ndarray], np.ndarray, list[SharedMemory]]:
+    """Worker state: `func` and the arrays (views of shared ones)."""
+    shared = [a for a in (*inputs, out) if isinstance(a, _SharedArray)]
+    views = [a.view() if isinstance(a, _SharedArray) else a for a in inputs]
+    target = out.view() if isinstance(out, _SharedArray) else out
+    return func, views, target, [a.segment for a in shared]
+
+
+def _detach(state: tuple[Any, ...]) -> None:
+    for segment in state[-1]:
+        segment.close()
+
+
+def _call(func: Callable[..., Any], blocks: Sequence[np.ndarray], size: int) -> Any:
+    """Apply `func` to one block and check that it returned `size` rows."""
+    import numpy as np  # noqa: PLC0415
+
+    result = func(*blocks)
+    if np.shape(result)[:1] != (size,):
+        raise ValueError(
+            f"Expected {size} rows from {func!r} but got shape {np.shape(result)}"
+        )
+    return result
+
+
+def _run_block(state: tuple[Any, ...], start: int, stop: int) -> None:
+    func, inputs, out, _ = state
+    out[start:stop] = _call(func, [a[start:stop] for a in inputs], stop - start)
+
+
+def mapq_array(
+    func: Callable[..., Any],
+    *arrays: Any,
+    num: int | None = None,
+    kind: QueueKind = "process",
+    blocksize: int | None = None,
+    out: np.ndarray | None = None,
+    start_method: StartMethod | None = None,
+) -> np.ndarray:
+    """Apply a vectorized function to blocks of arrays using multiple workers.
+
+    Example:
+        >>> import numpy as np
+        >>> mapq_array(np.add, np.arange(5), np.ones(5), kind="thread")
+        array([1., 2., 3., 4., 5.])
+
+    Args:
+        func (Callable): vectorized function; called with one block (rows
+            `start:stop` along the first axis) of each array and must return
+            `stop - start` rows.
+
+        *arrays (ArrayLike): inputs with the same length.
+
+        num (int, optional): number of workers. If `None`, `NUM_CPUS` or
+            `NUM_THREADS` will be used as appropriate. Defaults to `None`.
+
+        kind (QueueKind, optional): queue backend to use (see `mapq`).
+            Defaults to `"process"`.
+
+        blocksize (int, optional): rows per block. If `None`, split the
+            arrays into `BLOCKS_PER_WORKER` blocks per worker.
+            Defaults to `None`.
+
+        out (ndarray, optional): array to write the results into. If `None`,
+            one is allocated from the result of `func` on the first row.
+            Defaults to `None`.
+
+        start_method (StartMethod, optional): how to start worker processes
+            (see `get_context`). Defaults to `None`.
+
+    Raises:
+        ValueError: if the arrays (or `out`) have different lengths, or `func`
+            returns the wrong number of rows.
+
+    Returns:
+        ndarray: `out`, holding the result of `func` for every row
+    """
+    import numpy as np  # noqa: PLC0415
+
+    if not arrays:
+        raise ValueError("mapq_array needs at least one array")
+    inputs = [np.asarray(a) for a in arrays]
+    n = len(inputs[0])
+    if any(len(a) != n for a in inputs):
+        raise ValueError(
+            f"Arrays must have the same length: {[len(a) for a in inputs]}"
+        )
+    if out is None:
+        probe = np.asarray(_call(func, [a[: min(n, 1)] for a in inputs], min(n, 1)))
+        out = np.empty((n, *probe.shape[1:]), probe.dtype)
+    elif len(out) != n:
+        raise ValueError(f"out has {len(out)} rows instead of {n}")
+    if not n:
+        return out
+
+    workers = num or (NUM_THREADS if kind in _LOCAL_KINDS else NUM_CPUS)
+    size = blocksize or ceil(n / (workers * BLOCKS_PER_WORKER))
+    bounds = [(i, min(i + size, n)) for i in range(0, n, size)]
+    opts: dict[str, Any] = {"num": num, "kind": kind, "start_method": start_method}
+
+    shared = kind not in _LOCAL_KINDS
+    specs: list[Any] = [_SharedArray(a) for a in inputs] if shared else inputs
+    target: Any = _SharedArray(out, copy=False) if shared else out
+    try:
+        starts, stops = zip(*bounds)
+        for _ in mapq(
+            _run_block,
+            starts,
+            stops,
+            initializer=_attach,
+            initargs=(func, specs, target),
+            pass_state=True,
+            teardown=_detach,
+            **opts,
+        ):
+            pass
+        if shared:
+            out[...] = target.view()
+    finally:
+        if shared:
+            for spec in (*specs, target):
+                spec.segment.release()
+    return out
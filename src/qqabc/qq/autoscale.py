@@ -0,0 +1,307 @@
+"""Adaptive number of workers for `mapq` and `WorkerPool`.
+
+The best number of workers depends on the task: I/O-bound tasks keep many
+more threads busy than there are CPUs, CPU-bound tasks gain nothing past the
+number of cores, and either can change during a job. Pass an `Autoscale` as
+`num` and an `Autoscaler` samples, every `Autoscale.interval` seconds, the
+depth of the input queue, the utilization of the workers (the fraction of
+time they spend running tasks) and their throughput (tasks per second):
+
+- If messages are waiting and the workers are busy, it starts half as many
+  workers again. If the next sample shows that this did not raise the
+  throughput, it stops the added workers and stays below that size for
+  `RETRY_INTERVALS` samples.
+- If the workers are mostly idle, it stops enough of them to bring their
+  utilization back to about `GROW_UTILIZATION`.
+
+Surplus workers are stopped with `END_MSG`, so a worker always finishes the
+message it holds, and an `END_MSG` takes effect once the messages queued
+before it are taken. Every change is recorded in `Autoscale.events`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from math import ceil
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional
+
+from qqabc.qq import NUM_CPUS, NUM_THREADS, Q, Worker, get_context
+
+if TYPE_CHECKING:
+    from multiprocess.context import BaseContext
+
+__all__ = (
+    "AUTOSCALE_INTERVAL",
+    "GROW_UTILIZATION",
+    "MIN_GAIN",
+    "RETRY_INTERVALS",
+    "SHRINK_UTILIZATION",
+    "Autoscale",
+    "Autoscaler",
+    "Meter",
+    "ScaleEvent",
+)
+
+AUTOSCALE_INTERVAL: float = 0.2
+"""Default seconds between two scaling decisions."""
+
+GROW_UTILIZATION: float = 0.8
+"""Utilization at or above which a backlog makes the group grow."""
+
+SHRINK_UTILIZATION: float = 0.5
+"""Utilization below which the group shrinks."""
+
+MIN_GAIN: float = 0.1
+"""Relative throughput gain a growth must bring to be kept."""
+
+RETRY_INTERVALS: int = 10
+"""Samples to wait before growing past a size that brought no gain."""
+
+
+@dataclass(frozen=True)
+class ScaleEvent:
+    """One change of the number of workers."""
+
+    elapsed: float
+    """Seconds since the group started."""
+
+    old: int
+    """Number of workers before the change."""
+
+    new: int
+    """Number of workers after the change."""
+
+    reason: str
+    """`"busy"`, `"idle"` or `"no gain"`."""
+
+    depth: Optional[int]  # noqa: UP045
+    """Messages waiting in the input queue (`None` if unknown)."""
+
+    utilization: float
+    """Fraction of the last interval the workers spent running tasks."""
+
+    throughput: float
+    """Tasks finished per second during the last interval."""
+
+
+@dataclass
+class Autoscale:
+    """Bounds of an adaptive number of workers, and a record of its changes.
+
+    Example:
+        >>> from qqabc.qq import mapq
+        >>> scale = Autoscale(min_workers=2, max_workers=8)
+        >>> list(mapq(abs, [-1, -2], num=scale, kind="thread"))
+        [1, 2]
+        >>> [(e.old, e.new, e.reason) for e in scale.events]  # doctest: +SKIP
+        []
+    """
+
+    min_workers: int = 1
+    """Workers started up front and kept until the end."""
+
+    max_workers: Optional[int] = None  # noqa: UP045
+    """Most workers to run at once. If `None`, `4 * NUM_THREADS` for thread
+    workers and `NUM_CPUS` for processes."""
+
+    interval: float = AUTOSCALE_INTERVAL
+    """Seconds between two scaling decisions."""
+
+    events: List[ScaleEvent] = field(default_factory=list)  # noqa: UP006
+    """Changes made so far (appended to by every run using this object)."""
+
+    def __post_init__(self) -> None:
+        if self.min_workers < 1:
+            raise ValueError(f"min_workers must be positive: {self.min_workers}")
+        if self.max_workers is not None and self.max_workers < self.min_workers:
+            raise ValueError(
+                f"max_workers must be at least min_workers: {self.max_workers}"
+            )
+        if self.interval <= 0:
+            raise ValueError(f"interval must be positive: {self.interval}")
+
+
+class Meter:
+    """Busy time and finished tasks of a group of threads or processes."""
+
+    def __init__(
+        self, ctx: BaseContext | None = None, *, threads: bool = False
+    ) -> None:
+        """Allocate the counters.
+
+        Args:
+            ctx (BaseContext, optional): context of the worker processes
+                (see `get_context`). Defaults to `None` (platform default).
+
+            threads (bool, optional): whether the workers are threads, which
+                only need a list and a `threading.Lock` instead of shared
+                memory. Defaults to `False`.
+        """
+        self._totals: Any  # seconds, tasks
+        if threads:
+            self._totals = [0.0, 0]
+            self._lock: Any = Lock()
+        else:
+            self._totals = (ctx or get_context()).Array("d", 2)
+            self._lock = self._totals.get_lock()
+
+    def record(self, seconds: float) -> None:
+        """Account for one task that ran for `seconds`."""
+        with self._lock:
+            self._totals[0] += seconds
+            self._totals[1] += 1
+
+    def read(self) -> tuple[float, int]:
+        """Return the total busy seconds and number of finished tasks."""
+        with self._lock:
+            return self._totals[0], int(self._totals[1])
+
+    def timed(self, fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Wrap `fn` so that each call is recorded."""
+
+        def call(data: Any) -> Any:
+            start = perf_counter()
+            try:
+                return fn(data)
+            finally:
+                self.record(perf_counter() - start)
+
+        return call
+
+
+class Autoscaler:
+    """Grows and shrinks a group of workers that read one queue."""
+
+    def __init__(
+        self,
+        scale: Autoscale,
+        q: Q[Any],
+        spawn: Callable[[Meter], Worker],
+        *,
+        threads: bool,
+        ctx: BaseContext | None = None,
+    ) -> None:
+        """Start `scale.min_workers` workers and the thread that scales them.
+
+        Args:
+            scale (Autoscale): bounds; its `events` receive the changes.
+
+            q (Q): input queue of the workers.
+
+            spawn (Callable): start one worker that reads `q` until `END_MSG`
+                and records each task in the given `Meter`.
+
+            threads (bool): whether the workers are threads (which sets the
+                default `max_workers`).
+
+            ctx (BaseContext, optional): context of the worker processes.
+                Defaults to `None` (platform default).
+        """
+        self.scale = scale
+        self.capacity = scale.max_workers or (4 * NUM_THREADS if threads else NUM_CPUS)
+        self.meter = Meter(ctx, threads=threads)
+        self._q = q
+        self._spawn = spawn
+        self._lock = Lock()
+        self._stopped = Event()
+
+        self.size = scale.min_workers
+        self.workers = [spawn(self.meter) for _ in range(self.size)]
+        self._ceiling = self.capacity
+        self._ceiling_ttl = 0
+        self._trial: tuple[int, float] | None = None  # size and rate before growth
+        self._start = self._last_time = monotonic()
+        self._last_busy, self._last_done = self.meter.read()
+
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """Return the number of workers not asked to stop."""
+        return self.size
+
+    def __iter__(self) -> Iterator[Worker]:
+        """Iterate over the workers that may still be running."""
+        return iter(self.workers)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.scale.interval):
+            self.step()
+
+    def step(self) -> None:
+        """Sample the workers and resize the group if needed."""
+        now = monotonic()
+        busy, done = self.meter.read()
+        elapsed = now - self._last_time
+        utilization = min(1.0, (busy - self._last_busy) / (elapsed * self.size))
+        throughput = (done - self._last_done) / elapsed
+        self._last_time, self._last_busy, self._last_done = now, busy, done
+        try:
+            depth: int | None = self._q.qsize()
+        except NotImplementedError:  # e.g., `multiprocess.Queue` on MacOS
+            depth = None
+
+        size = self.size
+        new, reason = self._decide(utilization, throughput, depth)
+        if new == size:
+            return
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            if new > size:
+                self.workers.extend(self._spawn(self.meter) for _ in range(new - size))
+            else:
+                for _ in range(size - new):
+                    self._q.end()
+            self.workers = [w for w in self.workers if w.is_alive()]
+            self.size = new
+        self.scale.events.append(
+            ScaleEvent(
+                now - self._start, size, new, reason, depth, utilization, throughput
+            )
+        )
+
+    def _decide(
+        self, utilization: float, throughput: float, depth: int | None
+    ) -> tuple[int, str]:
+        """Return the new number of workers and the reason for it."""
+        size = self.size
+        if self._ceiling_ttl:
+            self._ceiling_ttl -= 1
+            if not self._ceiling_ttl:
+                self._ceiling = self.capacity
+
+        trial, self._trial = self._trial, None
+        if trial is not None and throughput < trial[1] * (1 + MIN_GAIN):
+            self._ceiling = trial[0]
+            self._ceiling_ttl = RETRY_INTERVALS
+            return trial[0], "no gain"
+
+        backlog = depth is None or depth > 0
+        if utilization >= GROW_UTILIZATION and backlog and size < self._ceiling:
+            self._trial = (size, throughput)
+            return min(self._ceiling, size + max(1, size // 2)), "busy"
+
+        if utilization < SHRINK_UTILIZATION and size > self.scale.min_workers:
+            needed = ceil(utilization * size / GROW_UTILIZATION)
+            return max(self.scale.min_workers, needed), "idle"
+        return size, ""
+
+    def stop(self, *, wait: bool = True) -> None:
+        """Stop scaling, send `END_MSG` to each remaining worker, and join them.
+
+        Args:
+            wait (bool, optional): wait for the workers to exit.
+                Defaults to `True`.
+        """
+        self._stopped.set()
+        self._thread.join()
+        with self._lock:
+            for _ in range(self.size):
+                self._q.end()
+            self.size = 0
+        if wait:
+            for w in self.workers:
+                w.join()
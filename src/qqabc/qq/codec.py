@@ -0,0 +1,108 @@
+"""Serializers for messages that cross a process boundary.
+
+A `Q` normally hands `Msg` objects to `multiprocess`, which pickles them with
+`dill`. That handles lambdas and closures, but is slow for plain data. A
+`Codec` turns messages into `bytes` before they reach the transport, so the
+transport only has to move bytes.
+
+Messages are encoded as compact `(data, kind, order)` tuples; batches (see
+`Q.put_many`) as a list of such tuples.
+"""
+
+from __future__ import annotations
+
+import marshal
+import pickle
+from typing import Any, Literal, Protocol, Union
+
+__all__ = (
+    "Codec",
+    "DillCodec",
+    "MarshalCodec",
+    "PickleCodec",
+    "Serializer",
+    "SerializerName",
+    "get_codec",
+)
+
+
+class Codec(Protocol):
+    """Anything that can turn an object into `bytes` and back."""
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize `obj`."""
+        ...  # pragma: no cover
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize `data`."""
+        ...  # pragma: no cover
+
+
+class DillCodec:
+    """`dill`, the same serializer `multiprocess` uses. Handles almost anything."""
+
+    def dumps(self, obj: Any) -> bytes:
+        from multiprocess.reduction import ForkingPickler  # noqa: PLC0415
+
+        return bytes(ForkingPickler.dumps(obj))
+
+    def loads(self, data: bytes) -> Any:
+        from multiprocess.reduction import ForkingPickler  # noqa: PLC0415
+
+        return ForkingPickler.loads(data)
+
+
+class PickleCodec:
+    """Standard library `pickle` (protocol 5 by default). Much faster than `dill`."""
+
+    def __init__(self, protocol: int = 5) -> None:
+        self.protocol = protocol
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=self.protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)  # noqa: S301
+
+
+class MarshalCodec:
+    """`marshal`, for payloads made only of built-in primitives. Fastest."""
+
+    def dumps(self, obj: Any) -> bytes:
+        return marshal.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return marshal.loads(data)  # noqa: S302
+
+
+SerializerName = Literal["dill", "pickle", "marshal"]
+"""Built-in serializer names (`"dill"`, `"pickle"`, `"marshal"`)."""
+
+Serializer = Union[SerializerName, Codec]
+"""A built-in serializer name or a `Codec` object."""
+
+_CODECS: dict[str, type[Codec]] = {
+    "dill": DillCodec,
+    "pickle": PickleCodec,
+    "marshal": MarshalCodec,
+}
+
+
+def get_codec(serializer: Serializer) -> Codec:
+    """Resolve a serializer name or object to a `Codec`.
+
+    Args:
+        serializer (Serializer): built-in name or an object with `dumps`/`loads`.
+
+    Raises:
+        ValueError: if `serializer` is an unknown name.
+
+    Returns:
+        Codec: the codec
+    """
+    if not isinstance(serializer, str):
+        return serializer
+    try:
+        return _CODECS[serializer]()
+    except KeyError:
+        raise ValueError(f"Unknown serializer: {serializer}") from None
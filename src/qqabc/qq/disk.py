@@ -0,0 +1,412 @@
+"""Durable queue that pages messages to an append-only log on disk.
+
+Every message is appended to a segment file in a directory; only a bounded
+head of the queue is also kept in memory, so a producer that outpaces its
+consumers fills the disk instead of RAM. A message read from the queue stays
+in the log until it is acknowledged with `Msg.release()`, and acknowledgements
+are appended to a separate file. Opening the same directory again replays,
+in order, every message that was not acknowledged (including messages that
+were read but not finished when the process died). Fully acknowledged
+segments are deleted.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import tempfile
+import weakref
+import zlib
+from bisect import bisect_right
+from collections import deque
+from functools import partial
+from pathlib import Path
+from queue import Empty, Full
+from threading import Condition, Lock
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from qqabc.qq import Msg
+from qqabc.qq.codec import get_codec
+from qqabc.qq.sync import wait_until
+
+if TYPE_CHECKING:
+    from qqabc.qq.codec import Serializer
+
+__all__ = (
+    "DISK_MEMORY_ITEMS",
+    "SEGMENT_BYTES",
+    "DiskQueue",
+    "FsyncPolicy",
+)
+
+FsyncPolicy = Literal["never", "segment", "always"]
+"""When to force writes to disk: `"never"` (leave it to the OS), when each
+`"segment"` is finished, or after `"always"` (every write and acknowledgement).
+"""
+
+DISK_MEMORY_ITEMS: int = 1024
+"""Default maximum number of messages also kept in memory."""
+
+SEGMENT_BYTES: int = 64 << 20
+"""Default size (64 MiB) at which a new segment file is started."""
+
+_RECORD = struct.Struct("<QII")
+"""Record header: sequence number, payload size, CRC-32 of the payload."""
+
+_ACK = struct.Struct("<Q")
+"""Acknowledgement record: sequence number."""
+
+_ACKS = "acks.log"
+
+
+def _segment_name(first: int) -> str:
+    return f"{first:020d}.seg"
+
+
+def _encode(item: Any) -> tuple[Any, ...]:
+    """Plain tuple for a `Msg` (like `Q._encode`); `(item,)` for anything else."""
+    if not isinstance(item, Msg):
+        return (item,)
+    sent = item.__dict__.get("_sent")
+    fields = (item.data, item.kind, item.order)
+    return fields if sent is None else (*fields, sent)
+
+
+def _decode(record: Any) -> Any:
+    """Inverse of `_encode` (logs written before it hold pickled `Msg`s)."""
+    if isinstance(record, Msg):
+        return record
+    if len(record) == 1:
+        return record[0]
+    data, kind, order, *sent = record
+    msg = Msg(data, kind, order)
+    if sent:
+        msg.__dict__["_sent"] = sent[0]
+    return msg
+
+
+class DiskQueue:
+    """FIFO queue backed by a segment log; safe across threads of one process."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        maxsize: int = 0,
+        *,
+        memory_items: int = DISK_MEMORY_ITEMS,
+        segment_bytes: int = SEGMENT_BYTES,
+        fsync: FsyncPolicy = "never",
+        serializer: Serializer | None = None,
+    ) -> None:
+        """Open (or create) a queue directory and replay what was not acknowledged.
+
+        Args:
+            path (str | PathLike, optional): directory of the log. If `None`, a
+                temporary directory is used and removed by `close()`, so
+                nothing survives a restart. Defaults to `None`.
+
+            maxsize (int, optional): maximum number of unread messages
+                (`0` = limited only by the disk). Defaults to `0`.
+
+            memory_items (int, optional): maximum number of messages also kept
+                in memory. Defaults to `DISK_MEMORY_ITEMS`.
+
+            segment_bytes (int, optional): segment size at which a new file is
+                started. Defaults to `SEGMENT_BYTES`.
+
+            fsync (FsyncPolicy, optional): when to force writes to disk.
+                Defaults to `"never"`.
+
+            serializer (Serializer, optional): how messages are written.
+                A `Msg` is written as a `(data, kind, order)` tuple, so
+                `"marshal"` works for built-in data. Defaults to `None`
+                (`"pickle"`).
+        """
+        if fsync not in {"never", "segment", "always"}:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = Path(tempfile.mkdtemp(prefix="qqabc-") if path is None else path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._cleanup = None  # remove a temporary directory once unused
+        if path is None:
+            self._cleanup = weakref.finalize(
+                self, shutil.rmtree, self.path, ignore_errors=True
+            )
+        self.maxsize = maxsize
+        self.memory_items = max(1, memory_items)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._codec = get_codec(serializer or "pickle")
+
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+
+        self._head: deque[tuple[int, bytes]] = deque()
+        self._segments: list[int] = []  # first sequence number of each segment
+        self._unacked: dict[int, int] = {}  # segment -> unacknowledged records
+        self._acked: dict[int, set[int]] = {}  # segment -> acknowledged records
+        self._unread = 0
+        self._next_seq = 0
+        self._ack_records = 0
+        self._recover()
+
+        self._acks: IO[bytes] = (self.path / _ACKS).open("ab")
+        self._write_seg = -1
+        self._write_size = 0
+        self._writer: IO[bytes] | None = None
+        at_end = not self._segments
+        self._start_segment()
+        self._reader: IO[bytes] | None = None
+        self._reader_seg = -1
+        if at_end:
+            self._read_seg, self._read_off = self._write_seg, 0
+        else:
+            self._read_seg, self._read_off = self._segments[0], 0
+
+    # recovery
+
+    def _recover(self) -> None:
+        """Load acknowledgements and count the unacknowledged records."""
+        acked: set[int] = set()
+        acks = self.path / _ACKS
+        if acks.exists():
+            data = acks.read_bytes()
+            usable = len(data) - len(data) % _ACK.size  # ignore a torn tail
+            acked = {seq for (seq,) in _ACK.iter_unpack(data[:usable])}
+            self._ack_records = len(acked)
+
+        for file in sorted(self.path.glob("*.seg")):
+            first = int(file.stem)
+            seqs = self._scan(file)
+            if seqs:
+                self._next_seq = max(self._next_seq, seqs[-1] + 1)
+            done = acked.intersection(seqs)
+            if len(done) == len(seqs):
+                file.unlink()
+                continue
+            self._segments.append(first)
+            self._acked[first] = done
+            self._unacked[first] = len(seqs) - len(done)
+            self._unread += len(seqs) - len(done)
+
+    @staticmethod
+    def _scan(file: Path) -> list[int]:
+        """Return the sequence numbers in a segment, cutting off a torn tail."""
+        seqs: list[int] = []
+        with file.open("r+b") as f:
+            offset = 0
+            while True:
+                header = f.read(_RECORD.size)
+                if len(header) < _RECORD.size:
+                    break
+                seq, size, crc = _RECORD.unpack(header)
+                payload = f.read(size)
+                if len(payload) < size or zlib.crc32(payload) != crc:
+                    break
+                seqs.append(seq)
+                offset += _RECORD.size + size
+            f.truncate(offset)
+        return seqs
+
+    # segments
+
+    def _start_segment(self) -> None:
+        """Finish the current segment (if any) and open a new one."""
+        if self._writer is not None:
+            self._writer.flush()
+            if self.fsync != "never":
+                os.fsync(self._writer.fileno())
+            self._writer.close()
+        self._write_seg = self._next_seq
+        self._write_size = 0
+        self._writer = (self.path / _segment_name(self._write_seg)).open("ab")
+        self._segments.append(self._write_seg)
+        self._unacked[self._write_seg] = 0
+        self._acked[self._write_seg] = set()
+
+    def _drop(self, seg: int) -> None:
+        """Delete a segment once every record is acknowledged and read past."""
+        if self._unacked.get(seg) != 0 or seg in {self._write_seg, self._read_seg}:
+            return
+        if self._reader_seg == seg and self._reader is not None:
+            self._reader.close()
+            self._reader, self._reader_seg = None, -1
+        (self.path / _segment_name(seg)).unlink()
+        self._segments.remove(seg)
+        del self._unacked[seg], self._acked[seg]
+        if self._ack_records > 4096 + 2 * sum(map(len, self._acked.values())):
+            self._compact_acks()
+
+    def _compact_acks(self) -> None:
+        """Rewrite the acknowledgement file without records of deleted segments."""
+        live = sorted(seq for seqs in self._acked.values() for seq in seqs)
+        tmp = self.path / (_ACKS + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(b"".join(_ACK.pack(seq) for seq in live))
+            f.flush()
+            if self.fsync != "never":
+                os.fsync(f.fileno())
+        self._acks.close()
+        tmp.replace(self.path / _ACKS)
+        self._acks = (self.path / _ACKS).open("ab")
+        self._ack_records = len(live)
+
+    def _segment_of(self, seq: int) -> int:
+        return self._segments[bisect_right(self._segments, seq) - 1]
+
+    # reading from disk
+
+    def _refill(self) -> None:
+        """Load the next unread records from disk into memory."""
+        while len(self._head) < self.memory_items:
+            if self._read_seg == self._write_seg:
+                if self._read_off >= self._write_size:
+                    return
+                self._writer.flush()  # type: ignore[union-attr]
+            if self._reader_seg != self._read_seg:
+                if self._reader is not None:
+                    self._reader.close()
+                self._reader = (self.path / _segment_name(self._read_seg)).open("rb")
+                self._reader_seg = self._read_seg
+            reader: IO[bytes] = self._reader  # type: ignore[assignment]
+
+            reader.seek(self._read_off)
+            header = reader.read(_RECORD.size)
+            if len(header) < _RECORD.size:  # end of a finished segment
+                old = self._read_seg
+                self._read_seg = self._segments[self._segments.index(old) + 1]
+                self._read_off = 0
+                self._drop(old)
+                continue
+            seq, size, _ = _RECORD.unpack(header)
+            payload = reader.read(size)
+            self._read_off += _RECORD.size + size
+            if seq not in self._acked[self._read_seg]:
+                self._head.append((seq, payload))
+
+    # queue interface
+
+    def qsize(self) -> int:
+        """Return the number of unread messages."""
+        return self._unread
+
+    def empty(self) -> bool:
+        """Return `True` if there are no unread messages."""
+        return not self._unread
+
+    def full(self) -> bool:
+        """Return `True` if there are `maxsize` unread messages."""
+        return 0 < self.maxsize <= self._unread
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: FBT001, FBT002
+        """Append a message to the log.
+
+        Raises:
+            Full: if the queue stays full for `timeout` seconds.
+        """
+        payload = self._codec.dumps(_encode(item))
+        with self._not_full:
+            if not wait_until(
+                self._not_full, lambda: not self.full(), block=block, timeout=timeout
+            ):
+                raise Full
+            if self._write_size >= self.segment_bytes:
+                at_end = (self._read_seg, self._read_off) == (
+                    self._write_seg,
+                    self._write_size,
+                )
+                old = self._write_seg
+                self._start_segment()
+                if at_end:
+                    self._read_seg, self._read_off = self._write_seg, 0
+                self._drop(old)
+
+            seq = self._next_seq
+            self._next_seq += 1
+            writer: IO[bytes] = self._writer  # type: ignore[assignment]
+            writer.write(_RECORD.pack(seq, len(payload), zlib.crc32(payload)))
+            writer.write(payload)
+            if self.fsync == "always":
+                writer.flush()
+                os.fsync(writer.fileno())
+
+            at_end = (self._read_seg, self._read_off) == (
+                self._write_seg,
+                self._write_size,
+            )
+            self._write_size += _RECORD.size + len(payload)
+            self._unacked[self._write_seg] += 1
+            if at_end and len(self._head) < self.memory_items:
+                self._head.append((seq, payload))
+                self._read_off = self._write_size
+            self._unread += 1
+            self._not_empty.notify()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:  # noqa: FBT001, FBT002
+        """Remove and return the oldest unread message.
+
+        A message (other than `END_MSG`) stays in the log until its
+        `Msg.release()` is called.
+
+        Raises:
+            Empty: if no message arrives within `timeout` seconds.
+        """
+        with self._not_empty:
+            if not wait_until(
+                self._not_empty, lambda: not self.empty(), block=block, timeout=timeout
+            ):
+                raise Empty
+            if not self._head:
+                self._refill()
+            seq, payload = self._head.popleft()
+            self._unread -= 1
+            self._not_full.notify()
+
+        item = _decode(self._codec.loads(payload))
+        if getattr(item, "kind", None) == "END":
+            self.ack(seq)
+        elif hasattr(item, "release"):
+            item.__dict__["_ack"] = partial(self.ack, seq)
+        return item
+
+    def put_nowait(self, item: Any) -> None:
+        """Append a message without waiting."""
+        self.put(item, block=False)
+
+    def get_nowait(self) -> Any:
+        """Remove and return a message without waiting."""
+        return self.get(block=False)
+
+    def ack(self, seq: int) -> None:
+        """Mark a message as done so it is not replayed after a restart."""
+        with self._lock:
+            if self._acks.closed:
+                return
+            seg = self._segment_of(seq)
+            acked = self._acked[seg]
+            if seq in acked:
+                return
+            acked.add(seq)
+            self._acks.write(_ACK.pack(seq))
+            self._ack_records += 1
+            if self.fsync == "always":
+                self._acks.flush()
+                os.fsync(self._acks.fileno())
+            self._unacked[seg] -= 1
+            self._drop(seg)
+
+    def close(self) -> None:
+        """Flush the log and close its files (deleting a temporary directory)."""
+        with self._lock:
+            if self._acks.closed:
+                return
+            for f in (self._writer, self._acks):
+                f.flush()  # type: ignore[union-attr]
+                if self.fsync != "never":
+                    os.fsync(f.fileno())  # type: ignore[union-attr]
+                f.close()  # type: ignore[union-attr]
+            if self._reader is not None:
+                self._reader.close()
+        if self._cleanup is not None:
+            self._cleanup()
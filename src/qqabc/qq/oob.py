@@ -0,0 +1,143 @@
+"""Out-of-band transfer of large buffers through shared memory.
+
+Large buffers (`bytes`, `bytearray`, NumPy arrays, anything exposing a
+pickle protocol 5 `PickleBuffer`) are copied once into a `SharedMemory`
+segment. Only a small `OutOfBand` handle, with the in-band pickle and the
+buffer offsets, crosses the queue. The reader maps the segment and gets
+`memoryview`/`ndarray` views into it without another copy.
+"""
+
+from __future__ import annotations
+
+import pickle
+from contextlib import suppress
+from pickle import PickleBuffer
+from typing import Any
+
+from multiprocess import resource_tracker
+from multiprocess.shared_memory import _USE_POSIX, SharedMemory
+
+__all__ = ("OOB_THRESHOLD", "OutOfBand")
+
+OOB_THRESHOLD: int = 1 << 16
+"""Default minimum buffer size in bytes (64 KiB) to send out-of-band."""
+
+
+class _Segment(SharedMemory):
+    """`SharedMemory` that tolerates views outliving `close()`.
+
+    The mapping stays valid until the last view is garbage collected.
+    """
+
+    def close(self) -> None:
+        with suppress(BufferError):
+            super().close()
+
+    def release(self) -> None:
+        """Remove the segment; memory is freed once every view is gone."""
+        with suppress(FileNotFoundError):
+            self.unlink()
+        self.close()
+
+
+def _untrack(shm: SharedMemory) -> None:
+    """Stop this process's resource tracker from unlinking `shm` at exit.
+
+    The reader owns the segment (see `Msg.release`), and the writer may exit
+    before the segment is read.
+    """
+    if _USE_POSIX:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+def _wrap(obj: Any, threshold: int) -> Any:
+    """Mark large `bytes` (top-level or in a top-level tuple) as out-of-band."""
+    if isinstance(obj, (bytes, bytearray)) and len(obj) >= threshold:
+        return PickleBuffer(obj)
+    if type(obj) is tuple:
+        return tuple(_wrap(item, threshold) for item in obj)
+    return obj
+
+
+class OutOfBand:
+    """Small, picklable handle to an object whose large buffers are in a segment."""
+
+    __slots__ = ("inband", "name", "spans")
+
+    def __init__(self, inband: bytes, name: str, spans: list[tuple[int, int]]):
+        """Construct a handle.
+
+        Args:
+            inband (bytes): protocol 5 pickle of everything except the buffers.
+            name (str): name of the shared-memory segment.
+            spans (list[tuple[int, int]]): `(offset, size)` of each buffer.
+        """
+        self.inband = inband
+        self.name = name
+        self.spans = spans
+
+    def __getstate__(self) -> tuple[bytes, str, list[tuple[int, int]]]:
+        return self.inband, self.name, self.spans
+
+    def __setstate__(self, state: tuple[bytes, str, list[tuple[int, int]]]) -> None:
+        self.inband, self.name, self.spans = state
+
+    @classmethod
+    def pack(cls, obj: Any, threshold: int = OOB_THRESHOLD) -> OutOfBand | None:
+        """Move the large buffers of `obj` into a new shared-memory segment.
+
+        The segment is not tracked by the writer: it lives until the reader
+        releases it (see `load`), even if the writer has exited.
+
+        Args:
+            obj (Any): object to send.
+
+            threshold (int, optional): minimum buffer size to send out-of-band.
+                Defaults to `OOB_THRESHOLD`.
+
+        Returns:
+            OutOfBand | None: handle to the object, or `None` if it has no large
+                buffers (or cannot be pickled by the standard library), in which
+                case it should be sent as usual.
+        """
+        buffers: list[memoryview] = []
+
+        def in_band(buf: PickleBuffer) -> bool:
+            raw = buf.raw()
+            if raw.nbytes < threshold:
+                return True
+            buffers.append(raw)
+            return False
+
+        try:
+            inband = pickle.dumps(
+                _wrap(obj, threshold), protocol=5, buffer_callback=in_band
+            )
+        except (pickle.PicklingError, AttributeError, TypeError, BufferError):
+            return None
+        if not buffers:
+            return None
+
+        spans: list[tuple[int, int]] = []
+        offset = 0
+        for raw in buffers:
+            spans.append((offset, raw.nbytes))
+            offset += raw.nbytes
+
+        shm = SharedMemory(create=True, size=offset)
+        _untrack(shm)
+        for raw, (start, size) in zip(buffers, spans):
+            shm.buf[start : start + size] = raw
+        shm.close()
+        return cls(inband, shm.name, spans)
+
+    def load(self) -> tuple[Any, _Segment]:
+        """Map the segment and rebuild the object on top of it.
+
+        Returns:
+            tuple[Any, _Segment]: the object (with views into the segment) and
+                the segment, which the caller must `release()` when done.
+        """
+        segment = _Segment(name=self.name)
+        views = [segment.buf[start : start + size] for start, size in self.spans]
+        return pickle.loads(self.inband, buffers=views), segment  # noqa: S301
@@ -0,0 +1,304 @@
+"""Persistent pool of workers shared by many `mapq` calls and tasks."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from functools import partial
+from itertools import count
+from pickle import PicklingError
+from threading import Lock, Thread
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from qqabc.qq import (
+    _NOTHING,
+    Msg,
+    Q,
+    QueueKind,
+    StartMethod,
+    Task,
+    _start_group,
+)
+from qqabc.qq.reorder import Reorder
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from qqabc.qq.autoscale import Autoscale, Meter
+    from qqabc.qq.codec import Serializer
+    from qqabc.qq.server import Address
+
+__all__ = ("WorkerPool",)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Job = Tuple[int, Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+"""Work item: job id, function, positional and keyword arguments."""
+
+Sink = Union["Future[Any]", "Q[tuple[bool, Any]]"]
+"""Where the router delivers the results of a job."""
+
+
+def _serve(
+    inbox: Q[Job],
+    outbox: Q[tuple[int, bool, Any]],
+    initializer: Callable[..., Any] | None,
+    initargs: tuple[Any, ...],
+    meter: Meter | None = None,
+) -> None:
+    """Run jobs until `END_MSG`, reporting `(job, ok, result or error)`."""
+    if initializer is not None:
+        initializer(*initargs)
+    for msg in inbox:
+        job, fn, args, kwargs = msg.data
+        start = perf_counter()
+        try:
+            reply = (job, True, fn(*args, **kwargs))
+        except Exception as e:
+            reply = (job, False, e)
+        _reply(outbox, reply, msg.order)
+        if meter is not None:
+            meter.record(perf_counter() - start)
+
+
+def _reply(
+    outbox: Q[tuple[int, bool, Any]], reply: tuple[int, bool, Any], order: int
+) -> None:
+    """Report a job, or a `PicklingError` if its result or error cannot be sent.
+
+    The outbox of a process pool serializes in `put` (see `WorkerPool`), so a
+    value that cannot be pickled fails here instead of in the queue's feeder
+    thread, where it would be dropped and leave the caller waiting forever.
+    """
+    try:
+        outbox.put(reply, order=order)
+    except Exception as e:
+        job, _, value = reply
+        error = PicklingError(f"cannot send {type(value).__name__} of job: {e}")
+        outbox.put((job, False, error), order=order)
+
+
+class WorkerPool:
+    """Long-lived `Process` or `Thread` workers that run many calls.
+
+    Starting a process costs far more than a short `mapq` call. A pool starts
+    its workers (and runs `initializer` in each) once, then serves any number
+    of `mapq` and `submit` calls until `close()`.
+
+    Example:
+        >>> with WorkerPool(kind="thread") as pool:
+        ...     list(pool.mapq(pow, [2, 3], [2, 2]))
+        [4, 9]
+    """
+
+    def __init__(
+        self,
+        num: int | Autoscale | None = None,
+        kind: QueueKind = "process",
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple[Any, ...] = (),
+        *,
+        serializer: Serializer | None = None,
+        address: Address | None = None,
+        start_method: StartMethod | None = None,
+    ) -> None:
+        """Start the workers.
+
+        Args:
+            num (int | Autoscale, optional): number of workers. If `None`,
+                `NUM_CPUS` or `NUM_THREADS` will be used as appropriate. An
+                `Autoscale` adapts the number of workers to the queued jobs
+                (see `qqabc.qq.autoscale`). Defaults to `None`.
+
+            kind (QueueKind, optional): queue backend to use. `"thread"` and
+                `"async"` run workers in threads; other backends run them in
+                processes.
+                Defaults to `"process"`.
+
+            initializer (Callable, optional): called once in each worker before
+                it runs any job. Defaults to `None`.
+
+            initargs (tuple, optional): arguments to `initializer`.
+                Defaults to `()`.
+
+            serializer (Serializer, optional): how jobs and results are
+                serialized between processes (see `Q`). Results are always
+                serialized by the worker (with `"dill"` if `None`), so one
+                that cannot be sent fails its call with a `PicklingError`.
+                Defaults to `None`.
+
+            address (Address, optional): queue server that holds the queues
+                when `kind="remote"` (see `Q`). Defaults to `None`.
+
+            start_method (StartMethod, optional): how to start worker processes
+                (see `get_context`). Ignored for `"thread"` and `"async"`.
+                Defaults to `None`.
+        """
+        self.kind = kind
+        opts: dict[str, Any] = {
+            "serializer": serializer,
+            "start_method": start_method,
+            "address": address,
+        }
+        self._inbox: Q[Job] = Q(kind, **opts)
+        if kind == "process" and serializer is None:
+            opts["serializer"] = "dill"  # pickle results in `put`, see `_reply`
+        self._outbox: Q[tuple[int, bool, Any]] = Q(kind, **opts)
+        self._sinks: dict[int, Sink] = {}
+        self._ids = count()
+        self._lock = Lock()
+        self._closed = False
+
+        self._workers = _start_group(
+            partial(_serve, self._inbox, self._outbox, initializer, initargs),
+            self._inbox,
+            num=num,
+            kind=kind,
+            start_method=start_method,
+        )
+
+        self._router = Thread(target=self._route, daemon=True)
+        self._router.start()
+
+    def __len__(self) -> int:
+        """Return the number of workers (that are not being stopped)."""
+        return len(self._workers)
+
+    def _route(self) -> None:
+        """Deliver results from the workers to whoever is waiting for them."""
+        for msg in self._outbox:
+            job, ok, value = msg.data
+            sink = self._sinks.get(job)
+            if isinstance(sink, Future):
+                del self._sinks[job]
+                if ok:
+                    sink.set_result(value)
+                else:
+                    sink.set_exception(value)
+            elif sink is not None:
+                sink.put((ok, value), order=msg.order)
+
+    def _register(self, sink: Sink) -> int:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WorkerPool is closed")
+            job = next(self._ids)
+            self._sinks[job] = sink
+        return job
+
+    def submit(self, task: Task[R], *args: Any, **kwargs: Any) -> Future[R]:
+        """Run one call on a worker.
+
+        Args:
+            task (Task): function to run.
+
+            *args (Any): positional arguments to `task`.
+
+            **kwargs (Any): keyword arguments to `task`.
+
+        Returns:
+            Future: result (or exception) of the call
+        """
+        future: Future[R] = Future()
+        job = self._register(future)
+        self._inbox.put((job, task, args, kwargs))
+        return future
+
+    def mapq(
+        self,
+        task: Callable[..., R],
+        *args: Iterable[Any],
+        max_pending: int | None = None,
+    ) -> Iterator[R]:
+        """Call a function with arguments on the pool's workers.
+
+        Args:
+            task (Callable): function to call.
+
+            *args (Iterable): arguments to `task`. If multiple iterables are
+                provided, they will be passed to `zip` first.
+
+            max_pending (int, optional): if set, read the arguments lazily and
+                keep at most this many items submitted but not yet yielded.
+                If `None`, submit every item up front. Defaults to `None`.
+
+        Raises:
+            Exception: the first exception raised by `task`, in input order.
+
+        Yields:
+            Any: results in input order
+        """
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"max_pending must be positive: {max_pending}")
+
+        sink: Q[tuple[bool, Any]] = Q("thread")
+        job = self._register(sink)
+        inputs = ((job, task, value, {}) for value in zip(*args))
+        buf: Reorder[tuple[bool, Any]] = Reorder()
+        submitted = 0
+        exhausted = False
+        if max_pending is None:
+            counter = count()
+            self._inbox.put_many(item for item, _ in zip(inputs, counter))
+            submitted = next(counter)
+            exhausted = True
+        limit = max_pending or 0
+        try:
+            while True:
+                while not exhausted and submitted - buf.next < limit:
+                    item = next(inputs, _NOTHING)
+                    if item is _NOTHING:
+                        exhausted = True
+                        break
+                    self._inbox.put(item, order=submitted)
+                    submitted += 1
+
+                if buf.next == submitted and exhausted:
+                    break
+
+                buf.push(sink.get())
+                for msg in buf.ready():
+                    yield _unwrap(msg)
+        finally:
+            self._sinks.pop(job, None)
+
+    def close(self) -> None:
+        """Stop the workers once queued jobs are done and wait for them."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._workers.stop()
+        self._outbox.end()
+        self._router.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _unwrap(msg: Msg[tuple[bool, Any]]) -> Any:
+    ok, value = msg.data
+    if not ok:
+        raise value
+    return value
@@ -0,0 +1,112 @@
+"""Priority-ordered queues keyed on `Msg.order`.
+
+Messages with a lower `order` are taken first; messages with the same `order`
+keep their arrival order. `END_MSG` always sorts after every other message, so
+workers finish the queued work before they stop.
+"""
+
+from __future__ import annotations
+
+import weakref
+from heapq import heappop, heappush
+from itertools import count
+from queue import Queue
+from typing import TYPE_CHECKING, Any
+
+from multiprocess.managers import BaseManager
+
+if TYPE_CHECKING:
+    from multiprocess.context import BaseContext
+
+__all__ = ("PriorityQueue", "ProcessPriorityQueue")
+
+
+def _rank(msg: Any) -> tuple[bool, int]:
+    """Sort key: `END_MSG` last, then by `Msg.order`."""
+    return msg.kind == "END", msg.order
+
+
+class PriorityQueue(Queue):
+    """Thread-safe queue of `Msg` objects, lowest `Msg.order` first (stable)."""
+
+    def _init(self, maxsize: int) -> None:  # noqa: ARG002
+        self.queue: list[tuple[tuple[bool, int], int, Any]] = []  # type: ignore[assignment]
+        self._seq = count()  # tie-breaker: equal orders keep arrival order
+
+    def _qsize(self) -> int:
+        return len(self.queue)
+
+    def _put(self, item: Any) -> None:
+        heappush(self.queue, (_rank(item), next(self._seq), item))
+
+    def _get(self) -> Any:
+        return heappop(self.queue)[2]
+
+
+class _Manager(BaseManager):
+    """Server process that owns the shared heap."""
+
+
+_Manager.register(
+    "PriorityQueue",
+    PriorityQueue,
+    exposed=("put", "get", "put_nowait", "get_nowait", "qsize", "empty", "full"),
+)
+
+
+class ProcessPriorityQueue:
+    """`PriorityQueue` shared between processes.
+
+    A pipe cannot reorder what is already in it, so the heap lives in a small
+    manager process and every `put`/`get` is a call to it. Copies sent to
+    other processes talk to the same heap; the creator shuts it down.
+    """
+
+    def __init__(self, maxsize: int = 0, ctx: BaseContext | None = None) -> None:
+        """Start the manager and create the shared heap.
+
+        Args:
+            maxsize (int, optional): maximum number of items (`0` = unbounded).
+                Defaults to `0`.
+
+            ctx (BaseContext, optional): `multiprocess` context to start the
+                manager with. Defaults to `None` (default context).
+        """
+        manager = _Manager(ctx=ctx)
+        manager.start()
+        self._proxy = manager.PriorityQueue(maxsize)  # type: ignore[attr-defined]
+        self._finalizer = weakref.finalize(self, manager.shutdown)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"_proxy": self._proxy}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._proxy = state["_proxy"]
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: FBT001, FBT002
+        """Add an item, waiting for room if the queue is full."""
+        self._proxy.put(item, block, timeout)
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:  # noqa: FBT001, FBT002
+        """Remove and return the item with the lowest `Msg.order`."""
+        return self._proxy.get(block, timeout)
+
+    def put_nowait(self, item: Any) -> None:
+        """Add an item without waiting."""
+        self._proxy.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        """Remove and return an item without waiting."""
+        return self._proxy.get_nowait()
+
+    def qsize(self) -> int:
+        """Return the number of items in the queue."""
+        return self._proxy.qsize()
+
+    def empty(self) -> bool:
+        """Return `True` if the queue is empty."""
+        return self._proxy.empty()
+
+    def full(self) -> bool:
+        """Return `True` if the queue has `maxsize` items."""
+        return self._proxy.full()
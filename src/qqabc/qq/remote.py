@@ -0,0 +1,214 @@
+"""Client of a queue server (see `qqabc.qq.server`).
+
+`RemoteQueue` has the interface of `queue.Queue`, so `Q("remote", ...)` works
+like any other backend, but its messages live in a server process that
+workers on other hosts can reach. Writes are pipelined (the server does not
+reply to them) and reads can prefetch several messages per round trip.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import uuid
+from collections import deque
+from queue import Empty
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Iterable
+
+from qqabc.qq.codec import get_codec
+from qqabc.qq.server import (
+    EMPTY,
+    GET,
+    HEADER,
+    OPEN,
+    PUT,
+    SIZE,
+    frame,
+    get_body,
+    open_body,
+    pack_items,
+    size_of,
+    unpack_items,
+)
+
+if TYPE_CHECKING:
+    from qqabc.qq.codec import Serializer
+    from qqabc.qq.server import Address, Item
+
+__all__ = ("RemoteQueue",)
+
+_END_KIND = "END"  # `END_MSG.kind`
+
+
+def _connect(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        return sock
+    sock = socket.create_connection(tuple(address))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    got = 0
+    while got < size:
+        n = sock.recv_into(view[got:])
+        if not n:
+            raise ConnectionError("queue server closed the connection")
+        got += n
+    return bytes(buf)
+
+
+def _request(sock: socket.socket, op: int, body: bytes = b"") -> tuple[int, bytes]:
+    """Send a request and wait for its reply: `(status, body)`."""
+    sock.sendall(frame(op, body))
+    status, size = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return status, _recv_exact(sock, size)
+
+
+class RemoteQueue:
+    """FIFO queue held by a queue server; safe across threads and processes.
+
+    Pickled copies (e.g., passed to worker processes) refer to the same server
+    queue and open their own connections.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        name: str | None = None,
+        maxsize: int = 0,
+        *,
+        serializer: Serializer | None = None,
+        prefetch: int = 1,
+    ) -> None:
+        """Connect lazily to a queue on a server.
+
+        Args:
+            address (Address): `(host, port)` or Unix socket path of the server.
+
+            name (str, optional): name of the queue on the server; clients
+                using the same name share the queue. Defaults to `None`
+                (a new unique name).
+
+            maxsize (int, optional): maximum number of messages held by the
+                server (`0` = unbounded); only the client that creates the
+                queue sets it. Writers to a full queue slow down instead of
+                raising `Full`. Defaults to `0`.
+
+            serializer (Serializer, optional): how messages are written.
+                Defaults to `None` (`"dill"`).
+
+            prefetch (int, optional): maximum messages taken per read; extra
+                messages wait in this client, unseen by other readers.
+                Defaults to `1`.
+        """
+        self.address = address if isinstance(address, str) else tuple(address)
+        self.name = uuid.uuid4().hex if name is None else name
+        self.maxsize = maxsize
+        self.serializer = serializer
+        self.prefetch = max(1, prefetch)
+        self._setup()
+
+    def _setup(self) -> None:
+        self._codec = get_codec(self.serializer or "dill")
+        self._pid = os.getpid()
+        self._socks: dict[int, socket.socket] = {}
+        self._locks = {op: Lock() for op in (PUT, GET, SIZE)}
+        self._ready: deque[Item] = deque()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle only what is needed to reconnect."""
+        return {
+            "address": self.address,
+            "name": self.name,
+            "maxsize": self.maxsize,
+            "serializer": self.serializer,
+            "prefetch": self.prefetch,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a pickled queue."""
+        self.__dict__.update(state)
+        self._setup()
+
+    def _sock(self, op: int) -> socket.socket:
+        """Connection used for `op` requests (call with its lock held)."""
+        if self._pid != os.getpid():  # forked: connections belong to the parent
+            self._setup()
+        sock = self._socks.get(op)
+        if sock is None:
+            sock = _connect(self.address)
+            _request(sock, OPEN, open_body(self.name, self.maxsize))
+            self._socks[op] = sock
+        return sock
+
+    def qsize(self) -> int:
+        """Return the number of messages on the server and prefetched here."""
+        with self._locks[SIZE]:
+            _, body = _request(self._sock(SIZE), SIZE)
+        return size_of(body) + len(self._ready)
+
+    def empty(self) -> bool:
+        """Return `True` if the queue is empty."""
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """Return `True` if the queue is full."""
+        return 0 < self.maxsize <= self.qsize()
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: ARG002, FBT001, FBT002
+        """Send a message without waiting for the server.
+
+        `block` and `timeout` are accepted for compatibility: a full queue
+        slows the writer down instead.
+        """
+        self.put_many([item])
+
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Send many messages in one request, without waiting for the server.
+
+        Each message is still queued on its own, so readers share them.
+        """
+        body = pack_items(
+            (getattr(item, "kind", None) == _END_KIND, self._codec.dumps(item))
+            for item in items
+        )
+        with self._locks[PUT]:
+            self._sock(PUT).sendall(frame(PUT, body))
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:  # noqa: FBT001, FBT002
+        """Take the next message, reading up to `prefetch` from the server.
+
+        Raises:
+            Empty: if no message is available in time.
+        """
+        with self._locks[GET]:
+            if not self._ready:
+                wait = timeout if block else 0.0
+                status, body = _request(
+                    self._sock(GET), GET, get_body(self.prefetch, wait)
+                )
+                if status == EMPTY:
+                    raise Empty
+                self._ready.extend(unpack_items(body))
+            _, payload = self._ready.popleft()
+        return self._codec.loads(payload)
+
+    def put_nowait(self, item: Any) -> None:
+        """Equivalent to `put(item, block=False)`."""
+        self.put(item, block=False)
+
+    def get_nowait(self) -> Any:
+        """Equivalent to `get(block=False)`."""
+        return self.get(block=False)
+
+    def close(self) -> None:
+        """Close the connections of this client (sent messages are kept)."""
+        for sock in self._socks.values():
+            sock.close()
+        self._socks.clear()
@@ -0,0 +1,145 @@
+"""Reorder buffer for messages that arrive out of `Msg.order`."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, Generic, Iterator, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from qqabc.qq import Msg
+
+__all__ = ("Reorder",)
+
+T = TypeVar("T")
+
+
+class Reorder(Generic[T]):
+    """Min-heap of messages keyed by `Msg.order`, released in sequence.
+
+    `push` is O(log n). Messages are released once every smaller order number
+    has been released (or skipped with `skip`). Messages whose order is already
+    behind the sequence (late or duplicate) are released immediately.
+
+    A reader loop (`Q.sorted` / `Q.asorted`) drives it with `add`, `timeout`
+    and `expire`, which also apply the `window` and `gap_timeout` policies.
+    """
+
+    next: int
+    """Order number of the next message to release."""
+
+    def __init__(
+        self,
+        start: int = 0,
+        *,
+        window: int | None = None,
+        gap_timeout: float | None = None,
+    ) -> None:
+        """Construct an empty buffer.
+
+        Args:
+            start (int, optional): order number of the first message.
+                Defaults to `0`.
+
+            window (int, optional): maximum number of messages `add` holds
+                back before skipping the missing order numbers.
+                Defaults to `None` (unbounded).
+
+            gap_timeout (float, optional): seconds to wait for a missing order
+                number while messages are held back (see `timeout`).
+                Defaults to `None` (wait until the end).
+        """
+        self.next = start
+        self.window = window
+        self.gap_timeout = gap_timeout
+        self._heap: list[tuple[int, int, Msg[T]]] = []
+        self._seq = count()  # tie-breaker: equal orders keep arrival order
+        self._deadline: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of messages held back."""
+        return len(self._heap)
+
+    def push(self, msg: Msg[T]) -> None:
+        """Hold a message until its turn.
+
+        Args:
+            msg (Msg): message to buffer.
+        """
+        heappush(self._heap, (msg.order, next(self._seq), msg))
+
+    def ready(self) -> Iterator[Msg[T]]:
+        """Release every message whose turn has come.
+
+        Yields:
+            Iterator[Msg]: messages in order
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= self.next:
+            order, _, msg = heappop(heap)
+            if order == self.next:
+                self.next += 1
+            yield msg
+
+    def add(self, msg: Msg[T]) -> Sequence[Msg[T]]:
+        """Accept the next message read and return the ones now released.
+
+        Args:
+            msg (Msg): message read from the queue.
+
+        Returns:
+            Sequence[Msg]: messages released, in order
+        """
+        if not self._heap and msg.order == self.next:  # fast path: in order
+            self.next += 1
+            return (msg,)
+        self.push(msg)
+        if self.window is not None and len(self._heap) > self.window:
+            self.skip()
+        return self._release()
+
+    def timeout(self) -> float | None:
+        """Return how long the reader may wait for the next message.
+
+        Returns:
+            float | None: seconds until the `gap_timeout` of the oldest missing
+                order number expires (then call `expire`), or `None` to wait
+                for as long as it takes
+        """
+        if self.gap_timeout is None or not self._heap:
+            return None
+        if self._deadline is None:
+            self._deadline = monotonic() + self.gap_timeout
+        return max(0.0, self._deadline - monotonic())
+
+    def expire(self) -> Sequence[Msg[T]]:
+        """Skip the missing order numbers after waiting `timeout` in vain.
+
+        Returns:
+            Sequence[Msg]: messages released, in order
+        """
+        self.skip()
+        return self._release()
+
+    def _release(self) -> list[Msg[T]]:
+        expected = self.next
+        released = list(self.ready())
+        if self.next != expected:  # the gap moved: restart its timeout
+            self._deadline = None
+        return released
+
+    def skip(self) -> None:
+        """Give up on the missing order numbers before the smallest held message."""
+        if self._heap:
+            self.next = max(self.next, self._heap[0][0])
+
+    def drain(self) -> Iterator[Msg[T]]:
+        """Release all held messages in order, skipping any gaps.
+
+        Yields:
+            Iterator[Msg]: messages in order
+        """
+        while self._heap:
+            self.skip()
+            yield from self.ready()
@@ -0,0 +1,301 @@
+"""Queue server: named queues behind a TCP or Unix socket.
+
+Run it with::
+
+    python -m qqabc.qq.server --host 0.0.0.0 --port 7531
+    python -m qqabc.qq.server --unix /tmp/qq.sock
+
+and connect with `Q("remote", address=..., name=...)` from any process on any
+host. The server never deserializes messages: it stores the bytes the clients
+send, so it needs none of the clients' code.
+
+Protocol (all integers big-endian). Each request is `op: u8, size: u32`
+followed by `size` bytes of body; a connection serves one queue:
+
+- `OPEN` (`maxsize: u32`, then the queue name) -> `OK`
+- `PUT` (items) -> no reply, so puts are pipelined
+- `GET` (`max_items: u32, timeout: f64`; negative = wait forever) ->
+  `OK` with items, or `EMPTY` after `timeout`
+- `SIZE` -> `OK` with `size: u64`
+
+Items are `end: u8, size: u32` followed by `size` bytes. A `GET` returns at
+most one `END_MSG` (as its last item), so every consumer sees its own. Items
+taken for a reader that has disconnected go back to the front of the queue.
+A queue is dropped once it is empty and no connection has it open.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import struct
+import threading
+from contextlib import suppress
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Union
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = (
+    "DEFAULT_PORT",
+    "Address",
+    "QueueServer",
+    "main",
+)
+
+Address = Union[Tuple[str, int], str]
+"""`(host, port)` of a TCP socket or the path of a Unix socket."""
+
+Item = Tuple[bool, bytes]
+"""Stored message: whether it is `END_MSG`, and its bytes."""
+
+DEFAULT_PORT: int = 7531
+"""Default TCP port of the server."""
+
+OPEN, PUT, GET, SIZE = 1, 2, 3, 4
+OK, EMPTY = 0, 1
+
+HEADER = struct.Struct("!BI")
+"""Request or reply header: op (or status) and body size."""
+
+_ITEM = struct.Struct("!BI")
+_OPEN = struct.Struct("!I")
+_GET = struct.Struct("!Id")
+_SIZE = struct.Struct("!Q")
+
+
+class _Queue(asyncio.Queue):  # type: ignore[type-arg]
+    """`asyncio.Queue` that can put taken items back at the front."""
+
+    def requeue(self, items: Sequence[Item]) -> None:
+        """Put back items taken from the front of the queue, in order."""
+        self._queue.extendleft(reversed(items))  # type: ignore[attr-defined]
+        for _ in items:
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+
+def pack_items(items: Iterable[Item]) -> bytes:
+    """Encode items for a `PUT` request or a `GET` reply."""
+    return b"".join(_ITEM.pack(end, len(data)) + data for end, data in items)
+
+
+def unpack_items(body: bytes) -> List[Item]:  # noqa: UP006
+    """Decode the items of a `PUT` request or a `GET` reply."""
+    items = []
+    view = memoryview(body)
+    offset = 0
+    while offset < len(view):
+        end, size = _ITEM.unpack_from(view, offset)
+        offset += _ITEM.size
+        items.append((bool(end), bytes(view[offset : offset + size])))
+        offset += size
+    return items
+
+
+def frame(op: int, body: bytes = b"") -> bytes:
+    """Prefix a body with its header."""
+    return HEADER.pack(op, len(body)) + body
+
+
+def open_body(name: str, maxsize: int) -> bytes:
+    """Body of an `OPEN` request."""
+    return _OPEN.pack(maxsize) + name.encode()
+
+
+def get_body(max_items: int, timeout: float | None) -> bytes:
+    """Body of a `GET` request."""
+    return _GET.pack(max_items, -1.0 if timeout is None else timeout)
+
+
+def size_of(body: bytes) -> int:
+    """Decode the reply to a `SIZE` request."""
+    return _SIZE.unpack(body)[0]
+
+
+class QueueServer:
+    """Holds named queues and serves them over a socket.
+
+    Example:
+        >>> server = QueueServer(("127.0.0.1", 0)).start()  # any free port
+        >>> server.address[1] > 0
+        True
+        >>> server.stop()
+    """
+
+    def __init__(self, address: Address = ("127.0.0.1", DEFAULT_PORT)) -> None:
+        """Construct a server (call `serve_forever` or `start` to run it).
+
+        Args:
+            address (Address, optional): where to listen. Port `0` picks a free
+                port; `address` is updated once listening.
+                Defaults to `("127.0.0.1", DEFAULT_PORT)`.
+        """
+        self.address = address
+        self._queues: dict[str, _Queue] = {}
+        self._clients: dict[str, int] = {}
+        """Number of open connections to each queue."""
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._stopping: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    async def _listen(self) -> None:
+        if isinstance(self.address, str):
+            self._server = await asyncio.start_unix_server(self._handle, self.address)
+        else:
+            host, port = self.address
+            self._server = await asyncio.start_server(self._handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve(self, ready: threading.Event | None = None) -> None:
+        """Listen and serve until `stop` is called.
+
+        Args:
+            ready (threading.Event, optional): set once listening.
+                Defaults to `None`.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        await self._listen()
+        if ready is not None:
+            ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            self._server.close()  # type: ignore[union-attr]
+
+    def serve_forever(self) -> None:
+        """Listen and serve in this thread until interrupted."""
+        asyncio.run(self.serve())
+
+    def start(self) -> QueueServer:
+        """Listen and serve in a background thread.
+
+        Returns:
+            QueueServer: self, listening
+        """
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self.serve(ready),), daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving (from another thread) and wait for `start`'s thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection."""
+        queue: _Queue | None = None
+        name = ""
+        try:
+            while True:
+                op, size = HEADER.unpack(await reader.readexactly(HEADER.size))
+                body = await reader.readexactly(size)
+                if op == OPEN:
+                    if queue is not None:
+                        break
+                    (maxsize,) = _OPEN.unpack_from(body)
+                    name = body[_OPEN.size :].decode()
+                    queue = self._open(name, maxsize)
+                    writer.write(frame(OK))
+                elif queue is None:
+                    break
+                elif op == PUT:
+                    for item in unpack_items(body):
+                        await queue.put(item)  # waits while full (backpressure)
+                    continue
+                elif op == GET:
+                    await _get(queue, body, reader, writer)
+                    continue
+                elif op == SIZE:
+                    writer.write(frame(OK, _SIZE.pack(queue.qsize())))
+                else:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            if queue is not None:
+                self._close(name)
+
+    def _open(self, name: str, maxsize: int) -> _Queue:
+        """Return the queue `name` for a new connection, creating it if needed."""
+        if name not in self._queues:
+            self._queues[name] = _Queue(maxsize)
+        self._clients[name] = self._clients.get(name, 0) + 1
+        return self._queues[name]
+
+    def _close(self, name: str) -> None:
+        """Forget the queue `name` once no connection uses it and it is empty."""
+        self._clients[name] -= 1
+        if not self._clients[name] and self._queues[name].empty():
+            del self._clients[name], self._queues[name]
+
+
+async def _get(
+    queue: _Queue,
+    body: bytes,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Answer a `GET`, putting the items back if they cannot be delivered.
+
+    Raises:
+        ConnectionError: if the reader has disconnected.
+    """
+    max_items, timeout = _GET.unpack(body)
+    items = await _take(queue, max_items, timeout)
+    if items and (reader.at_eof() or writer.is_closing()):
+        queue.requeue(items)  # the reader left while waiting
+        raise ConnectionError("reader disconnected")
+    writer.write(frame(OK, pack_items(items)) if items else frame(EMPTY))
+    try:
+        await writer.drain()
+    except ConnectionError:
+        queue.requeue(items)
+        raise
+
+
+async def _take(queue: _Queue, max_items: int, timeout: float) -> list[Item]:
+    """Wait for one item, then take what is ready, stopping after `END_MSG`."""
+    try:
+        if timeout < 0:
+            first = await queue.get()
+        elif timeout == 0:
+            first = queue.get_nowait()
+        else:
+            first = await asyncio.wait_for(queue.get(), timeout)
+    except (asyncio.TimeoutError, asyncio.QueueEmpty):
+        return []
+    items = [first]
+    while len(items) < max_items and not items[-1][0] and not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run a queue server from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m qqabc.qq.server", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    args = parser.parse_args(argv)
+
+    server = QueueServer(args.unix or (args.host, args.port))
+    with suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
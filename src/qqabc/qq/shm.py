@@ -0,0 +1,276 @@
+"""Shared-memory ring buffer queue.
+
+`ShmQueue` is a drop-in replacement for `multiprocess.Queue` that stores
+pickled messages in a `SharedMemory` ring buffer. There is no feeder thread and
+no pipe: `put` copies the payload straight into shared memory and wakes a
+waiting reader through a process-shared condition variable.
+
+A message larger than the ring is spilled to a segment of its own; only its
+name and size go through the ring, so it keeps its place in the queue.
+
+Once the ring is released (at the latest when the interpreter exits), every
+operation raises `ShmClosedError`, so threads still using the queue can stop.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import weakref
+from queue import Empty, Full
+from typing import TYPE_CHECKING, Any
+
+from multiprocess import Condition, Lock  # type: ignore[reportAttributeAccessIssue]
+from multiprocess.reduction import ForkingPickler
+from multiprocess.shared_memory import SharedMemory
+
+from qqabc.qq.oob import _Segment, _untrack
+from qqabc.qq.sync import wait_until
+
+if TYPE_CHECKING:
+    from multiprocess.context import BaseContext
+    from multiprocess.synchronize import Condition as ConditionType
+
+__all__ = ("SHM_CAPACITY", "ShmClosedError", "ShmQueue")
+
+SHM_CAPACITY: int = 1 << 23
+"""Default size of the ring buffer in bytes (8 MiB)."""
+
+_HEADER = struct.Struct("QQQ")
+"""Header layout: total bytes written, total bytes read, number of messages."""
+
+_LENGTH = struct.Struct("Q")
+"""Length prefix of every record in the ring."""
+
+_SPILLED = 1 << 63
+"""Length-prefix flag of a record holding `_SPILL` instead of the message."""
+
+_SPILL = struct.Struct("Q")
+"""Size of a spilled message, followed by the name of its segment."""
+
+
+class ShmClosedError(ValueError):
+    """The ring of a `ShmQueue` was released, e.g. by interpreter shutdown."""
+
+
+def _release(shm: SharedMemory, owner: int) -> None:
+    """Close the segment and, in the creating process, remove it."""
+    shm.close()
+    if os.getpid() == owner:
+        shm.unlink()
+
+
+def _spill(data: bytes) -> _Segment:
+    """Copy a message that does not fit in the ring to a segment of its own."""
+    segment = _Segment(create=True, size=len(data))
+    _untrack(segment)
+    segment.buf[: len(data)] = data
+    segment.close()
+    return segment
+
+
+def _unspill(record: bytes) -> bytes:
+    """Read back and remove a message stored by `_spill`."""
+    (size,) = _SPILL.unpack_from(record)
+    segment = _Segment(name=record[_SPILL.size :].decode())
+    data = bytes(segment.buf[:size])
+    segment.release()
+    return data
+
+
+class ShmQueue:
+    """Multi-producer, multi-consumer queue backed by a shared-memory ring.
+
+    Records are stored as a length prefix followed by the pickled message and
+    may wrap around the end of the buffer. The write/read positions are
+    monotonically increasing byte counters, so the used space is simply
+    `written - read`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        capacity: int = SHM_CAPACITY,
+        *,
+        raw: bool = False,
+        ctx: BaseContext | None = None,
+    ) -> None:
+        """Create a new ring buffer.
+
+        Args:
+            maxsize (int, optional): maximum number of messages (`0` = only
+                limited by `capacity`). Defaults to `0`.
+
+            capacity (int, optional): size of the ring in bytes.
+                Defaults to `SHM_CAPACITY`.
+
+            raw (bool, optional): items are `bytes` stored as-is instead of being
+                pickled. Defaults to `False`.
+
+            ctx (BaseContext, optional): `multiprocess` context to create the
+                locks from; must match the processes sharing the queue.
+                Defaults to `None` (default context).
+        """
+        self.maxsize = maxsize
+        self.raw = raw
+        self.capacity = capacity
+        self._shm = SharedMemory(create=True, size=_HEADER.size + capacity)
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0, 0)
+        self._finalizer = weakref.finalize(self, _release, self._shm, os.getpid())
+
+        if ctx is None:
+            lock = Lock()
+            self._not_empty: ConditionType = Condition(lock)
+            self._not_full: ConditionType = Condition(lock)
+        else:
+            lock = ctx.Lock()
+            self._not_empty = ctx.Condition(lock)
+            self._not_full = ctx.Condition(lock)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_shm"] = self._shm.name
+        del state["_finalizer"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._shm = SharedMemory(name=state["_shm"])
+        self._finalizer = weakref.finalize(self, self._shm.close)
+
+    def qsize(self) -> int:
+        """Return the number of messages in the queue."""
+        return _HEADER.unpack_from(self._buf, 0)[2]
+
+    def empty(self) -> bool:
+        """Return `True` if the queue is empty."""
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """Return `True` if the queue holds `maxsize` messages."""
+        return 0 < self.maxsize <= self.qsize()
+
+    def put(
+        self,
+        obj: Any,
+        block: bool = True,  # noqa: FBT001, FBT002
+        timeout: float | None = None,
+    ) -> None:
+        """Put an object into the ring.
+
+        Args:
+            obj (Any): object to pickle into the ring.
+
+            block (bool, optional): wait for free space. Defaults to `True`.
+
+            timeout (float, optional): seconds to wait (`None` = forever).
+                Defaults to `None`.
+
+        Raises:
+            Full: if there is no room in time.
+        """
+        data = obj if self.raw else ForkingPickler.dumps(obj)
+        length = len(data)
+        spill = None
+        if _LENGTH.size + length > self.capacity:
+            spill = _spill(data)
+            data = _SPILL.pack(length) + spill.name.encode()
+            length = len(data) | _SPILLED
+
+        try:
+            self._put(length, data, block=block, timeout=timeout)
+        except BaseException:
+            if spill is not None:
+                spill.release()
+            raise
+
+    def _put(
+        self, length: int, data: bytes, *, block: bool, timeout: float | None
+    ) -> None:
+        """Append a record with length prefix `length` once there is room."""
+        size = _LENGTH.size + len(data)
+        with self._not_full:
+            if not wait_until(
+                self._not_full, lambda: self._fits(size), block=block, timeout=timeout
+            ):
+                raise Full
+            written, read, count = _HEADER.unpack_from(self._buf, 0)
+            self._write(written, _LENGTH.pack(length))
+            self._write(written + _LENGTH.size, data)
+            _HEADER.pack_into(self._buf, 0, written + size, read, count + 1)
+            self._not_empty.notify()
+
+    def get(
+        self,
+        block: bool = True,  # noqa: FBT001, FBT002
+        timeout: float | None = None,
+    ) -> Any:
+        """Remove and return an object from the ring.
+
+        Args:
+            block (bool, optional): wait for a message. Defaults to `True`.
+
+            timeout (float, optional): seconds to wait (`None` = forever).
+                Defaults to `None`.
+
+        Raises:
+            Empty: if no message arrives in time.
+
+        Returns:
+            Any: unpickled object
+        """
+        with self._not_empty:
+            if not wait_until(
+                self._not_empty, self.qsize, block=block, timeout=timeout
+            ):
+                raise Empty
+            written, read, count = _HEADER.unpack_from(self._buf, 0)
+            (length,) = _LENGTH.unpack(self._read(read, _LENGTH.size))
+            data = self._read(read + _LENGTH.size, length & ~_SPILLED)
+            read += _LENGTH.size + (length & ~_SPILLED)
+            _HEADER.pack_into(self._buf, 0, written, read, count - 1)
+            self._not_full.notify()
+        if length & _SPILLED:
+            data = _unspill(data)
+        return data if self.raw else ForkingPickler.loads(data)
+
+    def put_nowait(self, obj: Any) -> None:
+        """Equivalent to `put(obj, block=False)`."""
+        self.put(obj, block=False)
+
+    def get_nowait(self) -> Any:
+        """Equivalent to `get(block=False)`."""
+        return self.get(block=False)
+
+    @property
+    def _buf(self) -> memoryview:
+        """The ring, or `ShmClosedError` if it was released."""
+        buf = self._shm.buf
+        if buf is None:
+            raise ShmClosedError("ShmQueue is closed")
+        return buf
+
+    def _fits(self, size: int) -> bool:
+        written, read, count = _HEADER.unpack_from(self._buf, 0)
+        if 0 < self.maxsize <= count:
+            return False
+        return self.capacity - (written - read) >= size
+
+    def _write(self, pos: int, data: bytes | memoryview) -> None:
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        base = _HEADER.size
+        buf = self._buf
+        buf[base + start : base + start + first] = data[:first]
+        if first < len(data):
+            buf[base : base + len(data) - first] = data[first:]
+
+    def _read(self, pos: int, size: int) -> bytes:
+        start = pos % self.capacity
+        first = min(size, self.capacity - start)
+        base = _HEADER.size
+        buf = self._buf
+        data = bytes(buf[base + start : base + start + first])
+        if first < size:
+            data += bytes(buf[base : base + size - first])
+        return data
@@ -0,0 +1,213 @@
+"""Optional counters and latency histograms for queues.
+
+A queue built with `stats=True` (or with a `QStats`) times every write and
+read and stamps each message with its send time, so the reader can measure how
+long it sat in the queue. Queues built without stats skip all of this.
+
+Counters live in the process that does the reading or writing: a `Q` sent to a
+worker process carries its own copy, so take snapshots where the work happens.
+Send times use `time.monotonic`, which is shared by processes on one machine.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from qqabc.qq import Msg
+
+__all__ = ("Histogram", "QStats")
+
+_SENT = "_sent"
+"""`Msg.__dict__` key of the time a message was sent."""
+
+
+class Histogram:
+    """Counts of durations in power-of-two microsecond buckets.
+
+    Bucket `i` counts durations below `2**i` microseconds (and at least
+    `2**(i - 1)`), so recording is a `bit_length` and an increment.
+    """
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, n: int = 1) -> None:
+        """Count `n` durations of `seconds` each.
+
+        Args:
+            seconds (float): duration.
+
+            n (int, optional): number of occurrences. Defaults to `1`.
+        """
+        seconds = max(seconds, 0.0)
+        self.buckets[min(int(seconds * 1e6).bit_length(), 63)] += n
+        self.count += n
+        self.total += seconds * n
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """Return an upper bound (in seconds) on the `p`-th percentile.
+
+        Args:
+            p (float): percentile between `0` and `100`.
+
+        Returns:
+            float: upper edge of the bucket holding the percentile (`0.0` if
+                nothing was recorded)
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min((1 << i) / 1e6, self.max)
+        return self.max  # pragma: no cover
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the summary as plain data (seconds)."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class QStats:
+    """Counters, wait times, dwell times and depth samples of one queue.
+
+    Example:
+        >>> from qqabc.qq import Q
+        >>> q = Q("thread", stats=True)
+        >>> _ = q.put(1)
+        >>> _ = q.get()
+        >>> q.stats.snapshot()["gets"]
+        1
+    """
+
+    def __init__(self, name: str | None = None) -> None:
+        """Construct empty statistics.
+
+        Args:
+            name (str, optional): label reported in snapshots. Defaults to `None`.
+        """
+        self.name = name
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every counter and restart the clock."""
+        self.started = monotonic()
+        self.puts = 0
+        self.gets = 0
+        self.put_wait = Histogram()
+        """Time spent inside each write (blocked by backpressure)."""
+        self.get_wait = Histogram()
+        """Time spent inside each read (waiting for a message)."""
+        self.dwell = Histogram()
+        """Time from send to receive of each message."""
+        self.depth_max = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    @staticmethod
+    def stamp(msg: Msg[Any]) -> Msg[Any]:
+        """Return a copy of `msg` carrying the current time as its send time."""
+        copy = type(msg)(msg.data, msg.kind, msg.order)
+        copy.__dict__[_SENT] = monotonic()
+        return copy
+
+    def sent(self, n: int, waited: float, depth: int | None) -> None:
+        """Record one write of `n` messages.
+
+        Args:
+            n (int): number of messages written.
+
+            waited (float): seconds the write took.
+
+            depth (int, optional): queue size after the write, if known.
+        """
+        with self._lock:
+            self.puts += n
+            self.put_wait.record(waited)
+            if depth is not None:
+                self.depth_max = max(self.depth_max, depth)
+                self.depth_total += depth
+                self.depth_samples += 1
+
+    def received(self, msg: Msg[Any], n: int, waited: float) -> None:
+        """Record one read of `n` messages sent together as `msg`.
+
+        Args:
+            msg (Msg): message (or batch envelope) read.
+
+            n (int): number of messages read.
+
+            waited (float): seconds the read took.
+        """
+        now = monotonic()
+        sent = msg.__dict__.get(_SENT)
+        with self._lock:
+            self.gets += n
+            self.get_wait.record(waited)
+            if sent is not None:
+                self.dwell.record(now - sent, n)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current statistics as plain data.
+
+        Returns:
+            dict[str, Any]: counts, rates (per second), and summaries of
+                `put_wait`, `get_wait` and `dwell` (in seconds) and of the
+                queue depth sampled after each write
+        """
+        with self._lock:
+            elapsed = monotonic() - self.started
+            return {
+                "name": self.name,
+                "elapsed": elapsed,
+                "puts": self.puts,
+                "gets": self.gets,
+                "put_rate": self.puts / elapsed if elapsed else 0.0,
+                "get_rate": self.gets / elapsed if elapsed else 0.0,
+                "put_wait": self.put_wait.snapshot(),
+                "get_wait": self.get_wait.snapshot(),
+                "dwell": self.dwell.snapshot(),
+                "depth": {
+                    "max": self.depth_max,
+                    "mean": (
+                        self.depth_total / self.depth_samples
+                        if self.depth_samples
+                        else 0.0
+                    ),
+                },
+            }
+
+
+def make_stats(stats: bool | QStats) -> QStats | None:  # noqa: FBT001
+    """Resolve a `stats` argument: `True` makes new statistics, `False` none."""
+    if isinstance(stats, QStats):
+        return stats
+    return QStats() if stats else None
@@ -0,0 +1,88 @@
+"""Work-stealing scheduler for thread workers.
+
+Each worker owns a `deque` holding a contiguous block of the items. It takes
+work from the front of its own deque and, once that is empty, steals from the
+back of another worker's deque. `deque.popleft` and `deque.pop` are atomic, so
+workers never contend on a shared lock, and the items queued behind a slow
+one are taken over by idle workers instead of waiting for it.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import suppress
+from random import randrange
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Sequence, TypeVar
+
+from qqabc.qq import Worker
+
+__all__ = ("steal_map",)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Session = Callable[[], ContextManager[Callable[[T], R]]]
+"""Set up a worker and provide the function that processes one item."""
+
+if TYPE_CHECKING:
+    Deques = list[deque[tuple[int, T]]]
+
+
+def _take(own: deque[tuple[int, T]], deques: Deques[T]) -> tuple[int, T] | None:
+    """Next item: from the front of `own`, else from the back of another deque."""
+    try:
+        return own.popleft()
+    except IndexError:
+        pass
+    n = len(deques)
+    first = randrange(n)  # noqa: S311
+    for i in range(n):
+        with suppress(IndexError):
+            return deques[(first + i) % n].pop()
+    return None
+
+
+def steal_map(session: Session[T, R], items: Sequence[T], num: int) -> list[R]:
+    """Process `items` on `num` work-stealing threads.
+
+    Args:
+        session (Session): called once in each thread; a context manager that
+            provides the function to apply to each item.
+
+        items (Sequence): items to process.
+
+        num (int): number of threads.
+
+    Raises:
+        Exception: the first exception raised while processing an item.
+
+    Returns:
+        list: results, in the order of `items`
+    """
+    num = max(1, min(num, len(items)))
+    size = len(items)
+    deques: Deques[T] = [
+        deque((i, items[i]) for i in range(w * size // num, (w + 1) * size // num))
+        for w in range(num)
+    ]
+    results: list[Any] = [None] * size
+    errors: list[BaseException] = []
+
+    def work(own: deque[tuple[int, T]]) -> None:
+        try:
+            with session() as fn:
+                while not errors:
+                    job = _take(own, deques)
+                    if job is None:
+                        break
+                    i, item = job
+                    results[i] = fn(item)
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [Worker.thread(work, own) for own in deques]
+    for w in workers:
+        w.join()
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,39 @@
+"""Condition-variable helpers shared by the in-process queue implementations."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from threading import Condition
+
+    from multiprocess.synchronize import Condition as ProcessCondition
+
+__all__ = ("wait_until",)
+
+
+def wait_until(
+    cond: Condition | ProcessCondition,
+    ready: Callable[[], Any],
+    *,
+    block: bool,
+    timeout: float | None,
+) -> bool:
+    """Wait on `cond` (already held) until `ready()`, like `queue.Queue`.
+
+    Args:
+        cond (Condition): condition notified when `ready()` may have changed.
+
+        ready (Callable[[], Any]): predicate to wait for.
+
+        block (bool): if `False`, check `ready()` once without waiting.
+
+        timeout (float, optional): seconds to wait (`None` = forever).
+
+    Returns:
+        bool: `False` if `ready()` is still false (the caller raises `Full`
+            or `Empty`).
+    """
+    if not block:
+        return bool(ready())
+    return bool(cond.wait_for(ready, timeout))
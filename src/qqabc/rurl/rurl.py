@@ -8,7 +8,6 @@ import os
 import re
 import sys
 import traceback
-import urllib.request
 from abc import ABC, abstractmethod
 from contextlib import AbstractContextManager, contextmanager, suppress
 from dataclasses import dataclass
@@ -533,6 +532,8 @@ def _download_plugin_file(
             logger.warning(
                 "httpx_options provided but httpx is not installed; ignoring options."
             )
+        import urllib.request  # noqa: PLC0415
+
         urllib.request.urlretrieve(url, local_path)  # noqa: S310
 
 
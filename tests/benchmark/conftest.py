@@ -0,0 +1,107 @@
+"""Benchmark 量測值的紀錄、JSON 輸出與 baseline 比較（``bench`` fixture）。
+
+每個 benchmark 以 ``bench.record(metric, value, unit)`` 記錄量測值，
+鍵值為 ``<測試名稱>:<metric>``::
+
+    pytest -m benchmark --bench-json bench.json            # 記錄
+    pytest -m benchmark --bench-baseline bench.json        # 與先前結果比較
+
+比較時，任何量測值比 baseline 差超過 ``--bench-tolerance``（預設 20%）
+就讓該測試失敗；baseline 沒有的量測值只記錄、不比較。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+
+class Bench:
+    """一個 benchmark 測試的量測紀錄。"""
+
+    def __init__(
+        self,
+        name: str,
+        results: dict[str, dict[str, Any]],
+        baseline: dict[str, dict[str, Any]],
+        tolerance: float,
+    ) -> None:
+        self.name = name
+        self.regressions: list[str] = []
+        self._results = results
+        self._baseline = baseline
+        self._tolerance = tolerance
+
+    def record(
+        self, metric: str, value: float, unit: str, *, higher_is_better: bool = True
+    ) -> None:
+        """記錄一個量測值，並與 baseline 比較。"""
+        key = f"{self.name}:{metric}"
+        self._results[key] = {
+            "value": value,
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        print(f"{key}: {value:,.6g} {unit}")  # noqa: T201
+
+        old = self._baseline.get(key)
+        if old is None or not old["value"]:
+            return
+        ratio = value / old["value"] if higher_is_better else old["value"] / value
+        if ratio < 1 - self._tolerance:
+            self.regressions.append(
+                f"{key}: {value:,.6g} {unit} vs. baseline {old['value']:,.6g} "
+                f"({(1 - ratio):.0%} worse)"
+            )
+
+
+@pytest.fixture(scope="session")
+def bench_results(request: pytest.FixtureRequest) -> Iterator[dict[str, Any]]:
+    """本次執行的所有量測值；結束時依 ``--bench-json`` 寫檔。"""
+    results: dict[str, dict[str, Any]] = {}
+    yield results
+
+    path = request.config.getoption("--bench-json")
+    if path and results:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }
+        Path(path).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def bench_baseline(request: pytest.FixtureRequest) -> dict[str, dict[str, Any]]:
+    """``--bench-baseline`` 的量測值（未指定時為空）。"""
+    path = request.config.getoption("--bench-baseline")
+    if not path:
+        return {}
+    return json.loads(Path(path).read_text())["results"]
+
+
+@pytest.fixture
+def bench(
+    request: pytest.FixtureRequest,
+    bench_results: dict[str, dict[str, Any]],
+    bench_baseline: dict[str, dict[str, Any]],
+) -> Iterator[Bench]:
+    """記錄這個測試的量測值；任何一項比 baseline 退步就讓測試失敗。"""
+    recorder = Bench(
+        request.node.name,
+        bench_results,
+        bench_baseline,
+        request.config.getoption("--bench-tolerance"),
+    )
+    yield recorder
+    if recorder.regressions:
+        pytest.fail("效能退步:\n" + "\n".join(recorder.regressions))
@@ -0,0 +1,38 @@
+"""Benchmark: ``mapq`` 逐項處理 vs. ``mapq_array`` 以區塊處理 NumPy 陣列。"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+np = pytest.importorskip("numpy")
+
+N_ITEMS = 100_000
+
+
+def _scale(x: float) -> float:
+    return 2.0 * x + 1.0
+
+
+def test_array_mode_vs_items(bench: Any) -> None:
+    """以區塊傳送時訊息從數十萬則降為數十則。"""
+    x = np.random.default_rng(0).random(N_ITEMS)
+
+    start = time.perf_counter()
+    items = np.fromiter(qqabc.qq.mapq(_scale, x, num=4, chunksize=1024), float)
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocks = qqabc.qq.mapq_array(_scale, x, num=4)
+    per_block = time.perf_counter() - start
+
+    assert np.allclose(items, blocks)
+    bench.record("items_rate", N_ITEMS / per_item, "items/s")
+    bench.record("array_rate", N_ITEMS / per_block, "items/s")
+    assert per_block < per_item
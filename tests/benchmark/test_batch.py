@@ -0,0 +1,52 @@
+"""Benchmark: ``Q.put_many`` / ``Q.iter_batches`` 在不同 batch size 下的吞吐量。
+
+以 ``make test-benchmark`` 執行，以 ``bench`` 記錄每秒訊息數（messages/sec）。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+N_MSG = 50_000
+BATCH_SIZES = (1, 16, 128, 1024)
+
+
+def _count(q: qqabc.qq.Q[int], out: qqabc.qq.Q[int]) -> None:
+    """Consume every message in batches and report how many were seen."""
+    out.put(sum(len(batch) for batch in q.iter_batches(max_items=1024)))
+
+
+def _throughput(kind: qqabc.qq.ContextName, batch_size: int) -> float:
+    q: qqabc.qq.Q[int] = qqabc.qq.Q(kind)
+    out: qqabc.qq.Q[int] = qqabc.qq.Q(kind)
+    start_worker = qqabc.qq.run if kind == "process" else qqabc.qq.run_thread
+    worker = start_worker(_count, q, out)
+
+    start = time.perf_counter()
+    if batch_size == 1:
+        for i in range(N_MSG):
+            q.put(i, order=i)
+    else:
+        q.put_many(range(N_MSG), batch_size=batch_size)
+    q.stop(worker)
+    elapsed = time.perf_counter() - start
+
+    assert out.get().data == N_MSG
+    return N_MSG / elapsed
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_batch_throughput(bench: Any, kind: qqabc.qq.ContextName) -> None:
+    """Batching 應該提高每秒訊息數。"""
+    rates = {size: _throughput(kind, size) for size in BATCH_SIZES}
+    for size, rate in rates.items():
+        bench.record(f"batch_size_{size}", rate, "msg/s")
+
+    assert rates[128] > rates[1], "expected batching to beat single puts"
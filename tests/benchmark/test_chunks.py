@@ -0,0 +1,37 @@
+"""Benchmark: mapq 在廉價函式上，逐項傳送 vs. 分塊（chunksize）的吞吐量。"""
+
+from __future__ import annotations
+
+import operator
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+N_ITEMS = 50_000
+
+
+def _rate(chunksize: int | str | None) -> float:
+    start = time.perf_counter()
+    total = sum(
+        qqabc.qq.mapq(
+            operator.neg, range(N_ITEMS), num=4, kind="process", chunksize=chunksize
+        )
+    )
+    elapsed = time.perf_counter() - start
+    assert total == -sum(range(N_ITEMS))
+    return N_ITEMS / elapsed
+
+
+def test_chunksize_throughput(bench: Any) -> None:
+    """分塊後每則訊息攤提的 queue 成本應大幅降低。"""
+    rates = {size: _rate(size) for size in (None, 256, "auto")}
+    for size, rate in rates.items():
+        bench.record(f"chunksize_{size}", rate, "items/s")
+
+    assert rates[256] > 2 * rates[None]
+    assert rates["auto"] > 2 * rates[None]
@@ -0,0 +1,42 @@
+"""Benchmark: 不同 serializer 在 process queue 上傳送小型 dict 的吞吐量。"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+N_MSG = 20_000
+PAYLOAD = {"id": 1, "name": "item", "tags": ["a", "b"], "score": 0.5}
+
+
+def _drain(q: qqabc.qq.Q[dict], out: qqabc.qq.Q[int]) -> None:
+    out.put(sum(1 for _ in q))
+
+
+def _throughput(serializer: qqabc.qq.codec.Serializer | None) -> float:
+    q: qqabc.qq.Q[dict] = qqabc.qq.Q(serializer=serializer)
+    out: qqabc.qq.Q[int] = qqabc.qq.Q()
+    worker = qqabc.qq.run(_drain, q, out)
+
+    start = time.perf_counter()
+    q.put_many([PAYLOAD] * N_MSG)
+    q.stop(worker)
+    elapsed = time.perf_counter() - start
+
+    assert out.get().data == N_MSG
+    return N_MSG / elapsed
+
+
+def test_serializer_throughput(bench: Any) -> None:
+    """``pickle`` / ``marshal`` 應快於預設的 dill。"""
+    rates = {name: _throughput(name) for name in (None, "pickle", "marshal")}
+    for name, rate in rates.items():
+        bench.record(f"serializer_{name or 'dill'}", rate, "msg/s")
+
+    assert rates["pickle"] > rates[None], "expected pickle to beat dill"
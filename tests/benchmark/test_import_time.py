@@ -0,0 +1,48 @@
+"""Benchmark: ``import qqabc.*`` 的耗時（``python -X importtime``）。
+
+每個模組在新的直譯器中 import 數次，取最短的累計時間，並要求低於 ``BUDGET_MS``，
+避免 ``multiprocess``、``asyncio`` 等重量級依賴再次在 import 時就被載入。
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Any
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+BUDGET_MS = {
+    "qqabc.qq": 80,
+    "qqabc.pipe.channel": 80,
+    "qqabc.rurl": 80,
+}
+"""各模組 (含其依賴) 累計 import 時間的上限, 單位為毫秒。"""
+
+RUNS = 5
+
+
+def _import_ms(module: str) -> float:
+    """在新的直譯器中 import ``module``，回傳 ``-X importtime`` 的累計毫秒數。"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in out.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e3
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+@pytest.mark.parametrize("module", BUDGET_MS)
+def test_import_time(bench: Any, module: str) -> None:
+    """最短的累計 import 時間不得超過預算。"""
+    elapsed = min(_import_ms(module) for _ in range(RUNS))
+    bench.record("import", elapsed, "ms", higher_is_better=False)
+    assert elapsed < BUDGET_MS[module], f"import {module} took {elapsed:.1f} ms"
@@ -0,0 +1,77 @@
+"""Benchmark: ``Pipeline`` 中 CPU-bound stage 的擴展性與 stage 合併省下的開銷。
+
+``executor="process"`` 的 stage 在子行程中執行，不受 GIL 限制；
+``"thread"`` 則作為對照組。相鄰的輕量 stage 合併（``fuse``）後，
+每個 item 省去 stage 之間的 queue 傳遞。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+from qqabc.pipe import Stage, pipe
+from qqabc.qq import NUM_CPUS
+
+pytestmark = pytest.mark.benchmark
+
+N_ITEMS = 64
+WORK = 200_000
+"""每個 item 的迴圈次數, 約數毫秒的純 Python 運算。"""
+
+
+def _burn(n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+def _rate(executor: str, concurrency: int) -> float:
+    stage = Stage(fn=_burn, executor=executor, concurrency=concurrency)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    results = list(pipe([stage], input=[WORK] * N_ITEMS, backpressure=concurrency))
+    elapsed = time.perf_counter() - start
+    assert len(results) == N_ITEMS
+    return N_ITEMS / elapsed
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_cpu_bound_scaling(bench: Any, executor: str) -> None:
+    """Process stage 的吞吐量應接近隨 worker 數（至多 CPU 數）線性成長。"""
+    base = _rate(executor, 1)
+    bench.record("rate_1", base, "items/s")
+    for concurrency in (2, 4):
+        rate = _rate(executor, concurrency)
+        bench.record(f"rate_{concurrency}", rate, "items/s")
+        bench.record(f"speedup_{concurrency}", rate / base, "x")
+        if executor == "process":
+            assert rate / base > 0.7 * min(concurrency, NUM_CPUS)
+
+
+N_CHEAP = 20_000
+
+
+def _per_item_us(*, fuse: bool) -> float:
+    stages = [
+        Stage(fn=str.strip, name="parse"),
+        Stage(fn=int, name="validate"),
+        Stage(fn=abs, name="normalize"),
+    ]
+    start = time.perf_counter()
+    results = list(pipe(stages, input=[" 1 "] * N_CHEAP, backpressure=256, fuse=fuse))
+    elapsed = time.perf_counter() - start
+    assert results == [1] * N_CHEAP
+    return elapsed / N_CHEAP * 1e6
+
+
+def test_fusion_overhead(bench: Any) -> None:
+    """三個輕量 thread stage (parse → validate → normalize) 合併前後的每 item 開銷。"""
+    separate = _per_item_us(fuse=False)
+    fused = _per_item_us(fuse=True)
+    bench.record("separate_per_item", separate, "us", higher_is_better=False)
+    bench.record("fused_per_item", fused, "us", higher_is_better=False)
+    bench.record("saved_per_item", separate - fused, "us")
+    assert fused < separate
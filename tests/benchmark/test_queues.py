@@ -0,0 +1,187 @@
+"""Benchmark: ``Q`` 各 backend 的吞吐量與延遲、``Q.sorted`` 重排成本、``mapq`` 端到端開銷。
+
+涵蓋 ``"thread"``、``"process"`` 與 ``BoundedQ``，payload 從 16 B 到 16 MiB，
+多個 producer / consumer，以及不同 ``maxsize`` 的 backpressure。
+量測值以 ``bench`` fixture 記錄，可輸出 JSON 並與 baseline 比較（見 ``conftest.py``）。
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable
+
+import pytest
+
+import qqabc.qq
+from qqabc.pipe.channel import BoundedQ
+
+pytestmark = pytest.mark.benchmark
+
+KINDS = ("thread", "process", "bounded-thread", "bounded-process")
+PAYLOADS = {
+    "16B": 16,
+    "1KiB": 1 << 10,
+    "64KiB": 64 << 10,
+    "1MiB": 1 << 20,
+    "16MiB": 16 << 20,
+}
+TOTAL_BYTES = 64 << 20
+"""每個 payload 大小最多傳送的總位元組數。"""
+
+MAX_MSG = 20_000
+BOUND = 64
+"""``BoundedQ`` 預設的 ``maxsize``。"""
+
+
+def _queue(kind: str, maxsize: int = BOUND) -> qqabc.qq.Q[Any]:
+    if kind.startswith("bounded-"):
+        return BoundedQ(kind=kind.split("-")[1], maxsize=maxsize)  # type: ignore[arg-type]
+    return qqabc.qq.Q(kind)  # type: ignore[arg-type]
+
+
+def _is_process(kind: str) -> bool:
+    return kind.endswith("process")
+
+
+def _start(kind: str) -> Callable[..., qqabc.qq.Worker]:
+    return qqabc.qq.run if _is_process(kind) else qqabc.qq.run_thread
+
+
+def _produce(q: qqabc.qq.Q[Any], go: Any, payload: bytes, n: int) -> None:
+    go.wait()
+    for i in range(n):
+        q.put(payload, order=i)
+
+
+def _consume(q: qqabc.qq.Q[Any], out: qqabc.qq.Q[int]) -> None:
+    out.put(sum(1 for _ in q))
+
+
+def _transfer(
+    kind: str,
+    payload: bytes,
+    n: int,
+    *,
+    producers: int = 1,
+    consumers: int = 1,
+    maxsize: int = BOUND,
+) -> float:
+    """以 ``producers`` 寫入、``consumers`` 讀出 ``n`` 則訊息，回傳秒數。"""
+    q = _queue(kind, maxsize)
+    out: qqabc.qq.Q[int] = qqabc.qq.Q("process" if _is_process(kind) else "thread")
+    go = qqabc.qq.get_context().Event() if _is_process(kind) else threading.Event()
+    start = _start(kind)
+    readers = [start(_consume, q, out) for _ in range(consumers)]
+    writers = [
+        start(_produce, q, go, payload, n // producers) for _ in range(producers)
+    ]
+
+    begin = time.perf_counter()
+    go.set()
+    for w in writers:
+        w.join()
+    q.stop(readers)
+    elapsed = time.perf_counter() - begin
+
+    assert sum(out.get().data for _ in readers) == n // producers * producers
+    return elapsed
+
+
+@pytest.mark.parametrize("size", PAYLOADS)
+@pytest.mark.parametrize("kind", KINDS)
+def test_throughput(bench: Any, kind: str, size: str) -> None:
+    """單一 producer / consumer，不同 payload 大小的吞吐量。"""
+    nbytes = PAYLOADS[size]
+    n = max(4, min(MAX_MSG, TOTAL_BYTES // nbytes))
+    elapsed = _transfer(kind, b"x" * nbytes, n)
+    bench.record("msg_rate", n / elapsed, "msg/s")
+    bench.record("byte_rate", n * nbytes / elapsed / 1e6, "MB/s")
+
+
+@pytest.mark.parametrize(("producers", "consumers"), [(1, 4), (4, 1), (4, 4)])
+@pytest.mark.parametrize("kind", KINDS)
+def test_many_producers_consumers(
+    bench: Any, kind: str, producers: int, consumers: int
+) -> None:
+    """多個 producer / consumer 共用一個 queue 時的吞吐量（16 B 訊息）。"""
+    elapsed = _transfer(
+        kind, b"x" * 16, MAX_MSG, producers=producers, consumers=consumers
+    )
+    bench.record("msg_rate", MAX_MSG / elapsed, "msg/s")
+
+
+@pytest.mark.parametrize("maxsize", [1, 16, 256])
+@pytest.mark.parametrize("kind", ["bounded-thread", "bounded-process"])
+def test_backpressure(bench: Any, kind: str, maxsize: int) -> None:
+    """``maxsize`` 越小，producer 越常被阻塞。"""
+    elapsed = _transfer(kind, b"x" * 16, MAX_MSG, maxsize=maxsize)
+    bench.record("msg_rate", MAX_MSG / elapsed, "msg/s")
+
+
+def _echo(q: qqabc.qq.Q[Any], back: qqabc.qq.Q[Any]) -> None:
+    for msg in q:
+        back.put(msg.data)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_latency(bench: Any, kind: str) -> None:
+    """單則 16 B 訊息往返（put → 對方 get → 回傳）的延遲。"""
+    q, back = _queue(kind), _queue(kind)
+    worker = _start(kind)(_echo, q, back)
+    samples = []
+    for _ in range(2_000):
+        start = time.perf_counter()
+        q.put(b"x" * 16)
+        back.get()
+        samples.append(time.perf_counter() - start)
+    q.stop(worker)
+
+    samples.sort()
+    bench.record("p50", samples[len(samples) // 2] * 1e6, "us", higher_is_better=False)
+    bench.record(
+        "p99", samples[len(samples) * 99 // 100] * 1e6, "us", higher_is_better=False
+    )
+
+
+def test_sorted_reorder_cost(bench: Any) -> None:
+    """``Q.sorted`` 重排亂序訊息相對於直接迭代的額外成本。"""
+    n = 200_000
+    orders = list(range(n))
+    random.Random(0).shuffle(orders)  # noqa: S311
+
+    def read(*, sort: bool) -> float:
+        q: qqabc.qq.Q[None] = qqabc.qq.Q("thread")
+        q.put_many([qqabc.qq.Msg(data=None, order=o) for o in orders], batch_size=1024)
+        q.end()
+        start = time.perf_counter()
+        count = sum(1 for _ in (q.sorted() if sort else q))
+        elapsed = time.perf_counter() - start
+        assert count == n
+        return elapsed
+
+    plain = min(read(sort=False) for _ in range(3))
+    ordered = min(read(sort=True) for _ in range(3))
+    bench.record("sorted_rate", n / ordered, "msg/s")
+    bench.record(
+        "reorder_cost", (ordered - plain) / n * 1e6, "us/msg", higher_is_better=False
+    )
+
+
+def _identity(x: int) -> int:
+    return x
+
+
+@pytest.mark.parametrize("chunksize", [None, 256])
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_mapq_overhead(bench: Any, kind: str, chunksize: int | None) -> None:
+    """``mapq`` 呼叫一個不做事的函式時，每個項目的端到端開銷。"""
+    n = 20_000
+    start = time.perf_counter()
+    results = list(
+        qqabc.qq.mapq(_identity, range(n), num=4, kind=kind, chunksize=chunksize)  # type: ignore[arg-type]
+    )
+    elapsed = time.perf_counter() - start
+    assert results == list(range(n))
+    bench.record("per_item", elapsed / n * 1e6, "us", higher_is_better=False)
@@ -0,0 +1,42 @@
+"""Benchmark: 以 ``Q.sorted`` 重排 32 個 worker 亂序完成的 1M 筆訊息。"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+N_MSG = 1_000_000
+N_WORKERS = 32
+
+
+def _arrival_orders(n: int, workers: int, seed: int = 0) -> list[int]:
+    """Order numbers as they would arrive from round-robin workers with jitter."""
+    rng = random.Random(seed)  # noqa: S311
+    arrival = [i / workers + rng.expovariate(1.0) for i in range(n)]
+    return sorted(range(n), key=arrival.__getitem__)
+
+
+def test_reorder_1m_from_32_workers(bench: Any) -> None:
+    """1M 筆訊息亂序到達，``Q.sorted`` 仍以 O(log n) 重排。"""
+    orders = _arrival_orders(N_MSG, N_WORKERS)
+    q: qqabc.qq.Q[None] = qqabc.qq.Q("thread")
+    q.put_many([qqabc.qq.Msg(data=None, order=o) for o in orders], batch_size=1024)
+    q.end()
+
+    start = time.perf_counter()
+    prev = -1
+    for msg in q.sorted():
+        assert msg.order == prev + 1
+        prev = msg.order
+    elapsed = time.perf_counter() - start
+
+    assert prev == N_MSG - 1
+    bench.record("elapsed", elapsed, "s", higher_is_better=False)
+    bench.record("rate", N_MSG / elapsed, "msg/s")
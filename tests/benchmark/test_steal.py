@@ -0,0 +1,67 @@
+"""Benchmark: thread mapq 的共享 queue vs. work stealing（重尾任務時間）。"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+import pytest
+
+import qqabc.qq
+
+pytestmark = pytest.mark.benchmark
+
+N_TASKS = 2_000
+N_WORKERS = 16
+
+
+def _durations() -> list[float]:
+    """Pareto 分布的任務時間：大多很短，少數很長（上限 0.2 秒）。"""
+    rng = random.Random(0)  # noqa: S311
+    return [min(0.2, 0.0005 * rng.paretovariate(1.2)) for _ in range(N_TASKS)]
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _makespan(scheduler: qqabc.qq.Scheduler, durations: list[float]) -> float:
+    start = time.perf_counter()
+    done = list(
+        qqabc.qq.mapq(
+            _sleep, durations, num=N_WORKERS, kind="thread", scheduler=scheduler
+        )
+    )
+    elapsed = time.perf_counter() - start
+    assert done == durations
+    return elapsed
+
+
+def test_heavy_tailed_completion(bench: Any) -> None:
+    """Work stealing 應更接近理想完成時間（總工作量 / worker 數）。"""
+    durations = _durations()
+    ideal = max(sum(durations) / N_WORKERS, *durations)
+    times = {s: _makespan(s, durations) for s in ("shared", "steal")}
+    bench.record("ideal", ideal, "s", higher_is_better=False)
+    for scheduler, elapsed in times.items():
+        bench.record(scheduler, elapsed, "s", higher_is_better=False)
+
+    assert times["steal"] < times["shared"]
+
+
+def test_tiny_tasks_many_workers(bench: Any) -> None:
+    """大量極短任務、32 個 worker 時，避免共享 queue 的鎖競爭。"""
+    times = {}
+    for scheduler in ("shared", "steal"):
+        start = time.perf_counter()
+        list(
+            qqabc.qq.mapq(
+                abs, range(200_000), num=32, kind="thread", scheduler=scheduler
+            )
+        )
+        times[scheduler] = time.perf_counter() - start
+        bench.record(scheduler, times[scheduler], "s", higher_is_better=False)
+
+    assert times["steal"] < times["shared"]
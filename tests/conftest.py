@@ -0,0 +1,30 @@
+"""共用的 pytest 選項。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """效能基準測試的輸出與 baseline 比較選項（見 ``tests/benchmark/conftest.py``）。"""
+    group = parser.getgroup("benchmark", "效能基準測試")
+    group.addoption(
+        "--bench-json",
+        metavar="PATH",
+        help="把所有 benchmark 量測值寫成 JSON 檔",
+    )
+    group.addoption(
+        "--bench-baseline",
+        metavar="PATH",
+        help="與先前 --bench-json 的結果比較, 退步超過容許值的 benchmark 會失敗",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=0.2,
+        metavar="RATIO",
+        help="與 baseline 比較時容許的退步比例 (預設 0.2 = 20%%)",
+    )
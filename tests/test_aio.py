@@ -0,0 +1,128 @@
+"""Test the `"async"` queue kind and the awaitable `Q` methods."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from queue import Empty, Full
+
+import pytest
+
+from qqabc.qq import Msg, Q, mapq
+from qqabc.qq.aio import AsyncQueue
+
+
+@pytest.mark.asyncio
+async def test_aput_aget() -> None:
+    q: Q[int] = Q("async")
+    await q.aput(1, order=5)
+    msg = await q.aget()
+    assert (msg.data, msg.order) == (1, 5)
+
+
+@pytest.mark.asyncio
+async def test_async_for_until_end() -> None:
+    q: Q[int] = Q("async")
+    for i in range(3):
+        await q.aput(i)
+    await q.aend()
+    assert [msg.data async for msg in q] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_thread_producer_wakes_consumer() -> None:
+    """A blocking `put` from a thread wakes a waiting coroutine."""
+    q: Q[int] = Q("async")
+
+    def produce() -> None:
+        q.put_many(range(500))
+        q.end()
+
+    consumer = asyncio.ensure_future(_collect(q))
+    await asyncio.sleep(0)  # let the consumer park first
+    t = threading.Thread(target=produce)
+    t.start()
+    assert await asyncio.wait_for(consumer, 5) == list(range(500))
+    t.join()
+
+
+async def _collect(q: Q[int]) -> list:
+    return [msg.data async for msg in q]
+
+
+@pytest.mark.asyncio
+async def test_asorted() -> None:
+    q: Q[str] = Q("async")
+    for order in [2, 0, 3, 1]:
+        await q.aput(str(order), order=order)
+    await q.aend()
+    assert [msg.data async for msg in q.asorted()] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_asorted_gap_timeout() -> None:
+    q: Q[str] = Q("async")
+    await q.aput("b", order=1)
+    got = q.asorted(gap_timeout=0.01).__aiter__()
+    assert (await got.__anext__()).data == "b"
+
+
+@pytest.mark.asyncio
+async def test_aget_timeout() -> None:
+    q: Q[int] = Q("async")
+    with pytest.raises(Empty):
+        await q.aget(timeout=0.01)
+    await q.aput(1)  # a timed-out getter must not swallow the item
+    assert (await q.aget()).data == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_kind_falls_back_to_executor() -> None:
+    q: Q[int] = Q("thread")
+    await q.aput(1)
+    await q.aend()
+    assert [msg.data async for msg in q] == [1]
+
+
+@pytest.mark.asyncio
+async def test_bounded_aput_waits_for_room() -> None:
+    aq = AsyncQueue(maxsize=1)
+    await aq.aput(Msg(0))
+    put = asyncio.ensure_future(aq.aput(Msg(1)))
+    await asyncio.sleep(0.01)
+    assert not put.done()
+    assert aq.get().data == 0  # blocking get from the loop thread makes room
+    await asyncio.wait_for(put, 1)
+    assert (await aq.aget()).data == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_getter_passes_wakeup_on() -> None:
+    aq = AsyncQueue()
+    first = asyncio.ensure_future(aq.aget())
+    second = asyncio.ensure_future(aq.aget())
+    await asyncio.sleep(0)
+    first.cancel()
+    aq.put(1)
+    assert await asyncio.wait_for(second, 1) == 1
+
+
+def test_blocking_side() -> None:
+    aq = AsyncQueue(maxsize=1)
+    aq.put_nowait(1)
+    assert aq.full()
+    with pytest.raises(Full):
+        aq.put(2, timeout=0.01)
+    assert aq.get_nowait() == 1
+    with pytest.raises(Empty):
+        aq.get(timeout=0.01)
+
+
+def _double(x: int) -> int:
+    return x * 2
+
+
+def test_mapq_async_kind() -> None:
+    assert list(mapq(_double, range(10), num=3, kind="async")) == [
+        x * 2 for x in range(10)
+    ]
@@ -0,0 +1,50 @@
+"""Test block-wise `mapq_array`."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from qqabc.qq import mapq_array
+
+np = pytest.importorskip("numpy")
+
+
+def _norms(points: Any) -> Any:
+    return np.sqrt((points**2).sum(axis=1))
+
+
+def _pairs(x: Any) -> Any:
+    return np.stack([x, -x], axis=1)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process", "shm"])
+def test_matches_vectorized_call(kind: str) -> None:
+    x = np.linspace(0, 1, 10_001)
+    y = np.arange(10_001)
+    result = mapq_array(np.add, x, y, num=3, kind=kind)  # type: ignore[arg-type]
+    assert result.dtype == np.float64
+    assert np.array_equal(result, x + y)
+
+
+def test_block_shapes() -> None:
+    points = np.arange(30, dtype=float).reshape(10, 3)
+    assert np.allclose(mapq_array(_norms, points, num=2, blocksize=3), _norms(points))
+    assert mapq_array(_pairs, np.arange(7), kind="thread", blocksize=2).shape == (7, 2)
+
+
+def test_into_out() -> None:
+    out = np.zeros(100, dtype=np.int64)
+    assert mapq_array(np.negative, np.arange(100), out=out, num=2) is out
+    assert out[-1] == -99
+    assert len(mapq_array(np.negative, np.arange(0), kind="thread")) == 0
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        mapq_array(np.add, np.arange(3), np.arange(4), kind="thread")
+    with pytest.raises(ValueError, match="rows"):
+        mapq_array(np.sum, np.arange(4), kind="thread")
+    with pytest.raises(ValueError, match="rows"):
+        mapq_array(np.negative, np.arange(4), out=np.zeros(3), kind="thread")
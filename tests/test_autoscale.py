@@ -0,0 +1,75 @@
+"""Test the adaptive number of workers."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from qqabc.qq import Autoscale, WorkerPool, mapq
+from qqabc.qq.autoscale import Meter
+
+
+def _wait(x: int) -> int:
+    time.sleep(0.01)
+    return x
+
+
+def _spin(x: int) -> int:
+    total = 0
+    for i in range(20_000):
+        total += i
+    return x + total - total
+
+
+@pytest.mark.parametrize("threads", [True, False])
+def test_meter(threads: bool) -> None:
+    meter = Meter(threads=threads)
+    assert isinstance(meter._totals, list) == threads  # noqa: SLF001
+    meter.record(0.5)
+    assert meter.timed(abs)(-2) == 2
+    seconds, tasks = meter.read()
+    assert tasks == 2
+    assert seconds >= 0.5
+
+
+def test_grows_for_io_bound_tasks() -> None:
+    scale = Autoscale(min_workers=1, max_workers=16, interval=0.05)
+    assert list(mapq(_wait, range(300), num=scale, kind="thread")) == list(range(300))
+    grown = [e for e in scale.events if e.reason == "busy"]
+    assert grown
+    assert grown[0].old == 1
+    assert max(e.new for e in scale.events) > 4
+    assert all(e.new <= 16 for e in scale.events)
+
+
+def test_reverts_growth_without_gain() -> None:
+    # threads running pure Python share the GIL: more of them do not help
+    scale = Autoscale(min_workers=2, max_workers=16, interval=0.05)
+    assert list(mapq(_spin, range(2000), num=scale, kind="thread")) == list(range(2000))
+    assert any(e.reason == "no gain" for e in scale.events)
+
+
+def test_pool_shrinks_when_idle() -> None:
+    scale = Autoscale(min_workers=1, max_workers=8, interval=0.05)
+    with WorkerPool(num=scale, kind="thread") as pool:
+        assert list(pool.mapq(_wait, range(200))) == list(range(200))
+        deadline = time.monotonic() + 5
+        while len(pool) > 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(pool) == 1
+    assert any(e.reason == "idle" for e in scale.events)
+
+
+def test_process_workers() -> None:
+    scale = Autoscale(min_workers=1, max_workers=2, interval=0.05)
+    assert list(mapq(_wait, range(20), num=scale)) == list(range(20))
+
+
+def test_invalid_bounds() -> None:
+    with pytest.raises(ValueError, match="min_workers"):
+        Autoscale(min_workers=0)
+    with pytest.raises(ValueError, match="max_workers"):
+        Autoscale(min_workers=4, max_workers=2)
+    with pytest.raises(ValueError, match="fixed number"):
+        list(mapq(_wait, [1], num=Autoscale(), kind="thread", scheduler="steal"))
@@ -281,6 +281,22 @@ class TestAsyncBoundedQBasic:
         assert msg.kind == "test"
         assert msg.order == 5
 
+    @pytest.mark.asyncio
+    async def test_get_nowait(self) -> None:
+        """get_nowait 取出已在 queue 中的訊息，空時拋出 QueueEmpty。"""
+        import asyncio
+
+        from qqabc.pipe.channel import AsyncBoundedQ
+
+        q: AsyncBoundedQ[str] = AsyncBoundedQ(maxsize=10, stats=True)
+        await q.put("a", order=3)
+        msg = q.get_nowait()
+        assert (msg.data, msg.order) == ("a", 3)
+        assert q.stats is not None
+        assert q.stats.gets == 1
+        with pytest.raises(asyncio.QueueEmpty):
+            q.get_nowait()
+
     @pytest.mark.asyncio
     async def test_end_and_aiter(self) -> None:
         """end() + __aiter__ 正常迭代至 END_MSG。"""
@@ -0,0 +1,72 @@
+"""Test message serializers."""
+
+from __future__ import annotations
+
+import operator
+import pickle
+
+import pytest
+
+import qqabc.qq
+from qqabc.qq.codec import DillCodec, MarshalCodec, PickleCodec, get_codec
+
+
+class Rot13Codec:
+    """A user codec: pickle, then flip every byte."""
+
+    def dumps(self, obj: object) -> bytes:
+        return bytes(b ^ 0xFF for b in pickle.dumps(obj))
+
+    def loads(self, data: bytes) -> object:
+        return pickle.loads(bytes(b ^ 0xFF for b in data))  # noqa: S301
+
+
+def worker_copy(q: qqabc.qq.Q, out: qqabc.qq.Q) -> None:
+    """Copy every message to `out`."""
+    for msg in q:
+        out.put(msg)
+
+
+def test_msg_compact_pickle() -> None:
+    """`Msg` pickles without its field names."""
+    msg = qqabc.qq.Msg(data={"a": 1}, kind="k", order=3)
+    data = pickle.dumps(msg)
+    assert b"order" not in data
+    assert pickle.loads(data) == msg  # noqa: S301
+
+
+def test_get_codec() -> None:
+    """Names resolve to codecs; objects pass through."""
+    assert isinstance(get_codec("dill"), DillCodec)
+    assert isinstance(get_codec("pickle"), PickleCodec)
+    assert isinstance(get_codec("marshal"), MarshalCodec)
+    codec = Rot13Codec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError, match="Unknown serializer"):
+        get_codec("json")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("kind", ["process", "shm"])
+@pytest.mark.parametrize("serializer", ["dill", "pickle", "marshal", Rot13Codec()])
+def test_serializers_roundtrip(kind: qqabc.qq.QueueKind, serializer: object) -> None:
+    """Messages, batches and `END_MSG` survive every serializer."""
+    q: qqabc.qq.Q = qqabc.qq.Q(kind, serializer=serializer)  # type: ignore[arg-type]
+    out: qqabc.qq.Q = qqabc.qq.Q(kind, serializer=serializer)  # type: ignore[arg-type]
+    worker = qqabc.qq.run(worker_copy, q, out)
+    q.put({"a": [1, 2]}, kind="k", order=7)
+    q.put_many([1, "two", 3.0], order=10)
+    q.stop(worker)
+
+    have = [(msg.data, msg.kind, msg.order) for msg in out.items()]
+    assert have == [
+        ({"a": [1, 2]}, "k", 7),
+        (1, "", 10),
+        ("two", "", 11),
+        (3.0, "", 12),
+    ]
+
+
+def test_mapq_serializer() -> None:
+    """`mapq` passes the serializer to its queues."""
+    have = list(qqabc.qq.mapq(operator.add, range(10), range(10), serializer="pickle"))
+    assert have == [i * 2 for i in range(10)]
@@ -0,0 +1,116 @@
+"""Test the durable `"disk"` queue."""
+
+from __future__ import annotations
+
+from queue import Empty, Full
+from typing import TYPE_CHECKING
+
+import pytest
+
+from qqabc.qq import END_MSG, Msg, Q, mapq
+from qqabc.qq.disk import DiskQueue
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_fifo_and_end(tmp_path: Path) -> None:
+    q: Q[int] = Q("disk", path=tmp_path)
+    q.put_many(range(5))
+    assert [msg.data for msg in q.end()] == list(range(5))
+
+
+def test_marshal_round_trip(tmp_path: Path) -> None:
+    """`Msg` 以元组写盘, 故 marshal 可用, 重启后也能重放。"""
+    q: Q[object] = Q("disk", path=tmp_path, serializer="marshal", stats=True)
+    items = [1, "a", (2.5, None), {"k": [b"v"]}]
+    q.put_many(items)
+    assert [msg.data for msg in q.get_many(2)] == items[:2]
+    q._q.close()  # noqa: SLF001
+
+    again: Q[object] = Q("disk", path=tmp_path, serializer="marshal")
+    assert [msg.data for msg in again.end()] == items
+
+
+def test_spills_beyond_memory(tmp_path: Path) -> None:
+    dq = DiskQueue(tmp_path, memory_items=4, segment_bytes=256)
+    for i in range(100):
+        dq.put(Msg(i, order=i))
+    assert dq.qsize() == 100
+    assert len(dq._head) == 4  # noqa: SLF001
+    assert len(list(tmp_path.glob("*.seg"))) > 1
+
+    got = []
+    for _ in range(100):
+        msg = dq.get()
+        got.append(msg.data)
+        msg.release()
+    assert got == list(range(100))
+    assert len(list(tmp_path.glob("*.seg"))) == 1, "acked segments are deleted"
+    dq.close()
+
+
+def test_replays_unacknowledged(tmp_path: Path) -> None:
+    dq = DiskQueue(tmp_path, memory_items=2, segment_bytes=128)
+    for i in range(10):
+        dq.put(Msg(i))
+    done = [dq.get() for _ in range(3)]
+    done[0].release()
+    done[2].release()  # 1 was read but never finished
+    dq.close()
+
+    again = DiskQueue(tmp_path, memory_items=2)
+    assert again.qsize() == 8
+    assert [again.get().data for _ in range(8)] == [1, *range(3, 10)]
+    with pytest.raises(Empty):
+        again.get(timeout=0.01)
+    again.close()
+
+
+def test_torn_tail_is_ignored(tmp_path: Path) -> None:
+    dq = DiskQueue(tmp_path)
+    dq.put(Msg("a"))
+    dq.put(Msg("b"))
+    dq.close()
+    (seg,) = tmp_path.glob("*.seg")
+    seg.write_bytes(seg.read_bytes()[:-3])
+
+    again = DiskQueue(tmp_path)
+    assert again.get().data == "a"
+    assert again.empty()
+    again.close()
+
+
+def test_end_is_not_replayed(tmp_path: Path) -> None:
+    q: Q[int] = Q("disk", path=tmp_path, fsync="always")
+    q.put(1).end()
+    assert q.get().data == 1  # not released
+    assert q.get().kind == END_MSG.kind
+    q.close()
+
+    again: Q[int] = Q("disk", path=tmp_path)
+    assert again.get().data == 1
+    assert again.empty()
+
+
+def test_maxsize_and_temporary_dir() -> None:
+    dq = DiskQueue(maxsize=1)
+    path = dq.path
+    dq.put(Msg(1))
+    with pytest.raises(Full):
+        dq.put(Msg(2), timeout=0.01)
+    dq.close()
+    assert not path.exists()
+
+    with pytest.raises(ValueError, match="fsync"):
+        DiskQueue(fsync="sometimes")  # type: ignore[arg-type]
+
+
+def _double(x: int) -> int:
+    return 2 * x
+
+
+def test_mapq_disk_kind() -> None:
+    assert list(mapq(_double, range(20), num=3, kind="disk")) == [
+        2 * x for x in range(20)
+    ]
@@ -96,3 +96,37 @@ def test_sortiter_gap() -> None:
 
     have = [msg.order for msg in q.end().sorted()]
     assert want == have, "expected ids in order"
+
+
+def test_sortiter_window() -> None:
+    """A full window skips the gap instead of buffering forever."""
+    q = qqabc.qq.Q("thread")
+    for o in [1, 2, 3, 4, 0]:
+        q.put(None, order=o)
+
+    have = [msg.order for msg in q.end().sorted(window=2)]
+    assert have == [1, 2, 3, 4, 0], "expected the late message after the skip"
+
+
+def test_sortiter_gap_timeout() -> None:
+    """A gap that outlives the timeout is skipped while the queue stays open."""
+    q = qqabc.qq.Q("thread")
+    for o in [0, 2, 3]:
+        q.put(None, order=o)
+
+    it = q.sorted(gap_timeout=0.05)
+    have = [next(it).order for _ in range(3)]
+    assert have == [0, 2, 3], "expected order 1 to be skipped"
+
+    q.put(None, order=1).put(None, order=4).end()
+    assert [msg.order for msg in it] == [1, 4]
+
+
+def test_sortiter_duplicates() -> None:
+    """Messages with equal orders keep their arrival order."""
+    q = qqabc.qq.Q("thread")
+    for o, data in [(1, "a"), (1, "b"), (0, "c")]:
+        q.put(data, order=o)
+
+    have = [msg.data for msg in q.end().sorted()]
+    assert have == ["c", "a", "b"]
@@ -0,0 +1,52 @@
+"""Test that importing qqabc does not load heavy dependencies."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = (
+    "multiprocess",
+    "dill",
+    "asyncio",
+    "socket",
+    "httpx",
+    "urllib.request",
+    "numpy",
+    "qqabc.qq.server",
+    "qqabc.qq.remote",
+)
+
+
+def _loaded_after(code: str) -> set[str]:
+    """Heavy modules in `sys.modules` after running `code` in a new interpreter."""
+    probe = (
+        f"{code}\nimport sys\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    return set(out.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["qqabc", "qqabc.qq", "qqabc.rurl", "qqabc.pipe", "qqabc.pipe.channel"],
+)
+def test_import_is_light(module: str) -> None:
+    assert _loaded_after(f"import {module}") == set()
+
+
+def test_thread_queue_stays_light() -> None:
+    code = "from qqabc.qq import Q, mapq\nq = Q('thread').put(1)\nlist(mapq(abs, [-1], kind='thread'))"
+    assert _loaded_after(code) == set()
+
+
+def test_loaded_on_first_use() -> None:
+    assert "multiprocess" in _loaded_after("import qqabc.qq\nqqabc.qq.Q('process')")
+    assert "asyncio" in _loaded_after("from qqabc.pipe import Pipeline")
+    assert _loaded_after("from qqabc.qq import Autoscale, WorkerPool") == set()
+    remote = _loaded_after("from qqabc.qq.server import QueueServer")
+    assert {"asyncio", "socket", "qqabc.qq.server"} <= remote
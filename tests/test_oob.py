@@ -0,0 +1,151 @@
+"""Test out-of-band transfer of large buffers through shared memory."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import qqabc.qq
+from qqabc.qq.oob import OutOfBand, _Segment
+
+BIG = 1 << 16
+
+
+def worker_echo(q: qqabc.qq.Q[bytes], out: qqabc.qq.Q[object]) -> None:
+    """Report the type, size and checksum of every payload."""
+    for msg in q:
+        view = msg.data
+        out.put((type(view).__name__, len(view), sum(view[::4096])))
+        del view
+        msg.release()
+
+
+def test_small_payload_in_band() -> None:
+    """Payloads below the threshold are queued as usual."""
+    assert OutOfBand.pack(b"x" * 10, threshold=BIG) is None
+    assert OutOfBand.pack(lambda: 1, threshold=1) is None, "unpicklable falls back"
+
+    q: qqabc.qq.Q[bytes] = qqabc.qq.Q(oob_threshold=BIG)
+    q.put(b"small")
+    msg = q.get()
+    assert msg.data == b"small"
+    msg.release()  # no-op
+
+
+def test_bytes_out_of_band() -> None:
+    """Large bytes arrive as a memoryview into shared memory."""
+    payload = bytes(range(256)) * (BIG // 256)
+    q: qqabc.qq.Q[bytes] = qqabc.qq.Q(oob_threshold=BIG)
+    q.put(payload, kind="img", order=4)
+
+    msg = q.get()
+    assert isinstance(msg.data, memoryview)
+    assert (msg.kind, msg.order) == ("img", 4)
+    assert bytes(msg.data) == payload
+
+    name = msg.__dict__["_segment"].name
+    msg.data.release()
+    msg.release()
+    with pytest.raises(FileNotFoundError):
+        _Segment(name=name)
+
+
+def test_marshal_rejected() -> None:
+    """Marshal cannot write the handle, so the combination is refused up front."""
+    with pytest.raises(ValueError, match="marshal"):
+        qqabc.qq.Q(oob_threshold=BIG, serializer="marshal")
+    q: qqabc.qq.Q[bytes] = qqabc.qq.Q(oob_threshold=BIG, serializer="pickle")
+    q.put(b"x" * BIG)
+    msg = q.get()
+    assert bytes(msg.data) == b"x" * BIG
+    msg.release()
+
+
+def test_tuple_of_bytes() -> None:
+    """Large bytes inside a top-level tuple also go out-of-band."""
+    handle = OutOfBand.pack((1, b"a" * BIG, b"b"), threshold=BIG)
+    assert handle is not None
+    data, segment = handle.load()
+    assert data[0] == 1
+    assert bytes(data[1]) == b"a" * BIG
+    assert data[2] == b"b"
+    del data
+    segment.release()
+
+
+def test_process_workers() -> None:
+    """Process workers read views and release them."""
+    q: qqabc.qq.Q[bytes] = qqabc.qq.Q(oob_threshold=BIG)
+    out: qqabc.qq.Q[object] = qqabc.qq.Q()
+    workers = [qqabc.qq.run(worker_echo, q, out) for _ in range(2)]
+    q.put_many([b"\x01" * BIG * 4] * 6)
+    q.stop(workers)
+
+    have = [msg.data for msg in out.items()]
+    assert have == [("memoryview", BIG * 4, BIG * 4 // 4096)] * 6
+
+
+def test_numpy_out_of_band() -> None:
+    """NumPy arrays are rebuilt as views without another copy."""
+    np = pytest.importorskip("numpy")
+    arr = np.arange(BIG, dtype=np.int64)
+    handle = OutOfBand.pack({"image": arr}, threshold=BIG)
+    assert handle is not None
+    data, segment = handle.load()
+    assert np.array_equal(data["image"], arr)
+    assert not data["image"].flags.owndata
+    del data
+    segment.release()
+
+
+def _nbytes(view: memoryview) -> int:
+    return view.nbytes
+
+
+def test_mapq_oob() -> None:
+    """`mapq` moves large arguments through shared memory."""
+    payloads = [bytes([i]) * BIG for i in range(4)]
+    have = list(qqabc.qq.mapq(_nbytes, payloads, num=2, oob_threshold=BIG))
+    assert have == [BIG] * 4
+
+
+def test_read_after_writer_exits() -> None:
+    """Segments outlive the process that wrote them until the reader releases them.
+
+    Runs in a new interpreter so that no resource tracker is shared with the
+    writer (as happens when it starts before the workers are forked).
+    """
+    script = textwrap.dedent(
+        """
+        import time
+        import qqabc.qq
+
+        def produce(q):
+            q.put(bytes(200_000))
+            q.end()
+
+        q = qqabc.qq.Q("process", oob_threshold=1024)
+        qqabc.qq.run(produce, q).join()
+        time.sleep(0.2)
+        (msg,) = q
+        print(len(msg.data))
+        msg.release()
+
+        def big(i):
+            return bytes(200_000)
+
+        sizes = []
+        for data in qqabc.qq.mapq(big, range(8), num=2, oob_threshold=1024):
+            time.sleep(0.05)
+            sizes.append(len(data))
+        print(sum(sizes))
+        """
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.split() == ["200000", "1600000"]
+    assert "resource_tracker" not in out.stderr
@@ -7,16 +7,28 @@
 - 背壓行為
 - async stage
 - 混合 executor（thread + async）
+- process stage 在子行程中執行
+- 批次 stage（batch_size / max_batch_latency）
+- 依輸入順序輸出（ordered / reorder_window）
+- 相鄰 stage 的合併（fuse）
+- worker 直接讀取 stage 的輸入 queue（END_MSG 傳遞）
+- 失敗 item 的丟棄，與無法送出的結果（StageError）
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
 import sys
+import threading
 import time
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 pytestmark = pytest.mark.skipif(
     sys.version_info < (3, 10),
     reason="qqabc.pipe requires Python 3.10+",
@@ -312,6 +324,459 @@ class TestPipelineMixed:
         assert sorted(result) == list(range(20))
 
 
+# === Process stage ===
+
+
+class TestPipelineProcess:
+    """executor="process" 的 stage 在子行程中執行。"""
+
+    def test_runs_in_child_processes(self) -> None:
+        """每個 item 都在 pipeline 之外的行程處理。"""
+        from qqabc.pipe import Stage, pipe
+
+        result = list(
+            pipe(
+                [Stage(fn=lambda x: (x, os.getpid()), executor="process")],
+                input=range(20),
+            )
+        )
+        assert sorted(x for x, _ in result) == list(range(20))
+        assert os.getpid() not in {pid for _, pid in result}
+
+    def test_process_stages_in_a_row(self) -> None:
+        """Process → Process，多個 worker 也不會遺失 END_MSG 之前的結果。"""
+        from qqabc.pipe import Stage, pipe
+
+        result = list(
+            pipe(
+                [
+                    Stage(fn=lambda x: x + 1, executor="process", concurrency=3),
+                    Stage(fn=lambda x: x * 2, executor="process", concurrency=3),
+                ],
+                input=range(200),
+            )
+        )
+        assert sorted(result) == [(x + 1) * 2 for x in range(200)]
+
+    def test_mixed_with_backpressure(self) -> None:
+        """Thread → Process → Async，跨行程的背壓。"""
+        from qqabc.pipe import Stage, pipe
+
+        async def async_neg(x: int) -> int:
+            return -x
+
+        result = list(
+            pipe(
+                [
+                    Stage(fn=lambda x: x + 1),
+                    Stage(fn=lambda x: x * 10, executor="process", concurrency=2),
+                    Stage(fn=async_neg),
+                ],
+                input=range(100),
+                backpressure=2,
+            )
+        )
+        assert sorted(result) == sorted(-(x + 1) * 10 for x in range(100))
+
+    def test_item_larger_than_ring(self) -> None:
+        """超過 SHM_CAPACITY 的 item 也能進出 process stage。"""
+        from qqabc.pipe import Stage, pipe
+        from qqabc.qq.shm import SHM_CAPACITY
+
+        big = b"x" * (SHM_CAPACITY + (1 << 20))
+        result = list(
+            pipe(
+                [Stage(fn=lambda b: b + b"y", executor="process")],
+                input=[b"a", big, b"b"],
+                ordered=True,
+            )
+        )
+        assert result == [b"ay", big + b"y", b"by"]
+
+
+# === 批次 stage ===
+
+
+class TestPipelineBatching:
+    """batch_size 設定後 fn 收到 list，結果沿用各 item 的 order。"""
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_batches_keep_order(self, executor: str) -> None:
+        """每批不超過 batch_size，結果的 order 對應原本的 item。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        def double_all(xs: list[int]) -> list[tuple[int, int]]:
+            assert 1 <= len(xs) <= 8
+            return [(x * 2, len(xs)) for x in xs]
+
+        stage = Stage(
+            fn=double_all,
+            executor=executor,  # type: ignore[arg-type]
+            batch_size=8,
+            max_batch_latency=0.01,
+        )
+        with Pipeline([stage]) as p:
+            p.submit_many(range(100))
+        msgs = list(p._queues[-1])  # noqa: SLF001
+        assert sorted(m.data[0] for m in msgs) == [x * 2 for x in range(100)]
+        assert all(m.data[0] == m.order * 2 for m in msgs)
+
+    def test_latency_fills_batches(self) -> None:
+        """等待時間內送達的 item 會併成同一批。"""
+        from qqabc.pipe import Stage, pipe
+
+        sizes: list[int] = []
+
+        def record(xs: list[int]) -> list[int]:
+            sizes.append(len(xs))
+            return xs
+
+        def slow_input() -> Iterator[int]:
+            for i in range(10):
+                time.sleep(0.005)
+                yield i
+
+        stage = Stage(fn=record, concurrency=1, batch_size=10, max_batch_latency=5)
+        assert sorted(pipe([stage], input=slow_input())) == list(range(10))
+        assert sizes == [10]
+
+    def test_async_batches(self) -> None:
+        """Async stage 也支援批次。"""
+        from qqabc.pipe import Stage, pipe
+
+        async def inc_all(xs: list[int]) -> list[int]:
+            await asyncio.sleep(0.001)
+            return [x + 1 for x in xs]
+
+        stage = Stage(fn=inc_all, batch_size=16, max_batch_latency=0.01)
+        assert sorted(pipe([stage], input=range(100))) == list(range(1, 101))
+
+    def test_async_zero_latency_drains_queue(self) -> None:
+        """``max_batch_latency=0`` 不等待，但已在 queue 中的 item 仍湊成一批。"""
+        from qqabc.pipe import Stage, pipe
+
+        sizes: list[int] = []
+
+        async def slow(xs: list[int]) -> list[int]:
+            sizes.append(len(xs))
+            await asyncio.sleep(0.05)
+            return xs
+
+        stage = Stage(fn=slow, concurrency=1, batch_size=16, max_batch_latency=0)
+        assert sorted(pipe([stage], input=range(20))) == list(range(20))
+        assert max(sizes) > 1
+
+    def test_batch_then_item_stage(self) -> None:
+        """批次 stage 之後接一般 stage。"""
+        from qqabc.pipe import Stage, pipe
+
+        result = pipe(
+            [
+                Stage(fn=lambda xs: [x + 1 for x in xs], batch_size=4),
+                Stage(fn=lambda x: x * 10),
+            ],
+            input=range(10),
+        )
+        assert sorted(result) == [(x + 1) * 10 for x in range(10)]
+
+
+# === 依輸入順序輸出 ===
+
+
+class TestPipelineOrdered:
+    """ordered=True 時結果依 submit 順序輸出，且重排緩衝有上限。"""
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_results_in_input_order(self, executor: str) -> None:
+        """不同完成時間的 item 仍按輸入順序輸出。"""
+        from qqabc.pipe import Stage, pipe
+
+        def jitter(x: int) -> int:
+            time.sleep((x * 7919 % 10) / 2000)
+            return x
+
+        result = pipe(
+            [
+                Stage(fn=jitter, executor=executor, concurrency=4),  # type: ignore[arg-type]
+                Stage(fn=lambda x: x * 2, concurrency=3),
+            ],
+            input=range(60),
+            ordered=True,
+            reorder_window=8,
+        )
+        assert list(result) == [x * 2 for x in range(60)]
+
+    def test_straggler_bounds_in_flight_items(self) -> None:
+        """落後的 item 讓 submit 阻塞，同時處理的 item 不超過 window。"""
+        from qqabc.pipe import Stage, pipe
+
+        started: list[int] = []
+        in_flight_at_release: list[int] = []
+
+        def slow_first(x: int) -> int:
+            started.append(x)
+            if x == 0:
+                time.sleep(0.2)
+                in_flight_at_release.append(len(started))
+            return x
+
+        result = pipe(
+            [Stage(fn=slow_first, concurrency=8)],
+            input=range(30),
+            ordered=True,
+            reorder_window=4,
+        )
+        assert list(result) == list(range(30))
+        assert in_flight_at_release == [4]
+
+    def test_async_and_batch_stages(self) -> None:
+        """Async 與批次 stage 也保持輸入順序。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        async def shuffle(x: int) -> int:
+            await asyncio.sleep((x % 5) / 1000)
+            return x
+
+        stages = [
+            Stage(fn=shuffle, concurrency=10),
+            Stage(fn=lambda xs: [x + 1 for x in xs], batch_size=3, concurrency=2),
+        ]
+        with Pipeline(stages, ordered=True) as p:
+            p.submit_many(range(40))
+        assert list(p.results()) == list(range(1, 41))
+
+    def test_submit_beyond_window_raises(self) -> None:
+        """沒有同時消費結果時，submit 超過 window 會 raise 而非 deadlock。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        with Pipeline([Stage(fn=lambda x: x)], ordered=True, reorder_window=4) as p:
+            p.submit_many(range(4))
+            with pytest.raises(RuntimeError, match="reorder_window=4"):
+                p.submit(4)
+        assert list(p.results()) == list(range(4))
+
+    def test_invalid_window(self) -> None:
+        """reorder_window 必須 >= 1。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        with pytest.raises(ValueError, match="reorder_window"):
+            Pipeline([Stage(fn=lambda x: x)], ordered=True, reorder_window=0)
+
+
+# === 相鄰 stage 的合併 ===
+
+
+class TestPipelineFusion:
+    """fuse=True 時合併相鄰 stage，結果不變；預設不合併。"""
+
+    def test_fuse_true(self) -> None:
+        """相鄰的 thread stage 合併為一個 worker。"""
+        from qqabc.pipe import FusedStage, Pipeline, Stage
+
+        stages = [
+            Stage(fn=str.strip, name="parse"),
+            Stage(fn=int, name="validate"),
+            Stage(fn=lambda x: x * 2, name="normalize"),
+        ]
+        p = Pipeline(stages, fuse=True)
+        (fused,) = p.stages
+        assert isinstance(fused, FusedStage)
+        assert fused.name == "parse+validate+normalize"
+        assert sorted(p.run([" 1", "2 ", " 3 "])) == [2, 4, 6]
+
+    def test_not_fused_by_default(self) -> None:
+        """預設保留原本的 stage，名稱與 StageError.stage 不變。"""
+        from qqabc.pipe import Pipeline, Stage, StageError, pipe
+
+        stages = [
+            Stage(fn=lambda x: x + 1, name="inc"),
+            Stage(fn=lambda x: x * 2, name="double"),
+        ]
+        p = Pipeline(stages)
+        assert p.stages == stages
+        assert [s.name for s in p.stages] == ["inc", "double"]
+        assert sorted(p.run(range(5))) == [(x + 1) * 2 for x in range(5)]
+
+        unsendable = [
+            Stage(fn=abs, executor="process", name="abs"),
+            Stage(fn=lambda x: (i for i in range(x)), executor="process", name="gen"),
+        ]
+        with pytest.raises(StageError) as info:
+            list(pipe(unsendable, input=[1]))
+        assert info.value.stage == "gen"
+
+    def test_fuse_false(self) -> None:
+        """fuse=False 保留原本的 stage。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        stages = [Stage(fn=lambda x: x + 1), Stage(fn=lambda x: x * 2)]
+        p = Pipeline(stages, fuse=False)
+        assert p.stages == stages
+        assert sorted(p.run(range(5))) == [(x + 1) * 2 for x in range(5)]
+
+    def test_fused_process_stages(self) -> None:
+        """相鄰的 process stage 合併後在同一個子行程中執行。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        p = Pipeline(
+            [
+                Stage(fn=lambda x: (x, os.getpid()), executor="process"),
+                Stage(fn=lambda t: t[1] == os.getpid(), executor="process"),
+            ],
+            ordered=True,
+            fuse=True,
+        )
+        assert len(p.stages) == 1
+        assert list(p.run(range(20))) == [True] * 20
+
+    def test_io_bound_throughput_kept(self) -> None:
+        """合併不降低 I/O-bound stage 的吞吐量（worker 數為 concurrency 總和）。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        def sleepy(x: int) -> int:
+            time.sleep(0.05)
+            return x
+
+        def elapsed(*, fuse: bool) -> float:
+            p = Pipeline([Stage(fn=sleepy), Stage(fn=sleepy)], fuse=fuse)
+            start = time.perf_counter()
+            assert sorted(p.run(range(32))) == list(range(32))
+            return time.perf_counter() - start
+
+        unfused = elapsed(fuse=False)
+        assert elapsed(fuse=True) < unfused * 1.3
+
+
+# === worker 直接讀取 stage 的輸入 queue ===
+
+
+class TestPipelineEndOfStream:
+    """同一 stage 的 worker 共用輸入 queue，單一 END_MSG 讓全部 worker 結束。"""
+
+    def test_no_feeder_threads(self) -> None:
+        """每個 stage 只啟動 concurrency 個 worker。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        p = Pipeline(
+            [Stage(fn=abs, concurrency=3), Stage(fn=abs, concurrency=2)], fuse=False
+        )
+        assert sorted(p.run(range(-5, 0))) == [1, 2, 3, 4, 5]
+        assert len(p._workers) == 5  # noqa: SLF001
+
+    def test_workers_stop_on_released_queue(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """結果未取完時 shm queue 被釋放（如直譯器結束），thread worker 安靜結束。"""
+        from qqabc.pipe import Pipeline, Stage
+
+        def slow(x: int) -> int:
+            time.sleep(0.01)
+            return x
+
+        errors: list[Any] = []
+        monkeypatch.setattr(threading, "excepthook", errors.append)
+        p = Pipeline([Stage(fn=slow, concurrency=4), Stage(fn=abs, executor="process")])
+        p.submit_many(range(100))
+        p.close()
+        p._queues[1]._q._finalizer()  # noqa: SLF001
+        threads = [w for w in p._workers if isinstance(w, threading.Thread)]  # noqa: SLF001
+        for t in threads:
+            t.join(timeout=10)
+        assert not any(t.is_alive() for t in threads)
+        assert errors == []
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    @pytest.mark.parametrize("n", [0, 1, 2, 50])
+    def test_more_workers_than_items(self, executor: str, n: int) -> None:
+        """Item 數少於 worker 數（包含沒有 item）時仍正常結束。"""
+        from qqabc.pipe import Stage, pipe
+
+        result = pipe(
+            [
+                Stage(fn=lambda x: x + 1, executor=executor, concurrency=8),  # type: ignore[arg-type]
+                Stage(fn=lambda xs: [x * 2 for x in xs], concurrency=5, batch_size=3),
+            ],
+            input=range(n),
+            backpressure=1,
+        )
+        assert sorted(result) == [(x + 1) * 2 for x in range(n)]
+
+
+# === 錯誤處理 ===
+
+
+def _fail_on_3(x: int) -> int:
+    if x == 3:
+        msg = f"bad item {x}"
+        raise ValueError(msg)
+    return x
+
+
+class TestPipelineErrors:
+    """fn 拋出例外的 item 被丟棄；無法送出的結果由 results() 拋出 StageError。"""
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_failed_item_dropped(self, executor: str) -> None:
+        """與 async stage 相同，失敗的 item 被丟棄，worker 繼續處理。"""
+        from qqabc.pipe import Stage, pipe
+
+        stages = [
+            Stage(fn=_fail_on_3, executor=executor, concurrency=2),  # type: ignore[arg-type]
+            Stage(fn=lambda x: x * 2),
+        ]
+        result = list(pipe(stages, input=range(10), fuse=False))
+        assert sorted(result) == [x * 2 for x in range(10) if x != 3]
+
+    def test_failed_batch_dropped(self) -> None:
+        """批次 fn 拋出例外時，整批 item 被丟棄。"""
+        from qqabc.pipe import Stage, pipe
+
+        batch = Stage(fn=lambda xs: [_fail_on_3(x) for x in xs], batch_size=4)
+        result = list(pipe([batch], input=range(10), ordered=True))
+        dropped = set(range(10)) - set(result)
+        assert 3 in dropped
+        assert len(dropped) <= 4
+        assert result == sorted(result)
+
+    def test_ordered_window_released(self) -> None:
+        """丟棄的 item 仍歸還 reorder window，submit 不會卡住。"""
+        from qqabc.pipe import Stage, pipe
+
+        result = pipe(
+            [Stage(fn=_fail_on_3, concurrency=1)],
+            input=[3] * 20 + [1],
+            ordered=True,
+            reorder_window=2,
+        )
+        assert list(result) == [1]
+
+    @pytest.mark.parametrize("executor", ["thread", "async"])
+    def test_unsendable_result_raises(self, executor: str) -> None:
+        """結果無法送往 process stage 時，results() 拋出 StageError。"""
+        from qqabc.pipe import Stage, StageError, pipe
+
+        async def agen(x: int) -> object:
+            return (x for _ in ())
+
+        fn = agen if executor == "async" else (lambda x: (x for _ in ()))
+        stages = [
+            Stage(fn=fn, executor=executor, name="gen"),  # type: ignore[arg-type]
+            Stage(fn=lambda g: g, executor="process"),
+        ]
+        with pytest.raises(StageError, match="gen") as info:
+            list(pipe(stages, input=range(3)))
+        assert info.value.stage == "gen"
+        assert isinstance(info.value.__cause__, TypeError)
+
+    def test_unsendable_process_result(self) -> None:
+        """Process stage 無法送出的結果也轉為 StageError。"""
+        from qqabc.pipe import Stage, StageError, pipe
+
+        stage = Stage(fn=lambda x: (x for _ in ()), executor="process", name="gen")
+        with pytest.raises(StageError, match="gen"):
+            list(pipe([stage], input=range(3)))
+
+
 # === 邊界情況 ===
 
 
@@ -0,0 +1,114 @@
+"""Test the persistent worker pool."""
+
+from __future__ import annotations
+
+import operator
+import os
+import threading
+from concurrent.futures import Future
+from pickle import PicklingError
+from typing import Iterator
+
+import pytest
+
+import qqabc.qq
+from qqabc.qq import WorkerPool
+
+
+def pid(_: int) -> int:
+    """Return the id of the process running the call."""
+    return os.getpid()
+
+
+def fail(x: int) -> int:
+    """Raise for odd numbers."""
+    if x % 2:
+        raise ValueError(x)
+    return x
+
+
+def test_pool_reuses_processes() -> None:
+    """Consecutive calls run on the same warm processes."""
+    with WorkerPool(num=2) as pool:
+        first = set(pool.mapq(pid, range(20)))
+        second = set(pool.mapq(pid, range(20)))
+        assert len(pool) == 2
+    assert first | second <= {w.pid for w in pool._workers}  # noqa: SLF001
+    assert os.getpid() not in first
+
+
+def test_pool_mapq_order() -> None:
+    """Results are yielded in input order, streaming or not."""
+    want = [a + b for a, b in zip(range(100), range(100, 0, -1))]
+    with WorkerPool(num=3, kind="thread") as pool:
+        assert list(pool.mapq(operator.add, range(100), range(100, 0, -1))) == want
+        have = list(
+            pool.mapq(operator.add, range(100), range(100, 0, -1), max_pending=4)
+        )
+        assert have == want
+
+
+def test_pool_submit() -> None:
+    """`submit` returns a future with the result or the exception."""
+    with WorkerPool(num=2) as pool:
+        ok = pool.submit(operator.mul, 6, 7)
+        err = pool.submit(fail, 1)
+        assert isinstance(ok, Future)
+        assert ok.result(timeout=5) == 42
+        with pytest.raises(ValueError, match="1"):
+            err.result(timeout=5)
+
+
+def numbers(n: int) -> Iterator[int]:
+    """Return a generator, which cannot be pickled."""
+    return (i for i in range(n))
+
+
+def fail_with_generator(_: int) -> int:
+    """Raise an exception that cannot be pickled."""
+    raise ValueError(i for i in range(3))
+
+
+def test_pool_unpicklable_result() -> None:
+    """A result or error that cannot be sent back fails the call instead of hanging."""
+    with WorkerPool(num=1) as pool:
+        with pytest.raises(PicklingError, match="generator"):
+            pool.submit(numbers, 0).result(timeout=5)
+        with pytest.raises(PicklingError, match="ValueError"):
+            pool.submit(fail_with_generator, 0).result(timeout=5)
+        assert pool.submit(operator.mul, 6, 7).result(timeout=5) == 42
+
+
+def test_pool_mapq_error() -> None:
+    """The first failing call is raised in input order; the pool survives."""
+    with WorkerPool(num=2, kind="thread") as pool:
+        results = pool.mapq(fail, [0, 2, 3, 4])
+        assert next(results) == 0
+        assert next(results) == 2
+        with pytest.raises(ValueError, match="3"):
+            next(results)
+        assert list(pool.mapq(fail, [0, 2])) == [0, 2]
+
+
+def test_pool_initializer() -> None:
+    """The initializer runs exactly once per worker."""
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def init(tag: str) -> None:
+        with lock:
+            calls.append(tag)
+
+    with WorkerPool(num=3, kind="thread", initializer=init, initargs=("x",)) as pool:
+        list(pool.mapq(abs, range(30)))
+        list(pool.mapq(abs, range(30)))
+    assert calls == ["x"] * 3
+
+
+def test_pool_closed() -> None:
+    """A closed pool rejects new work."""
+    pool = qqabc.qq.WorkerPool(num=1, kind="thread")
+    pool.close()
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit(abs, 1)
@@ -0,0 +1,66 @@
+"""Test priority queues."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from qqabc.qq import END_MSG, Msg, Q, run, run_thread
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_lowest_order_first(kind: str) -> None:
+    q: Q[str] = Q(kind, priority=True)
+    q.put("bulk", order=9)
+    q.put("urgent", order=0)
+    q.put("normal", order=5)
+    assert [msg.data for msg in q.end()] == ["urgent", "normal", "bulk"]
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_stable_within_priority(kind: str) -> None:
+    q: Q[int] = Q(kind, priority=True)
+    for i in range(10):
+        q.put(i, order=i % 2)
+    assert [msg.data for msg in q.end()] == [0, 2, 4, 6, 8, 1, 3, 5, 7, 9]
+
+
+def test_end_after_everything() -> None:
+    q: Q[int] = Q("thread", priority=True)
+    q.end()
+    q.put(1, order=99)
+    assert q.get().data == 1
+    assert q.get().kind == END_MSG.kind
+
+
+def test_put_many_ranks_each_message() -> None:
+    q: Q[str] = Q("thread", priority=True)
+    q.put_many([Msg("b", order=2), Msg("a", order=1), Msg("c", order=3)])
+    assert [msg.data for msg in q.end()] == ["a", "b", "c"]
+
+
+def _serve(q: Q[int], out: Q[int]) -> None:
+    for msg in q:
+        out.put(msg.data)
+
+
+@pytest.mark.parametrize(("kind", "start"), [("thread", run_thread), ("process", run)])
+def test_worker_drains_before_stop(kind: str, start: object) -> None:
+    q: Q[int] = Q(kind, priority=True)
+    out: Q[int] = Q(kind)
+    for i in range(5):
+        q.put(i, order=5 - i)
+    q.stop([start(_serve, q, out)])  # type: ignore[operator]
+    assert [msg.data for msg in out.end()] == [4, 3, 2, 1, 0]
+
+
+def test_process_priority_pickles() -> None:
+    q: Q[int] = Q("process", priority=True)
+    q.put(1)
+    assert pickle.loads(pickle.dumps(q._q)).get().data == 1  # noqa: S301, SLF001
+
+
+def test_unsupported_kind() -> None:
+    with pytest.raises(ValueError, match="priority"):
+        Q("shm", priority=True)
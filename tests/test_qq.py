@@ -13,8 +13,12 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 """Test qqabc.msgq functions."""
 
 # std
+import itertools
 import operator
-from typing import Callable
+from typing import Callable, Iterator
+
+# lib
+import pytest
 
 # pkg
 import qqabc.qq
@@ -113,3 +117,219 @@ def test_map() -> None:
 
     have = list(qqabc.qq.mapq(operator.add, left, right, kind="thread"))
     assert have == want, "expected threads to work"
+
+
+# batched messages #
+
+
+def test_put_many_get_many() -> None:
+    """Batches are unpacked transparently and keep their order."""
+    for kind in ("thread", "process"):
+        q = qqabc.qq.Q(kind)
+        q.put_many(range(10), batch_size=4)
+        q.put(qqabc.qq.Msg(data="x", order=99))
+        q.end()
+
+        first = q.get_many(3)
+        assert [msg.data for msg in first] == [0, 1, 2], f"expected prefix ({kind})"
+
+        rest = [msg for batch in q.iter_batches(max_items=5) for msg in batch]
+        assert [msg.data for msg in rest] == [*range(3, 10), "x"]
+        assert [msg.order for msg in rest] == [*range(3, 10), 99]
+
+
+def test_put_many_mixed_msgs() -> None:
+    """`Msg` items are sent unchanged, other data gets consecutive orders."""
+    q = qqabc.qq.Q("thread")
+    q.put_many(["a", qqabc.qq.Msg(data="b", kind="k", order=7), "c"], order=5)
+
+    have = [(msg.data, msg.kind, msg.order) for msg in q.items()]
+    assert have == [("a", "", 5), ("b", "k", 7), ("c", "", 7)]
+
+
+def test_get_many_stops_at_end() -> None:
+    """`END_MSG` terminates a batch even when more messages follow."""
+    q = qqabc.qq.Q("thread")
+    q.put(1).end().put(2)
+
+    have = q.get_many(10)
+    assert [msg.kind for msg in have] == ["", qqabc.qq.END_MSG.kind]
+    assert q.get().data == 2, "expected messages after END_MSG to remain"
+
+
+def test_put_many_workers() -> None:
+    """Workers reading one message at a time see every batched message."""
+    n_msg = 1000
+
+    q, out = qqabc.qq.Q(), qqabc.qq.Q()
+    workers = [qqabc.qq.run(worker_sum, q, out, num=i) for i in range(2)]
+    q.put_many(range(n_msg), batch_size=64)
+    q.stop(workers)
+
+    have = sum(msg.data[1] for msg in out.items())
+    assert have == sum(range(n_msg)), "expected every message to be consumed"
+
+
+def square(x: int) -> int:
+    """Return the square of a number."""
+    return x * x
+
+
+def test_map_streaming() -> None:
+    """Streaming `mapq` reads lazily and keeps results in order."""
+
+    def numbers(consumed: list) -> Iterator[int]:
+        for i in itertools.count():
+            consumed.append(i)
+            yield i
+
+    for kind in ("thread", "process"):
+        consumed: list = []
+        results = qqabc.qq.mapq(
+            square, numbers(consumed), num=2, kind=kind, max_pending=4
+        )
+        assert next(results) == 0
+        assert len(consumed) <= 5, f"expected lazy reads ({kind})"
+
+        have = list(itertools.islice(results, 99))
+        assert have == [i * i for i in range(1, 100)]
+        assert len(consumed) <= 104, f"expected bounded reads ({kind})"
+        results.close()
+
+
+def test_map_streaming_finite() -> None:
+    """Streaming `mapq` finishes and joins its workers."""
+    want = [a + b for a, b in zip(range(50), range(50, 0, -1))]
+    have = list(
+        qqabc.qq.mapq(
+            operator.add, range(50), range(50, 0, -1), kind="thread", max_pending=3
+        )
+    )
+    assert have == want
+
+
+def _open(log: qqabc.qq.Q[str]) -> dict:
+    """Build per-worker state."""
+    return {"calls": 0, "log": log}
+
+
+def _scale(state: dict, x: int) -> int:
+    """Multiply using per-worker state."""
+    state["calls"] += 1
+    return x * 10
+
+
+def _close(state: dict) -> None:
+    """Report how many calls this worker served."""
+    state["log"].put(state["calls"])
+
+
+def test_map_worker_state() -> None:
+    """`mapq` builds state once per worker and tears it down at the end."""
+    for kind in ("thread", "process"):
+        log: qqabc.qq.Q[int] = qqabc.qq.Q(kind)
+        have = list(
+            qqabc.qq.mapq(
+                _scale,
+                range(20),
+                num=3,
+                kind=kind,
+                initializer=_open,
+                initargs=(log,),
+                pass_state=True,
+                teardown=_close,
+            )
+        )
+        assert have == [x * 10 for x in range(20)]
+        calls = [msg.data for msg in log.end()]
+        assert len(calls) == 3, f"expected one teardown per worker ({kind})"
+        assert sum(calls) == 20
+
+
+def test_map_chunksize() -> None:
+    """Chunked `mapq` returns flattened results in order."""
+    want = [a + b for a, b in zip(range(103), range(103, 0, -1))]
+    for kind in ("thread", "process"):
+        for chunksize in (1, 7, 1000, "auto"):
+            have = list(
+                qqabc.qq.mapq(
+                    operator.add,
+                    range(103),
+                    range(103, 0, -1),
+                    num=3,
+                    kind=kind,
+                    chunksize=chunksize,
+                )
+            )
+            assert have == want, f"chunksize={chunksize} ({kind})"
+
+
+def test_map_chunksize_streaming() -> None:
+    """Chunks work with `max_pending` and bad sizes are rejected."""
+    have = list(
+        qqabc.qq.mapq(square, range(50), kind="thread", chunksize=4, max_pending=2)
+    )
+    assert have == [x * x for x in range(50)]
+    with pytest.raises(ValueError, match="chunksize"):
+        list(qqabc.qq.mapq(square, range(5), kind="thread", chunksize=0))
+
+
+def test_auto_chunksize_grows() -> None:
+    """Cheap items get large automatic chunks."""
+    sizer = qqabc.qq._ChunkSize("auto")  # noqa: SLF001
+    assert sizer.size == 1
+    sizer.observe(10, 0.000_01)
+    assert sizer.size > 100
+    sizer.observe(10, 10.0)
+    assert sizer.size == 1
+
+
+def test_map_work_stealing() -> None:
+    """Work-stealing `mapq` keeps order, state and chunks."""
+    want = [x * x for x in range(101)]
+    assert (
+        list(qqabc.qq.mapq(square, range(101), kind="thread", scheduler="steal"))
+        == want
+    )
+    assert (
+        list(
+            qqabc.qq.mapq(
+                square, range(101), num=4, kind="thread", chunksize=8, scheduler="steal"
+            )
+        )
+        == want
+    )
+    assert list(qqabc.qq.mapq(square, [], kind="thread", scheduler="steal")) == []
+
+    log: qqabc.qq.Q[int] = qqabc.qq.Q("thread")
+    have = qqabc.qq.mapq(
+        _scale,
+        range(20),
+        num=3,
+        kind="thread",
+        scheduler="steal",
+        initializer=_open,
+        initargs=(log,),
+        pass_state=True,
+        teardown=_close,
+    )
+    assert list(have) == [x * 10 for x in range(20)]
+    assert sum(msg.data for msg in log.end()) == 20
+
+
+def test_map_work_stealing_errors() -> None:
+    """Work stealing re-raises task errors and rejects unsupported options."""
+    with pytest.raises(ZeroDivisionError):
+        list(
+            qqabc.qq.mapq(
+                operator.truediv, [1, 2], [1, 0], kind="thread", scheduler="steal"
+            )
+        )
+    with pytest.raises(ValueError, match="thread"):
+        list(qqabc.qq.mapq(square, [1], kind="process", scheduler="steal"))
+    with pytest.raises(ValueError, match="up front"):
+        list(
+            qqabc.qq.mapq(square, [1], kind="thread", scheduler="steal", max_pending=2)
+        )
+    with pytest.raises(ValueError, match="scheduler"):
+        list(qqabc.qq.mapq(square, [1], kind="thread", scheduler="bogus"))  # type: ignore[arg-type]
@@ -0,0 +1,168 @@
+"""Test the queue server and the `"remote"` queue kind."""
+
+from __future__ import annotations
+
+import pickle
+import socket
+import subprocess
+import sys
+import time
+from queue import Empty
+from typing import TYPE_CHECKING
+
+import pytest
+
+from qqabc.qq import END_MSG, Q, Worker, mapq
+from qqabc.qq.pool import WorkerPool
+from qqabc.qq.remote import RemoteQueue
+from qqabc.qq.server import GET, OPEN, QueueServer, frame, get_body, open_body
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from qqabc.qq.server import Address
+
+
+@pytest.fixture(scope="module")
+def address() -> Iterator[Address]:
+    server = QueueServer(("127.0.0.1", 0)).start()
+    yield server.address
+    server.stop()
+
+
+def test_fifo_batches_and_end(address: Address) -> None:
+    q: Q[int] = Q("remote", address=address)
+    q.put(-1).put_many(range(100)).end()
+    assert q.qsize() == 102  # a batch is one request, but separate messages
+    assert [msg.data for msg in q] == [-1, *range(100)]
+    with pytest.raises(Empty):
+        q.get(timeout=0.01)
+    with pytest.raises(Empty):
+        q.get(block=False)
+
+
+def test_named_queues_are_shared(address: Address) -> None:
+    a: Q[str] = Q("remote", address=address, name="shared")
+    b: Q[str] = Q("remote", address=address, name="shared")
+    other: Q[str] = Q("remote", address=address)
+    a.put("x")
+    assert other.empty()
+    assert b.get().data == "x"
+
+
+def test_prefetch_stops_at_end(address: Address) -> None:
+    writer = RemoteQueue(address, "prefetch")
+    reader = RemoteQueue(address, "prefetch", prefetch=8)
+    for msg in [1, 2, END_MSG, 3, END_MSG]:
+        writer.put(msg)
+    time.sleep(0.05)
+    assert reader.get() == 1
+    assert reader.qsize() == 4, "2 and END_MSG were prefetched; 3 was not"
+    assert [reader.get() for _ in range(2)] == [2, END_MSG]
+    assert [reader.get(), reader.get()] == [3, END_MSG]
+
+
+def test_put_many_shared_and_prefetched(address: Address) -> None:
+    writer: Q[int] = Q("remote", address=address, name="many")
+    reader: Q[int] = Q("remote", address=address, name="many", prefetch=4)
+    other: Q[int] = Q("remote", address=address, name="many")
+    writer.put_many(range(10))
+    assert reader.get().data == 0
+    assert other.qsize() == 6, "1, 2 and 3 were prefetched"
+    assert other.get().data == 4
+    assert [reader.get().data for _ in range(3)] == [1, 2, 3]
+
+
+def test_pickled_copy_reconnects(address: Address) -> None:
+    q = RemoteQueue(address, serializer="pickle")
+    q.put(1)
+    copy = pickle.loads(pickle.dumps(q))  # noqa: S301
+    assert copy.name == q.name
+    assert copy.get() == 1
+    q.close()
+
+
+def _square(q: Q[int], out: Q[int]) -> None:
+    for msg in q:
+        out.put(msg.data**2, order=msg.order)
+    out.end()
+
+
+def test_workers_in_processes(address: Address) -> None:
+    q: Q[int] = Q("remote", address=address)
+    out: Q[int] = Q("remote", address=address)
+    workers = [Worker.process(_square, q, out) for _ in range(3)]
+    q.put_many(range(50), batch_size=4)
+    for _ in workers:
+        q.end()
+    results = []
+    for _ in workers:
+        results.extend(msg.data for msg in out)
+    for w in workers:
+        w.join()
+    assert sorted(results) == [x**2 for x in range(50)]
+
+
+def test_mapq_and_pool_take_address(address: Address) -> None:
+    results = mapq(abs, [-1, -2, -3], num=2, kind="remote", address=address)
+    assert sorted(results) == [1, 2, 3]
+    with WorkerPool(2, kind="remote", address=address) as pool:
+        assert list(pool.mapq(abs, [-4, -5])) == [4, 5]
+
+
+def test_unused_queues_are_dropped() -> None:
+    server = QueueServer(("127.0.0.1", 0)).start()
+    try:
+        q: Q[int] = Q("remote", address=server.address, name="kept")
+        q.put(1)
+        q.close()
+        empty: Q[int] = Q("remote", address=server.address, name="dropped")
+        empty.qsize()
+        empty.close()
+        deadline = time.monotonic() + 5
+        while "dropped" in server._queues and time.monotonic() < deadline:  # noqa: SLF001
+            time.sleep(0.01)
+        assert set(server._queues) == {"kept"}  # noqa: SLF001
+    finally:
+        server.stop()
+
+
+def test_items_of_a_dropped_reader_are_kept(address: Address) -> None:
+    sock = socket.create_connection(address)  # type: ignore[arg-type]
+    sock.sendall(frame(OPEN, open_body("dropped-get", 0)))
+    sock.recv(16)
+    sock.sendall(frame(GET, get_body(8, None)))  # wait forever...
+    time.sleep(0.05)
+    sock.close()  # ...but leave before anything arrives
+    time.sleep(0.05)
+
+    q: Q[int] = Q("remote", address=address, name="dropped-get")
+    q.put_many(range(3))
+    assert [q.get(timeout=5).data for _ in range(3)] == [0, 1, 2]
+
+
+def test_needs_address() -> None:
+    with pytest.raises(ValueError, match="address"):
+        Q("remote")
+
+
+def test_command_line_unix_socket(tmp_path: Path) -> None:
+    path = str(tmp_path / "qq.sock")
+    proc = subprocess.Popen([sys.executable, "-m", "qqabc.qq.server", "--unix", path])
+    try:
+        q: Q[str] = Q("remote", address=path)
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                q.put("hello")
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        assert q.get().data == "hello"
+        q.close()
+    finally:
+        proc.terminate()
+        proc.wait()
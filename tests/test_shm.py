@@ -0,0 +1,111 @@
+"""Test the shared-memory ring buffer backend."""
+
+from __future__ import annotations
+
+import operator
+from queue import Empty, Full
+
+import pytest
+
+import qqabc.qq
+from qqabc.qq.shm import ShmClosedError, ShmQueue
+
+
+def worker_double(q: qqabc.qq.Q[int], out: qqabc.qq.Q[int]) -> None:
+    """Double every number until `END_MSG`."""
+    for msg in q:
+        out.put(msg.data * 2, order=msg.order)
+
+
+def test_shm_roundtrip() -> None:
+    """Messages keep their data, kind and order."""
+    q: qqabc.qq.Q[object] = qqabc.qq.Q("shm")
+    q.put({"a": 1}, kind="k", order=3)
+    q.put_many(range(5), order=10)
+
+    have = [(msg.data, msg.kind, msg.order) for msg in q.items()]
+    assert have[0] == ({"a": 1}, "k", 3)
+    assert [m[0] for m in have[1:]] == list(range(5))
+    assert [m[2] for m in have[1:]] == list(range(10, 15))
+
+
+def test_shm_wraparound() -> None:
+    """Records that straddle the end of the ring are read back intact."""
+    ring = ShmQueue(capacity=256)
+    for i in range(100):
+        payload = bytes([i]) * (i % 50)
+        ring.put(payload)
+        assert ring.get() == payload
+    assert ring.empty()
+
+
+def test_shm_limits() -> None:
+    """Full/Empty are raised like `queue.Queue`; oversized messages spill."""
+    ring = ShmQueue(maxsize=1, capacity=1024)
+    with pytest.raises(Empty):
+        ring.get(timeout=0.01)
+
+    ring.put(1)
+    assert ring.full()
+    with pytest.raises(Full):
+        ring.put(2, timeout=0.01)
+
+    ring.get()
+    ring.put(b"x" * 2048)
+    assert ring.get() == b"x" * 2048
+
+
+def test_shm_spill_order() -> None:
+    """Spilled messages keep their place among the ones in the ring."""
+    ring = ShmQueue(capacity=1024)
+    items = [1, b"y" * 4096, 2, b"z" * 8192, 3]
+    for item in items:
+        ring.put(item)
+    assert [ring.get() for _ in items] == items
+    assert ring.empty()
+
+
+def test_shm_closed() -> None:
+    """A released ring raises `ShmClosedError` instead of failing obscurely."""
+    ring = ShmQueue(capacity=1024)
+    ring.put(1)
+    ring._finalizer()  # noqa: SLF001
+    with pytest.raises(ShmClosedError):
+        ring.put(2)
+    with pytest.raises(ShmClosedError):
+        ring.get()
+    with pytest.raises(ShmClosedError):
+        ring.qsize()
+
+
+def test_shm_processes() -> None:
+    """Process workers communicate through shm queues."""
+    q: qqabc.qq.Q[int] = qqabc.qq.Q("shm")
+    out: qqabc.qq.Q[int] = qqabc.qq.Q("shm")
+    workers = [qqabc.qq.run(worker_double, q, out) for _ in range(2)]
+    for i in range(100):
+        q.put(i, order=i)
+    q.stop(workers)
+
+    have = [msg.data for msg in out.items(sort=True)]
+    assert have == [i * 2 for i in range(100)]
+
+
+def test_shm_mapq() -> None:
+    """`mapq` accepts the shm backend."""
+    have = list(qqabc.qq.mapq(operator.add, range(10), range(10), kind="shm"))
+    assert have == [i * 2 for i in range(10)]
+
+
+def test_shm_bounded_q() -> None:
+    """`BoundedQ` builds on the shm backend."""
+    pytest.importorskip("qqabc.pipe")
+    from qqabc.pipe.channel import BoundedQ
+
+    q: BoundedQ[int] = BoundedQ(kind="shm", maxsize=2)
+    q.put(1)
+    q.put(2)
+    assert q.full()
+    assert q.get().data == 1
+    q.end()
+    assert [msg.data for msg in q] == [2]
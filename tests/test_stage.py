@@ -5,11 +5,15 @@
 - async 自動偵測
 - __or__ 運算子串接
 - IStage ABC 行為
+- 批次設定
+- 相鄰 stage 的合併（FusedStage / fuse_stages）
 """
 
 from __future__ import annotations
 
 import sys
+import threading
+import time
 from typing import TYPE_CHECKING
 
 import pytest
@@ -317,6 +321,7 @@ class TestIStageABC:
         assert stage.executor == "thread"
         assert stage.concurrency == 2
         assert stage.fn(5) == 10
+        assert stage.batch_size is None
 
     def test_custom_istage_or_with_stage(self) -> None:
         """自訂 IStage 可與 Stage 用 | 串接。"""
@@ -347,6 +352,141 @@ class TestIStageABC:
         assert chain[1] is builtin
 
 
+# === 批次設定 ===
+
+
+class TestStageBatching:
+    """batch_size / max_batch_latency 參數。"""
+
+    def test_defaults(self) -> None:
+        """預設不批次。"""
+        from qqabc.pipe.stage import Stage
+
+        stage = Stage(fn=lambda x: x)
+        assert stage.batch_size is None
+        assert stage.max_batch_latency == 0.0
+        assert "batch_size" not in repr(stage)
+
+    def test_custom(self) -> None:
+        """自訂批次大小與等待時間。"""
+        from qqabc.pipe.stage import Stage
+
+        stage = Stage(fn=lambda xs: xs, batch_size=32, max_batch_latency=0.01)
+        assert stage.batch_size == 32
+        assert stage.max_batch_latency == 0.01
+        assert "batch_size=32" in repr(stage)
+
+    @pytest.mark.parametrize(
+        ("batch_size", "latency"), [(0, 0.0), (-1, 0.0), (4, -0.1)]
+    )
+    def test_invalid(self, batch_size: int, latency: float) -> None:
+        """不合法的批次設定應 raise。"""
+        from qqabc.pipe.stage import Stage
+
+        with pytest.raises(ValueError, match="batch"):
+            Stage(fn=lambda xs: xs, batch_size=batch_size, max_batch_latency=latency)
+
+
+# === Stage 合併 ===
+
+
+class TestFuseStages:
+    """fuse_stages 只合併同 executor、同 concurrency、不批次的相鄰 stage。"""
+
+    def test_fuse_thread_chain(self) -> None:
+        """三個 thread stage 合併成一個，名稱以 + 串接。"""
+        from qqabc.pipe.stage import FusedStage, Stage, fuse_stages
+
+        a, b, c = (Stage(fn=lambda x: x + 1, name=n) for n in "abc")
+        (fused,) = fuse_stages([a, b, c])
+        assert isinstance(fused, FusedStage)
+        assert fused.name == "a+b+c"
+        assert fused.stages == (a, b, c)
+        assert fused.executor == "thread"
+        assert fused.concurrency == 12
+        assert fused.fn(0) == 3
+
+    def test_fused_keeps_stage_limits(self) -> None:
+        """合併後每個 fn 同時最多 concurrency 個呼叫。"""
+        from qqabc.pipe.stage import FusedStage, Stage
+
+        running = {"a": 0, "b": 0}
+        peak = {"a": 0, "b": 0}
+        lock = threading.Lock()
+
+        def track(name: str) -> Callable[[int], int]:
+            def fn(x: int) -> int:
+                with lock:
+                    running[name] += 1
+                    peak[name] = max(peak[name], running[name])
+                time.sleep(0.01)
+                with lock:
+                    running[name] -= 1
+                return x
+
+            return fn
+
+        fused = FusedStage(
+            [Stage(fn=track("a"), concurrency=2), Stage(fn=track("b"), concurrency=2)]
+        )
+        assert fused.concurrency == 4
+        threads = [
+            threading.Thread(target=fused.fn, args=(i,))
+            for i in range(fused.concurrency * 2)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak == {"a": 2, "b": 2}
+
+    def test_boundaries(self) -> None:
+        """不同 executor、concurrency、async 或批次 stage 不合併。"""
+        from qqabc.pipe.stage import Stage, fuse_stages
+
+        async def f(x: int) -> int:
+            return x
+
+        stages = [
+            Stage(fn=abs, name="t1"),
+            Stage(fn=abs, name="t2"),
+            Stage(fn=abs, name="p1", executor="process"),
+            Stage(fn=abs, name="p2", executor="process"),
+            Stage(fn=abs, name="p3", executor="process", concurrency=1),
+            Stage(fn=f, name="a1"),
+            Stage(fn=f, name="a2"),
+            Stage(fn=abs, name="t3"),
+            Stage(fn=abs, name="b1", batch_size=2),
+            Stage(fn=abs, name="t4"),
+        ]
+        assert [s.name for s in fuse_stages(stages)] == [
+            "t1+t2",
+            "p1+p2",
+            "p3",
+            "a1",
+            "a2",
+            "t3",
+            "b1",
+            "t4",
+        ]
+
+    def test_single_stage_unchanged(self) -> None:
+        """無可合併時回傳原本的 stage。"""
+        from qqabc.pipe.stage import Stage, fuse_stages
+
+        stage = Stage(fn=abs)
+        assert fuse_stages([stage]) == [stage]
+
+    def test_fused_stage_rejects_incompatible(self) -> None:
+        """直接建立不相容的 FusedStage 應 raise。"""
+        from qqabc.pipe.stage import FusedStage, Stage
+
+        with pytest.raises(ValueError, match="無法合併"):
+            FusedStage([Stage(fn=abs), Stage(fn=abs, executor="process")])
+        with pytest.raises(ValueError, match="無法合併"):
+            FusedStage([])
+
+
 # === ExecutorType ===
 
 
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from qqabc.qq import Q, WorkerPool, get_context, mapq, preload_forkserver, run
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def _echo(q: Q[int], out: Q[int]) -> None:
+    for msg in q:
+        out.put(msg.data, order=msg.order)
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+def test_mapq_start_method(start_method: str) -> None:
+    result = list(mapq(_square, range(20), num=2, start_method=start_method))
+    assert result == [x * x for x in range(20)]
+
+
+@pytest.mark.parametrize("kind", ["process", "shm"])
+def test_run_spawn(kind: str) -> None:
+    q: Q[int] = Q(kind, start_method="spawn")
+    out: Q[int] = Q(kind, start_method="spawn")
+    w = run(_echo, q, out, start_method="spawn")
+    for i in range(5):
+        q.put(i, order=i)
+    q.stop([w])
+    assert [m.data for m in out.end().sorted()] == list(range(5))
+
+
+def test_pool_forkserver_preload() -> None:
+    preload_forkserver(["json"])
+    with WorkerPool(2, start_method="forkserver") as pool:
+        assert list(pool.mapq(_square, range(5))) == [0, 1, 4, 9, 16]
+
+
+def test_get_context() -> None:
+    assert get_context("spawn").get_start_method() == "spawn"
+    with pytest.raises(ValueError, match="bogus"):
+        get_context("bogus")  # type: ignore[arg-type]
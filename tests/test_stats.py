@@ -0,0 +1,112 @@
+"""Test queue statistics."""
+
+from __future__ import annotations
+
+import pickle
+import time
+from queue import Empty
+
+import pytest
+
+from qqabc.pipe.channel import AsyncBoundedQ, BoundedQ
+from qqabc.qq import END_MSG, Msg, Q, QStats
+from qqabc.qq.stats import Histogram
+
+
+def test_off_by_default() -> None:
+    q: Q[int] = Q("thread")
+    assert q.stats is None
+    q.put(1)
+    assert "_sent" not in q.get().__dict__
+
+
+@pytest.mark.parametrize("kind", ["thread", "process", "shm"])
+@pytest.mark.parametrize("serializer", [None, "pickle"])
+def test_counts_and_dwell(kind: str, serializer: str | None) -> None:
+    q: Q[int] = Q(kind, stats=True, serializer=serializer)  # type: ignore[arg-type]
+    q.put(1)
+    q.put_many(range(10))
+    time.sleep(0.01)
+    got = [msg.data for msg in q.end()]
+    assert got == [1, *range(10)]
+
+    snap = q.stats.snapshot()  # type: ignore[union-attr]
+    assert snap["puts"] == 11
+    assert snap["gets"] == 11
+    assert snap["dwell"]["count"] == 11
+    assert snap["dwell"]["max"] >= 0.01
+    assert snap["depth"]["max"] >= 1
+    assert snap["put_wait"]["count"] == 3  # single, batch and END writes
+
+
+def test_end_msg_is_not_stamped() -> None:
+    q: Q[int] = Q("thread", stats=True)
+    q.end()
+    assert q.get() is not END_MSG
+    assert "_sent" not in END_MSG.__dict__
+
+
+def test_stamp_survives_pickle() -> None:
+    msg = QStats.stamp(Msg(1, order=3))
+    copy = pickle.loads(pickle.dumps(msg))  # noqa: S301
+    assert copy == msg
+    assert copy.__dict__["_sent"] == msg.__dict__["_sent"]
+    assert pickle.dumps(Msg(1)) != pickle.dumps(msg)
+
+
+def test_shared_stats_and_name() -> None:
+    stats = QStats(name="downloads")
+    a: Q[int] = Q("thread", stats=stats)
+    b: Q[int] = Q("thread", stats=stats)
+    a.put(1)
+    b.put(2)
+    snap = stats.snapshot()
+    assert snap["name"] == "downloads"
+    assert snap["puts"] == 2
+    stats.reset()
+    assert stats.snapshot()["puts"] == 0
+
+
+def test_get_wait_measures_blocking() -> None:
+    q: Q[int] = Q("thread", stats=True)
+    with pytest.raises(Empty):
+        q.get(timeout=0.02)
+    q.put(1)
+    q.get()
+    assert q.stats.get_wait.count == 1  # type: ignore[union-attr]
+
+
+def test_histogram_percentiles() -> None:
+    h = Histogram()
+    for _ in range(99):
+        h.record(0.000_010)
+    h.record(0.5)
+    assert h.percentile(50) <= 0.000_016
+    assert h.percentile(100) == 0.5
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_bounded_q_stats() -> None:
+    q: BoundedQ[int] = BoundedQ(kind="thread", maxsize=2, stats=True)
+    q.put(1)
+    assert q.get().data == 1
+    assert q.stats.snapshot()["gets"] == 1  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_async_bounded_q_stats() -> None:
+    q: AsyncBoundedQ[int] = AsyncBoundedQ(maxsize=2, stats=True)
+    await q.put(1)
+    await q.end()
+    assert [msg.data async for msg in q] == [1]
+    snap = q.stats.snapshot()  # type: ignore[union-attr]
+    assert (snap["puts"], snap["gets"], snap["dwell"]["count"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_kind_stats() -> None:
+    q: Q[int] = Q("async", stats=True)
+    await q.aput(1)
+    assert (await q.aget()).data == 1
+    snap = q.stats.snapshot()  # type: ignore[union-attr]
+    assert (snap["puts"], snap["gets"]) == (1, 1)